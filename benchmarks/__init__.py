@@ -0,0 +1,4 @@
+"""Benchmarks for the Xcode build settings extractor.
+
+Run a benchmark from the repository root, e.g. `python3 -m benchmarks.bench_xcspec_parser`.
+"""
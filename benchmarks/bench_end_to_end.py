@@ -0,0 +1,79 @@
+"""Times every stage of an extraction on a synthetic Xcode.app and writes the results as JSON.
+
+Usage: python3 -m benchmarks.bench_end_to_end [--scale 0.1|1|10] [--spec-format openstep|xml] [--output results.json]
+
+Scale 1 roughly matches the number of spec files, settings and files of a real Xcode.
+"""
+
+import argparse
+import json
+import platform
+import tempfile
+import time
+from pathlib import Path
+from extractor import __version__
+from extractor.model.exporter.json_exporter import JSONExporter
+from extractor.model.importer.importer import Importer
+from extractor.model.importer.plist_importer import PlistImporter
+from extractor.model.spec_discovery import SpecDiscovery
+from extractor.model.swift_generator import to_swift_code
+from .measure import measure, report
+from .synthetic import write_xcode_app
+
+# The size of a real Xcode at scale 1
+SPECS = 300
+OPTIONS_PER_SPEC = 25
+DECOYS = 20000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--spec-format', choices=['openstep', 'xml'], default='openstep')
+    parser.add_argument('--output', type=Path, default=None, help='The JSON file the results are written to.')
+    args = parser.parse_args()
+
+    specs = max(1, int(SPECS * args.scale))
+    decoys = int(DECOYS * args.scale)
+    results = {
+        'extractor_version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'scale': args.scale,
+        'spec_format': args.spec_format,
+        'specs': specs,
+        'decoys': decoys,
+        'stages': {},
+    }
+
+    def stage(name, func):
+        result, elapsed, peak = measure(func)
+        report(name, elapsed, peak)
+        results['stages'][name] = {'wall_seconds': elapsed, 'peak_bytes': peak}
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f'generating {specs} specs and {decoys} decoy files')
+        xcode = write_xcode_app(
+            Path(tmp) / 'Xcode.app',
+            specs=specs,
+            options_per_spec=OPTIONS_PER_SPEC,
+            decoys=decoys,
+            spec_format=args.spec_format
+        )
+        stage('discovery (rglob)', lambda: sorted(xcode.rglob('*.xcspec')))
+        spec_paths = stage('discovery (pruned)', lambda: SpecDiscovery.discover(xcode))
+        parsed = stage('parse', lambda: PlistImporter.parse_paths(spec_paths))
+        settings = stage('clean', lambda: Importer._clean(parsed))
+        stage('swift', lambda: to_swift_code(settings=settings, xcversion='14.3'))
+        stage('json', lambda: JSONExporter.export(xcversion='14.3', settings=settings, output=Path(tmp) / 'out.json'))
+        results['options'] = len(parsed)
+        results['settings'] = len(settings)
+
+    print(f'{results["options"]} options, {results["settings"]} settings')
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=4, sort_keys=True))
+        print(f'results written to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Measures how much a narrow setting filter saves when parsing and exporting.
+
+Usage: python3 -m benchmarks.bench_filter [--scale 1] [--include 'SWIFT_*']
+
+The synthetic specs stand for different tools and their keys start with the tool's prefix, so a key
+filter selects the settings of a few spec files, like it does for a real Xcode.
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+from extractor.model.exporter.exporter import Exporter
+from extractor.model.importer.importer import Importer
+from extractor.model.importer.parse_cache import ParseCache
+from extractor.model.setting_filter import SettingFilter
+from extractor.model.spec_discovery import SpecDiscovery
+from .measure import measure, report
+from .synthetic import write_xcode_app
+
+SPECS = 300
+OPTIONS_PER_SPEC = 25
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--include', action='append', default=None)
+    args = parser.parse_args()
+    narrow = SettingFilter(include=args.include or ['SWIFT_*'])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xcode = write_xcode_app(Path(tmp) / 'Xcode.app', specs=max(1, int(SPECS * args.scale)),
+                                options_per_spec=OPTIONS_PER_SPEC, tool_prefixes=True)
+        paths = SpecDiscovery.discover(xcode)
+        print(f'{len(paths)} spec files, filter {narrow.to_dict()}')
+
+        for name, setting_filter in (('all', None), ('filtered', narrow)):
+            settings, elapsed, peak = measure(lambda: Importer.parse_paths(paths, setting_filter=setting_filter))
+            report(f'parse {name} ({len(settings)})', elapsed, peak)
+
+        cache = ParseCache(Path(tmp) / 'cache')
+        Importer.parse_paths(paths, cache=cache)
+        for name, setting_filter in (('all', None), ('filtered', narrow)):
+            cache = ParseCache(Path(tmp) / 'cache')
+            settings, elapsed, peak = measure(lambda: Importer.parse_paths(paths, cache=cache, setting_filter=setting_filter))
+            report(f'cached {name} ({cache.stats.hits} loaded)', elapsed, peak)
+
+        for name, setting_filter in (('all', None), ('filtered', narrow)):
+            settings = Importer.parse_paths(paths, setting_filter=setting_filter)
+            outputs = [('json', Path(tmp) / f'{name}.json', {}), ('swift', Path(tmp) / f'{name}.swift', {})]
+            _, elapsed, peak = measure(lambda: Exporter.export_all('14.3', settings, outputs, workers=1))
+            size = sum(path.stat().st_size for _, path, _ in outputs)
+            report(f'export {name} ({size / 1024:.0f} KiB)', elapsed, peak)
+
+if __name__ == '__main__':
+    main()
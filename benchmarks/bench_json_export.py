@@ -0,0 +1,38 @@
+"""Compares size and time of the json export layouts and of reading them back."""
+
+import json
+import tempfile
+from pathlib import Path
+from extractor.model.exporter.json_exporter import JSONExporter, JSONFormat
+from extractor.model.importer.json_importer import JSONImporter
+from .measure import measure, report
+from .synthetic import settings
+
+SETTINGS = 30000
+
+def main():
+    synthetic = settings(SETTINGS)
+    print(f'{len(synthetic)} settings')
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / 'legacy.json'
+
+        def export_legacy():
+            # the exporter before streaming: build the whole document, then dump it
+            with legacy.open('w') as out:
+                document = {"xcode_version": "14.3", "settings": [s.to_dict() for s in synthetic]}
+                json.dump(document, out, indent=4, sort_keys=True)
+
+        _, elapsed, peak = measure(export_legacy)
+        report(f'legacy dump ({legacy.stat().st_size} bytes)', elapsed, peak)
+
+        for json_format in JSONFormat:
+            output = Path(tmp) / f'{json_format.value}.json'
+            _, elapsed, peak = measure(lambda: JSONExporter.export(
+                xcversion='14.3', settings=synthetic, output=output, json_format=json_format))
+            report(f'{json_format.value} export ({output.stat().st_size} bytes)', elapsed, peak)
+            (_, loaded), elapsed, peak = measure(lambda: JSONImporter.load(output))
+            report(f'{json_format.value} read', elapsed, peak)
+            assert len(loaded) == len(synthetic)
+
+if __name__ == '__main__':
+    main()
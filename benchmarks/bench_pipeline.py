@@ -0,0 +1,81 @@
+"""Compares the end-to-end latency of the sequential and the pipelined discover and parse.
+
+Usage: python3 -m benchmarks.bench_pipeline [--scale 1] [--workers N] [--threads]
+
+Before each run the page cache is dropped if permitted (root on Linux), otherwise the spec files are
+evicted with posix_fadvise, so both modes start from a cold filesystem cache.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from extractor.model.exporter.json_exporter import JSONExporter
+from extractor.model.importer.importer import Importer
+from extractor.model.spec_discovery import SpecDiscovery
+from .synthetic import write_xcode_app
+
+SPECS = 300
+OPTIONS_PER_SPEC = 25
+DECOYS = 20000
+REPEAT = 3
+
+def drop_caches(root: Path) -> str:
+    """Evicts the files of the tree from the page cache and returns how it was done."""
+    os.sync()
+    try:
+        with open('/proc/sys/vm/drop_caches', 'w') as fp:
+            fp.write('3\n')
+        return 'drop_caches'
+    except OSError:
+        pass
+    if not hasattr(os, 'posix_fadvise'):
+        return 'not possible on this platform, the cache is warm'
+    for directory, _, files in os.walk(root):
+        for name in files:
+            fd = os.open(os.path.join(directory, name), os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+    return 'posix_fadvise, directories stay cached'
+
+def sequential(xcode: Path, workers: int, threads: bool):
+    paths = SpecDiscovery.discover(xcode)
+    return paths, Importer.parse_paths(paths, workers=workers, use_threads=threads)
+
+def pipelined(xcode: Path, workers: int, threads: bool):
+    return Importer.parse_discovered(SpecDiscovery.iter_discover(xcode), workers=workers, use_threads=threads)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads', action='store_true')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xcode = write_xcode_app(
+            Path(tmp) / 'Xcode.app',
+            specs=max(1, int(SPECS * args.scale)),
+            options_per_spec=OPTIONS_PER_SPEC,
+            decoys=int(DECOYS * args.scale)
+        )
+        outputs = {}
+        for name, run in [('sequential', sequential), ('pipelined', pipelined)]:
+            timings = []
+            for _ in range(REPEAT):
+                method = drop_caches(xcode)
+                start = time.perf_counter()
+                paths, settings = run(xcode, args.workers, args.threads)
+                JSONExporter.export(xcversion='14.3', settings=settings, output=Path(tmp) / f'{name}.json')
+                timings.append(time.perf_counter() - start)
+            outputs[name] = (Path(tmp) / f'{name}.json').read_bytes()
+            print(f'{name:<12} {len(paths)} specs, {len(settings)} settings, '
+                  f'best {min(timings) * 1000:.1f} ms, median {sorted(timings)[REPEAT // 2] * 1000:.1f} ms')
+        assert outputs['sequential'] == outputs['pipelined']
+        print(f'cold cache: {method}')
+
+if __name__ == '__main__':
+    main()
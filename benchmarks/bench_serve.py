@@ -0,0 +1,80 @@
+"""Compares the latency of requests to a settings server with a cold extract run.
+
+Usage: python3 -m benchmarks.bench_serve [--scale 1] [--clients 8]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from extractor.model.settings_client import request
+from extractor.model.settings_server import SettingsServer, SettingsStore
+from .synthetic import write_xcode_app
+
+SPECS = 300
+OPTIONS_PER_SPEC = 25
+REQUESTS = 50
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def summary(name: str, timings: list):
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2]
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f'{name:<36} p50 {p50 * 1000:9.2f} ms   p95 {p95 * 1000:9.2f} ms')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--clients', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xcode = write_xcode_app(Path(tmp) / 'Xcode.app', specs=max(1, int(SPECS * args.scale)),
+                                options_per_spec=OPTIONS_PER_SPEC)
+        socket_path = Path(tmp) / 'serve.sock'
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+
+        cold = [timed(lambda: subprocess.run(
+            [sys.executable, '-m', 'extractor', 'extract', '--no-cache', '--force', '-j', str(Path(tmp) / 'cold.json'), str(xcode)],
+            check=True, stdout=subprocess.DEVNULL, env=env
+        )) for _ in range(3)]
+        summary('cold extract (subprocess)', cold)
+
+        server = SettingsServer(socket_path, SettingsStore(Path(tmp) / 'cache', workers=os.cpu_count() or 1))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            export = {'command': 'export', 'xcode': str(xcode), 'format': 'json'}
+            print(f'first request (load): {timed(lambda: request(socket_path, export)) * 1000:.1f} ms')
+            summary('export json', [timed(lambda: request(socket_path, export)) for _ in range(REQUESTS)])
+            swift = dict(export, format='swift')
+            request(socket_path, swift)
+            summary('export swift', [timed(lambda: request(socket_path, swift)) for _ in range(REQUESTS)])
+            key = request(socket_path, {'command': 'categories', 'xcode': '14.3'})[0]
+            category = {'command': 'category', 'xcode': '14.3', 'category': key}
+            summary('category listing', [timed(lambda: request(socket_path, category)) for _ in range(REQUESTS)])
+            lookup = {'command': 'lookup', 'xcode': '14.3', 'key': request(socket_path, category)[0]['key']}
+            summary('key lookup', [timed(lambda: request(socket_path, lookup)) for _ in range(REQUESTS)])
+            with ThreadPoolExecutor(max_workers=args.clients) as executor:
+                timings = list(executor.map(lambda _: timed(lambda: request(socket_path, export)), range(REQUESTS * 4)))
+            summary(f'export json, {args.clients} concurrent clients', timings)
+            client = [timed(lambda: subprocess.run(
+                [sys.executable, '-m', 'extractor', 'client', '--socket', str(socket_path), '-k', lookup['key'], '14.3'],
+                check=True, stdout=subprocess.DEVNULL, env=env
+            )) for _ in range(3)]
+            summary('key lookup (client subprocess)', client)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Measures the memory of holding the settings of many Xcode versions at once."""
+
+import json
+import tracemalloc
+from extractor.model.importer.plist_importer import PlistImporter
+from extractor.model.setting import Setting
+from .synthetic import spec_options
+
+VERSIONS = 20
+SETTINGS_PER_VERSION = 2500
+
+class LegacySetting:
+    """The Setting before it was made compact: an instance dictionary and a mutable enum case list."""
+
+    def __init__(self, name, description, key, type, category, default_value, enum_cases):
+        self.name = name
+        self.description = description
+        self.key = key
+        self.type = type
+        self.category = category
+        self.default_value = default_value
+        self.enum_cases = enum_cases
+        if self.default_value != None and self.default_value not in self.enum_cases:
+            if not self.default_value.startswith('$('):
+                self.enum_cases.append(self.default_value)
+
+def load_versions(setting_class) -> list:
+    versions = []
+    serialized = json.dumps(spec_options(SETTINGS_PER_VERSION))
+    for _ in range(VERSIONS):
+        # every version is decoded separately, like parsing the spec files of another Xcode
+        settings = []
+        for option in json.loads(serialized):
+            settings.append(setting_class(
+                name=option['Name'],
+                key=option['Name'],
+                description=option.get('Description'),
+                type=option.get('Type'),
+                category=option.get('Category'),
+                default_value=option.get('DefaultValue'),
+                enum_cases=PlistImporter._extract_enum_cases(option.get('Values', []))
+            ))
+        versions.append(settings)
+    return versions
+
+def main():
+    for setting_class in (LegacySetting, Setting):
+        tracemalloc.start()
+        versions = load_versions(setting_class)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        count = sum(len(v) for v in versions)
+        print(f'{setting_class.__name__:<14} {count} settings of {VERSIONS} versions: {current / 1024 / 1024:8.2f} MiB held')
+        del versions
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Measures the startup time of the CLI.
+
+Usage: python3 -m benchmarks.bench_startup
+
+Each command is timed as a whole, next to the bare interpreter, and with `-X importtime` to show how
+much of it the import of the CLI takes. tests/test_startup.py guards the budgets and the modules that
+must not be imported before a command needs them.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+REPEAT = 10
+COMMANDS = [['--version'], ['--help'], ['extract', '--help']]
+
+_IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+def imported_modules(args: list, env: dict) -> dict:
+    """Returns the cumulative import time in microseconds of each module imported by a CLI run."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=env
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    return modules
+
+def median_ms(args: list, env: dict) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, check=True, stdout=subprocess.DEVNULL, env=env)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[REPEAT // 2] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+
+    print(f'interpreter alone: {median_ms(["-c", "pass"], env):.1f} ms')
+    for command in COMMANDS:
+        args = ['-m', 'extractor'] + command
+        modules = imported_modules(args, env)
+        print(f'{" ".join(command)}: {median_ms(args, env):.1f} ms, {len(modules)} modules imported, '
+              f'extractor.cli {modules.get("extractor.cli", 0) / 1000:.1f} ms, '
+              f'typer {modules.get("typer", 0) / 1000:.1f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Reports how many argument enums and lines sharing enums between settings saves.
+
+Usage: python3 -m benchmarks.bench_swift_enums [--settings 30000] [export.json]
+
+Pass the JSON export of a real Xcode to measure its settings, synthetic settings are used otherwise.
+"""
+
+import argparse
+from pathlib import Path
+from extractor.model.importer.json_importer import JSONImporter
+from extractor.model.setting import Setting
+from extractor.model.swift_generator import shared_enums, to_swift_code
+from .measure import measure, report
+from .synthetic import settings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--settings', type=int, default=30000)
+    parser.add_argument('export', nargs='?', type=Path)
+    args = parser.parse_args()
+    if args.export:
+        xcversion, exported = JSONImporter.load(args.export)
+    else:
+        xcversion, exported = '14.3', settings(args.settings)
+    enums = [s for s in exported if s.type == Setting.TYPE_ENUM and s.enum_cases is not None]
+    print(f'{len(exported)} settings, {len(enums)} argument enums')
+
+    shared, elapsed, peak = measure(lambda: shared_enums(exported))
+    report('shared_enums', elapsed, peak)
+    aliased = sum(1 for s in enums if tuple(s.enum_cases) in shared)
+    print(f'{len(shared)} shared enums replace the enums of {aliased} settings, '
+          f'{aliased - len(shared)} enums eliminated')
+
+    for lean in (False, True):
+        separate = to_swift_code(exported, xcversion, lean=lean)
+        deduplicated = to_swift_code(exported, xcversion, lean=lean, share_enums=True)
+        lines = separate.count('\n') - deduplicated.count('\n')
+        size = len(separate.encode()) - len(deduplicated.encode())
+        print(f'{"lean" if lean else "default"} code: {lines} lines and {size / 1024:.1f} KiB eliminated '
+              f'({lines / separate.count(chr(10)) * 100:.1f}% of the lines)')
+
+if __name__ == '__main__':
+    main()
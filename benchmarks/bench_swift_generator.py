@@ -0,0 +1,30 @@
+"""Measures time and peak memory of generating Swift code for a large list of settings."""
+
+import tempfile
+from pathlib import Path
+from extractor.model.swift_generator import to_swift_code, write_swift_code
+from .measure import measure, report
+from .synthetic import settings
+
+SETTINGS = 30000
+
+def main():
+    synthetic = settings(SETTINGS)
+    print(f'{len(synthetic)} settings')
+
+    code, elapsed, peak = measure(lambda: to_swift_code(settings=synthetic, xcversion='14.3'))
+    report('to_swift_code (in memory)', elapsed, peak)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / 'Settings.swift'
+
+        def stream():
+            with output.open('w') as out:
+                write_swift_code(settings=synthetic, xcversion='14.3', out=out)
+
+        _, elapsed, peak = measure(stream)
+        report('write_swift_code (streaming)', elapsed, peak)
+        assert output.read_text() == code
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Compares the lean generated Swift code with the default one.
+
+Usage: python3 -m benchmarks.bench_swift_lean [--settings 30000]
+
+Reports the size, lines and switch arms of both variants, the number of return statements Swift has
+to type-check and how many of them return a string literal. If swiftc is installed, the time to type-check both files is measured as well; the
+files import ProjectDescription, so its module has to be on the search path given by --swiftc-flags.
+"""
+
+import argparse
+import shlex
+import shutil
+import tempfile
+from pathlib import Path
+from extractor.model.swift_generator import to_swift_code
+from .bench_swift_shards import describe, typecheck
+from .measure import measure, report
+from .synthetic import settings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--settings', type=int, default=30000)
+    parser.add_argument('--swiftc-flags', default='')
+    args = parser.parse_args()
+    synthetic = settings(args.settings)
+    print(f'{len(synthetic)} settings')
+
+    codes = {}
+    for name, lean in (('default', False), ('lean', True)):
+        codes[name], elapsed, peak = measure(lambda: to_swift_code(settings=synthetic, xcversion='14.3', lean=lean))
+        report(f'to_swift_code {name}', elapsed, peak)
+    for name, code in codes.items():
+        describe(name, code)
+        returns = sum(1 for line in code.splitlines() if 'return ' in line)
+        literals = sum(1 for line in code.splitlines() if line.rstrip().endswith('"') and 'return "' in line)
+        print(f'{"":<48} {returns:7} return statements, {literals} of a string literal')
+
+    swiftc = shutil.which('swiftc')
+    if swiftc is None:
+        print('swiftc not found, compile times not measured')
+        return
+    flags = shlex.split(args.swiftc_flags)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, code in codes.items():
+            path = Path(tmp) / name / 'XcodeBuildSettings.swift'
+            path.parent.mkdir()
+            path.write_text(code)
+            print(f'swiftc -typecheck {name}: {typecheck(swiftc, flags, [path]):.1f} s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Micro-benchmarks of the Swift naming functions over all keys and enum values of an Xcode.
+
+Pass the path of an Xcode installation to use its settings, otherwise synthetic settings are used.
+"""
+
+import sys
+import time
+from pathlib import Path
+from extractor.model import swift_naming
+from extractor.model.importer.importer import Importer
+from extractor.model.spec_discovery import SpecDiscovery
+from .synthetic import settings as synthetic_settings
+
+ROUNDS = 5
+
+def main():
+    if len(sys.argv) > 1:
+        xcode = Path(sys.argv[1])
+        settings = Importer.parse_paths(SpecDiscovery.discover(xcode))
+        print(f'{len(settings)} settings of {xcode}')
+    else:
+        settings = synthetic_settings(10000)
+        print(f'{len(settings)} synthetic settings')
+    keys = [s.key for s in settings]
+    values = [v for s in settings for v in s.enum_cases]
+
+    benchmarks = [
+        ('enum_case_for_key', swift_naming.enum_case_for_key, keys),
+        ('argument_enum_name', swift_naming.argument_enum_name, keys),
+        ('argument_enum_case_name', swift_naming.argument_enum_case_name, values),
+    ]
+    for name, func, inputs in benchmarks:
+        swift_naming.cache_clear()
+        start = time.perf_counter()
+        for i in inputs:
+            func(i)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for i in inputs:
+                func(i)
+        warm = (time.perf_counter() - start) / ROUNDS
+        print(f'{name:<26} {len(inputs):7} calls  cold {cold * 1000:8.1f} ms  memoized {warm * 1000:8.1f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Compares the files of the sharded Swift output with the single generated file.
+
+Usage: python3 -m benchmarks.bench_swift_shards [--settings 30000]
+
+For each file the size, the number of lines and the number of switch arms (`case .` lines) is
+reported. If swiftc is installed, the time to type-check the files is measured as well; the files
+import ProjectDescription, so its module has to be on the search path given by --swiftc-flags.
+"""
+
+import argparse
+import shlex
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from extractor.model.swift_generator import CORE_FILE_NAME, swift_shards, to_swift_code
+from .measure import measure, report
+from .synthetic import settings
+
+def describe(name: str, code: str):
+    arms = sum(1 for line in code.splitlines() if line.lstrip().startswith('case .'))
+    print(f'{name:<48} {len(code.encode()) / 1024:9.1f} KiB {code.count(chr(10)):8} lines {arms:7} switch arms')
+
+def typecheck(swiftc: str, flags: list, files: list) -> float:
+    start = time.perf_counter()
+    subprocess.run([swiftc, '-typecheck'] + flags + [str(f) for f in files], check=True)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--settings', type=int, default=30000)
+    parser.add_argument('--swiftc-flags', default='')
+    args = parser.parse_args()
+    synthetic = settings(args.settings)
+    print(f'{len(synthetic)} settings')
+
+    monolith, elapsed, peak = measure(lambda: to_swift_code(settings=synthetic, xcversion='14.3'))
+    report('to_swift_code', elapsed, peak)
+    shards, elapsed, peak = measure(lambda: swift_shards(settings=synthetic, xcversion='14.3'))
+    report('swift_shards', elapsed, peak)
+
+    describe('single file', monolith)
+    for name, code in shards.items():
+        describe(name, code)
+    size = len(monolith.encode())
+    largest = max(len(code.encode()) for name, code in shards.items() if name != CORE_FILE_NAME)
+    print(f'core file is {len(shards[CORE_FILE_NAME].encode()) / size * 100:.0f}%, '
+          f'largest category shard {largest / size * 100:.0f}% of the single file')
+
+    swiftc = shutil.which('swiftc')
+    if swiftc is None:
+        print('swiftc not found, compile times not measured')
+        return
+    flags = shlex.split(args.swiftc_flags)
+    with tempfile.TemporaryDirectory() as tmp:
+        single = Path(tmp) / 'single' / 'XcodeBuildSettings.swift'
+        single.parent.mkdir()
+        single.write_text(monolith)
+        print(f'swiftc -typecheck single file: {typecheck(swiftc, flags, [single]):.1f} s')
+        sharded = Path(tmp) / 'shards'
+        sharded.mkdir()
+        for name, code in shards.items():
+            (sharded / name).write_text(code)
+        print(f'swiftc -typecheck shards: {typecheck(swiftc, flags, sorted(sharded.iterdir())):.1f} s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Measures the idle CPU time of a watcher of unchanged Xcode installations.
+
+Usage: python3 -m benchmarks.bench_watch [--idle-seconds 10]
+
+The watcher is measured with inotify (where available, it polls elsewhere) and with polling.
+tests/test_install_watcher.py checks that both report each new or changed installation exactly once.
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+from extractor.model.install_watcher import InstallWatcher
+from .synthetic import write_xcode_app
+
+def idle_cpu(use_inotify: bool, seconds: float) -> float:
+    """Returns the CPU seconds per minute a watcher of three unchanged installations uses."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for version in ('14.3', '15.0', '15.1'):
+            write_xcode_app(Path(tmp) / f'Xcode-{version}.app', specs=1, options_per_spec=1, version=version)
+        watcher = InstallWatcher([Path(tmp)], use_inotify=use_inotify)
+        stop = threading.Event()
+        thread = threading.Thread(target=watcher.run, args=(lambda install: None, stop), daemon=True)
+        thread.start()
+        # let it report the installations found at the start
+        time.sleep(0.5)
+        start = time.process_time()
+        time.sleep(seconds)
+        used = time.process_time() - start
+        stop.set()
+        thread.join()
+    return used / seconds * 60
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--idle-seconds', type=float, default=10.0)
+    args = parser.parse_args()
+    for name, use_inotify in (('inotify', True), ('polling', False)):
+        print(f'{name}: idle CPU time {idle_cpu(use_inotify, args.idle_seconds) * 1000:.1f} ms per minute')
+
+if __name__ == '__main__':
+    main()
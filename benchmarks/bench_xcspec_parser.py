@@ -0,0 +1,47 @@
+"""Compares the in-process .xcspec parser with the plutil conversion route."""
+
+import plistlib
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from extractor.model.importer import openstep_parser
+from extractor.model.importer.plist_importer import PlistImporter
+from extractor.model.importer.xcspec_converter import convert
+from .synthetic import spec, spec_options, to_openstep
+
+FILES = 200
+OPTIONS_PER_FILE = 60
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(FILES):
+            root = spec(spec_options(OPTIONS_PER_FILE, seed=i))
+            text = '// synthetic spec\n' + to_openstep(root)
+            # the native parser must return exactly what was serialized
+            assert openstep_parser.loads(text.encode()) == root
+            path = Path(tmp) / f'Spec{i}.xcspec'
+            path.write_text(text)
+            paths.append(path)
+
+        start = time.perf_counter()
+        native = PlistImporter.parse_paths(paths)
+        native_time = time.perf_counter() - start
+        print(f'native:  {len(paths)} files, {len(native)} settings in {native_time:.3f}s')
+
+        if shutil.which('plutil') is None:
+            print('plutil:  not available on this platform, skipped')
+            return
+        start = time.perf_counter()
+        count = 0
+        for path in paths:
+            temp = convert(path)
+            with open(temp, 'rb') as fp:
+                count += sum(len(d.get('Options', [])) for d in plistlib.load(fp))
+            Path(temp).unlink()
+        plutil_time = time.perf_counter() - start
+        print(f'plutil:  {len(paths)} files in {plutil_time:.3f}s ({plutil_time / native_time:.1f}x slower)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Compares the selective XML plist parse with loading the whole spec with plistlib."""
+
+import plistlib
+import random
+import tempfile
+import time
+from pathlib import Path
+from extractor.model.importer.plist_importer import PlistImporter
+from .measure import measure, report
+from .synthetic import spec, spec_options
+
+OPTIONS = 20000
+REPEAT = 3
+
+def large_spec(count: int) -> list:
+    """A spec with options that carry the extra properties of real compiler specs."""
+    rnd = random.Random(1)
+    options = spec_options(count)
+    for option in options:
+        option['CommandLineArgs'] = {'YES': ['-f' + option['Name'].lower()], 'NO': []}
+        option['Condition'] = '$(ENABLE_' + option['Name'] + ') == YES'
+        if rnd.random() < 0.3:
+            option['AdditionalLinkerArgs'] = {'YES': ['-l' + str(i) for i in range(10)]}
+        if 'Values' in option and rnd.random() < 0.5:
+            option['Values'] = [{'Value': v, 'DisplayName': v.title(), 'CommandLineFlag': '-' + v}
+                                for v in option['Values']]
+    root = spec(options)
+    root.insert(0, {'Identifier': 'com.apple.tool.synthetic', 'Properties': [
+        {'Name': f'PROPERTY_{i}', 'Type': 'String', 'DefaultValue': 'x' * 40} for i in range(count)
+    ]})
+    return root
+
+def legacy_parse(path: Path) -> list:
+    """The former parse, which loads the whole object graph first."""
+    with open(path, 'rb') as fp:
+        pl = plistlib.load(fp)
+    return [
+        PlistImporter._setting(option)
+        for d in pl if "Options" in d
+        for option in d["Options"] if not str(option.get("Name")).startswith('__')
+    ]
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'Large.plist'
+        with open(path, 'wb') as fp:
+            plistlib.dump(large_spec(OPTIONS), fp)
+        print(f'{path.name}: {OPTIONS} options, {path.stat().st_size / 1024 / 1024:.1f} MiB')
+
+        selective = PlistImporter.parse(path)
+        legacy = legacy_parse(path)
+        assert [s.to_dict() for s in selective] == [s.to_dict() for s in legacy]
+
+        for name, func in [('plistlib', legacy_parse), ('selective', PlistImporter.parse)]:
+            best = min(measure_time(func, path) for _ in range(REPEAT))
+            _, _, peak = measure(lambda: func(path))
+            report(name, best, peak)
+
+def measure_time(func, path: Path) -> float:
+    start = time.perf_counter()
+    func(path)
+    return time.perf_counter() - start
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+"""This module provides helpers to measure time and peak memory of a call."""
+
+import time
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+def measure(func: Callable[[], Any]) -> Tuple[Any, float, int]:
+    """Calls func and returns its result, the wall time in seconds and the peak traced memory in bytes."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+def report(name: str, elapsed: float, peak: int):
+    print(f'{name:<32} {elapsed * 1000:10.1f} ms {peak / 1024 / 1024:10.2f} MiB peak')
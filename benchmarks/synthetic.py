@@ -0,0 +1,157 @@
+"""This module provides helpers to generate synthetic spec files for the benchmarks."""
+
+import plistlib
+import random
+from pathlib import Path
+from typing import List
+
+_TYPES = ['string', 'stringlist', 'path', 'pathlist', 'bool', 'Boolean', 'enum']
+_CATEGORIES = ['Linking', 'Deployment', 'CodeGeneration', 'Warnings', 'Language', 'Packaging']
+_WORDS = ['SWIFT', 'CLANG', 'GCC', 'WARN', 'ENABLE', 'OPTIMIZATION', 'LEVEL', 'OBJC', 'ARC', 'LINKER',
+          'INFOPLIST', 'PATH', 'SEARCH', 'DEBUG', 'INFORMATION', 'FORMAT', 'STRICT', 'MODULE']
+# Value lists many settings of a real Xcode have in common
+_COMMON_VALUES = [
+    ('YES', 'NO', 'YES_ERROR'),
+    ('YES', 'YES_AGGRESSIVE', 'NO'),
+    ('YES', 'NO', 'YES_NONCONSTANT', 'YES_ERROR'),
+    ('0', '1', '2', '3', 's', 'fast', 'z'),
+    ('dwarf', 'dwarf-with-dsym'),
+    ('compiler-default', 'c89', 'gnu89', 'c99', 'gnu99', 'c11', 'gnu11'),
+]
+
+# The prefixes of the keys of the specs of some tools of a real Xcode
+_TOOL_PREFIXES = ['SWIFT_', 'CLANG_', 'GCC_', 'LD_', 'INFOPLIST_KEY_', 'CODE_SIGN_', 'ASSETCATALOG_', 'IBC_',
+                  'METAL_', 'COPY_']
+
+def spec_options(count: int, seed: int = 0) -> List[dict]:
+    """Generates a list of realistic build setting options."""
+    rnd = random.Random(seed)
+    options = []
+    for i in range(count):
+        name = '_'.join(rnd.choice(_WORDS) for _ in range(rnd.randint(2, 5))) + f'_{i}'
+        if rnd.random() < 0.05:
+            name = '__' + name
+        option = {
+            'Name': name,
+            'Type': rnd.choice(_TYPES),
+            'Category': rnd.choice(_CATEGORIES),
+            'Description': ' '.join(rnd.choice(_WORDS).lower() for _ in range(rnd.randint(10, 80))),
+        }
+        if option['Type'] == 'enum':
+            if rnd.random() < 0.6:
+                values = list(rnd.choice(_COMMON_VALUES))
+            else:
+                values = [f'{rnd.choice(_WORDS).lower()}{j}' for j in range(rnd.randint(2, 8))]
+            option['Values'] = values
+            option['DefaultValue'] = rnd.choice(values)
+        elif option['Type'] in ('bool', 'Boolean'):
+            option['DefaultValue'] = rnd.choice(['YES', 'NO'])
+        elif rnd.random() < 0.5:
+            option['DefaultValue'] = '$(inherited) ' + rnd.choice(_WORDS).lower()
+        options.append(option)
+    return options
+
+def spec(options: List[dict], identifier: str = 'com.apple.compilers.synthetic') -> list:
+    """Wraps options into the root object of a spec file."""
+    return [
+        {'Identifier': identifier, 'Type': 'Compiler', 'Name': identifier},
+        {'Identifier': identifier + '.options', 'Type': 'BuildSettings', 'Options': options},
+    ]
+
+def to_openstep(obj, indent: int = 0) -> str:
+    """Serializes an object to the old-style plist syntax used by .xcspec files."""
+    pad = '    ' * indent
+    if isinstance(obj, dict):
+        lines = ['{']
+        for key, value in obj.items():
+            lines.append(f'{pad}    {_string(key)} = {to_openstep(value, indent + 1)};')
+        lines.append(pad + '}')
+        return '\n'.join(lines)
+    if isinstance(obj, list):
+        lines = ['(']
+        for value in obj:
+            lines.append(f'{pad}    {to_openstep(value, indent + 1)},')
+        lines.append(pad + ')')
+        return '\n'.join(lines)
+    if isinstance(obj, bytes):
+        return '<' + obj.hex() + '>'
+    return _string(str(obj))
+
+def _string(text: str) -> str:
+    if text and all(c.isalnum() and c.isascii() or c in '_$/:.-' for c in text):
+        return text
+    escaped = text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'"{escaped}"'
+
+# Subtrees of a real Xcode.app that hold many files but no build setting specs
+_DECOY_DIRS = [
+    'Developer/Platforms/iPhoneOS.platform/Developer/SDKs/iPhoneOS.sdk/usr/include',
+    'Developer/Platforms/MacOSX.platform/Developer/SDKs/MacOSX.sdk/System/Library/Frameworks/Foo.framework/Headers',
+    'Developer/Platforms/iPhoneOS.platform/Library/Developer/CoreSimulator/Profiles/Runtimes/iOS.simruntime/Contents',
+    'Developer/Toolchains/XcodeDefault.xctoolchain/usr/lib/swift',
+    'Developer/Documentation/DocSets/com.apple.adc.documentation.docset/Contents/Resources',
+    'SharedFrameworks/DVTKit.framework/Versions/A/Resources/en.lproj',
+    'Frameworks/IDEKit.framework/Versions/A/Resources',
+]
+
+def write_xcode_app(
+    root,
+    specs: int = 50,
+    options_per_spec: int = 60,
+    decoys: int = 0,
+    spec_format: str = 'openstep',
+    version: str = '14.3',
+    build: str = '14E222b',
+    tool_prefixes: bool = False
+) -> Path:
+    """Writes a synthetic Xcode.app with a version.plist, .xcspec files and decoy files.
+
+    spec_format is 'openstep' for old-style specs or 'xml' for specs stored as XML plists. With
+    tool_prefixes set, the keys of a spec start with the prefix of the tool it stands for, like the
+    keys of the compiler and linker specs of a real Xcode.
+    """
+    app = Path(root)
+    contents = app / 'Contents'
+    contents.mkdir(parents=True, exist_ok=True)
+    with (contents / 'version.plist').open('wb') as fp:
+        plistlib.dump({'CFBundleShortVersionString': version, 'ProductBuildVersion': build}, fp)
+    for i in range(specs):
+        # every spec is placed in its own bundle, specs with the same name exist in several bundles
+        spec_dir = contents / 'PlugIns' / f'Plugin{i}.xcplugin' / 'Contents' / 'Resources'
+        spec_dir.mkdir(parents=True, exist_ok=True)
+        # overlapping seeds produce duplicated keys across spec files
+        options = spec_options(options_per_spec, seed=i // 2)
+        if tool_prefixes:
+            prefix = _TOOL_PREFIXES[i % len(_TOOL_PREFIXES)]
+            options = [option if option['Name'].startswith('__') else dict(option, Name=prefix + option['Name'])
+                       for option in options]
+        root_object = spec(options)
+        spec_path = spec_dir / f'Spec{i % 10}.xcspec'
+        if spec_format == 'xml':
+            spec_path.write_bytes(plistlib.dumps(root_object))
+        else:
+            spec_path.write_text(to_openstep(root_object))
+    for i in range(decoys):
+        decoy_dir = contents / _DECOY_DIRS[i % len(_DECOY_DIRS)] / f'dir{i // 100}'
+        decoy_dir.mkdir(parents=True, exist_ok=True)
+        (decoy_dir / f'file{i}.h').write_text('// decoy\n')
+    return app
+
+def settings(count: int, seed: int = 0) -> list:
+    """Generates a list of Settings the way PlistImporter creates them from spec options."""
+    from extractor.model.importer.plist_importer import PlistImporter
+    from extractor.model.setting import Setting
+    result = []
+    for option in spec_options(count, seed=seed):
+        if option['Name'].startswith('__'):
+            continue
+        result.append(Setting(
+            name=option['Name'],
+            key=option['Name'],
+            description=option.get('Description'),
+            type=option.get('Type'),
+            category=option.get('Category'),
+            default_value=option.get('DefaultValue'),
+            enum_cases=PlistImporter._extract_enum_cases(option.get('Values', []))
+        ))
+    return result
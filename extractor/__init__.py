@@ -1,4 +1,8 @@
 """Top-level package for the Xcode build settings extractor."""
 
 __app_name__ = "extractor"
-__version__ = "0.1.0"
\ No newline at end of file
+__version__ = "0.1.0"
+
+def version_text() -> str:
+    """Returns the line the --version option prints."""
+    return f"{__app_name__} v{__version__}"
@@ -1,7 +1,13 @@
-from extractor import cli, __app_name__
+import sys
+from extractor import __app_name__, version_text
 
 def main():
+    if sys.argv[1:] in (["--version"], ["-v"]):
+        # only a bare --version skips loading typer and the CLI, any other command goes through the app
+        print(version_text())
+        return
+    from extractor import cli
     cli.app(prog_name=__app_name__)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,18 +1,26 @@
-"""This module provides the extractor CLI."""
+"""This module provides the extractor CLI.
 
+The commands import the importers, exporters and other models they need when they run, so starting
+the CLI (e.g. for --version or a JSON-only extraction) does not load code the command never uses.
+"""
+
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import typer
-from extractor import __app_name__, __version__
-from extractor.model.xcode_version_extractor import XcodeVersionExtractor
-from .model.importer.importer import Importer
-from .model.exporter.exporter import Exporter
+from extractor import version_text
+from .model.cache_dir import default_cache_dir
+from .model.exporter.json_format import JSONFormat
+from .model.setting import Setting
+from .model.setting_filter import InvalidPatternError, SettingFilter
+from .model.diff_format import DiffFormat
+from .model.settings_index import MergePolicy
 
 app = typer.Typer()
 
 def _version_callback(value: bool) -> None:
     if value:
-        typer.echo(f"{__app_name__} v{__version__}")
+        typer.echo(version_text())
         raise typer.Exit()
 
 @app.callback()
@@ -43,32 +51,874 @@ def extract(
         help="The path to the json file the build settings should be exported to.", 
         file_okay=True,
         dir_okay=False),
+    json_format: JSONFormat = typer.Option(
+        JSONFormat.PRETTY,
+        "--json-format",
+        help="The layout of the json file: an indented document, a compact document or one setting per line.",
+        case_sensitive=False),
     output_swift: Optional[Path] = typer.Option(
         None,
         "--swift",
         "-s",
         help="The path to the swift file the build settings should be exported to.", 
         file_okay=True,
+        dir_okay=False),
+    outs: List[str] = typer.Option(
+        None,
+        "--out",
+        help="An additional output as FORMAT=PATH, e.g. ndjson=settings.ndjson. Can be repeated. The formats are json, ndjson, swift, swift-lean, swift-shards (a directory) and those of installed exporter plugins. Only swift-lean and swift-shards share one argument enum between settings with the same values.",
+        show_default=False),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="The number of spec files parsed concurrently. Defaults to the number of CPUs, 1 parses sequentially.",
+        min=1),
+    threads: bool = typer.Option(
+        False,
+        "--threads",
+        help="Parse the spec files in a thread pool instead of a process pool."),
+    cache_dir: Path = typer.Option(
+        default_cache_dir(),
+        "--cache-dir",
+        help="The directory the parsed spec files are cached in.",
+        file_okay=False,
+        dir_okay=True),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every spec file without reading or updating the cache."),
+    clear_cache: bool = typer.Option(
+        False,
+        "--clear-cache",
+        help="Remove all cached spec files before extracting."),
+    full_scan: bool = typer.Option(
+        False,
+        "--full-scan",
+        help="Search the whole Xcode installation for spec files and report the ones the fast search misses."),
+    merge_policy: MergePolicy = typer.Option(
+        MergePolicy.FIRST_WINS,
+        "--merge-policy",
+        help="Decides which copy of a setting defined in several spec files is exported.",
+        case_sensitive=False),
+    include: List[str] = typer.Option(
+        None,
+        "--include",
+        help="Export only the settings whose key matches a glob pattern like 'SWIFT_*' or a regular expression prefixed with 're:'. Can be repeated.",
+        show_default=False),
+    exclude: List[str] = typer.Option(
+        None,
+        "--exclude",
+        help="Do not export the settings whose key matches a glob pattern or a regular expression prefixed with 're:'. Can be repeated.",
+        show_default=False),
+    categories: List[str] = typer.Option(
+        None,
+        "--category",
+        help="Export only the settings of a category. Can be repeated.",
+        show_default=False),
+    types: List[str] = typer.Option(
+        None,
+        "--type",
+        help="Export only the settings of a type, e.g. Boolean or Enumeration. Can be repeated.",
+        show_default=False),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="Regenerate the outputs even if Xcode, the spec files and the generator did not change."),
+    pipeline: bool = typer.Option(
+        False,
+        "--pipeline",
+        help="Parse the spec files while the Xcode installation is still being searched."),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print the time spent in each phase, counters and the slowest spec files."),
+    trace: Optional[Path] = typer.Option(
+        None,
+        "--trace",
+        help="The path to a file the phases and parsed files are written to in the Chrome trace format.",
+        file_okay=True,
         dir_okay=False)
 ) -> None:
     """Extracts the build settings from a given Xcode installation."""
-    xcode = Path(xc_path)
-    xcversion = XcodeVersionExtractor.extract_version(xc_path / "Contents/version.plist")
-    spec_file_paths = list(xcode.rglob('*.xcspec'))
-    settings = Importer.parse_paths(spec_file_paths)
-    if output_json:
-        Exporter.export_as_json(
-            xcversion=xcversion,
-            settings=settings,
-            output=output_json
+    from .model.profiler import PROFILER
+    outputs = [(name, Path(path)) for name, path in _outputs(output_json, output_swift, outs)]
+    try:
+        setting_filter = SettingFilter(include or [], exclude or [], categories or [], types or [])
+    except InvalidPatternError as e:
+        _showError(str(e))
+    if profile or trace:
+        PROFILER.enable()
+    try:
+        _extract(
+            Path(xc_path), outputs, json_format, workers, threads,
+            None if no_cache else cache_dir, clear_cache, full_scan, merge_policy, force, pipeline,
+            setting_filter or None
         )
-    if output_swift:
-        Exporter.export_as_swift(
-            xcversion=xcversion,
-            settings=settings,
-            output=output_swift
+    finally:
+        if profile:
+            typer.echo(PROFILER.summary())
+        if trace:
+            PROFILER.write_trace(trace)
+
+def _extract(
+    xcode: Path,
+    outputs: List[Tuple[str, Path]],
+    json_format: JSONFormat,
+    workers: Optional[int],
+    threads: bool,
+    cache_dir: Optional[Path],
+    clear_cache: bool,
+    full_scan: bool,
+    merge_policy: MergePolicy,
+    force: bool,
+    pipeline: bool,
+    setting_filter: Optional[SettingFilter] = None
+):
+    from .model.importer.importer import Importer
+    from .model.importer.parse_cache import ParseCache, file_digest
+    from .model.profiler import PROFILER
+    from .model.xcode_version_extractor import XcodeVersionExtractor
+    version_plist = xcode / "Contents/version.plist"
+    xcversion = XcodeVersionExtractor.extract_version(version_plist)
+    build = XcodeVersionExtractor.extract_build_version(version_plist)
+    manifest_dir = None if cache_dir is None else cache_dir / "manifests"
+    cache = None
+    if cache_dir is not None:
+        cache = ParseCache(cache_dir)
+        if clear_cache:
+            cache.clear()
+    settings = None
+    if pipeline and not full_scan:
+        # the files are parsed before the fingerprints are checked, unchanged outputs are still not rewritten
+        with PROFILER.phase("discover and parse"):
+            spec_file_paths, settings = Importer.parse_discovered(
+                _iter_discover(xcode, manifest_dir),
+                workers=workers or os.cpu_count() or 1,
+                use_threads=threads,
+                cache=cache,
+                policy=merge_policy,
+                setting_filter=setting_filter
+            )
+    else:
+        with PROFILER.phase("discover"):
+            spec_file_paths = _discover(xcode, manifest_dir=manifest_dir, full_scan=full_scan)
+
+    with PROFILER.phase("fingerprint"):
+        fingerprints = _outdated_outputs(
+            xcode, xcversion, build, spec_file_paths, cache.digest if cache else file_digest,
+            outputs, json_format, merge_policy, setting_filter, force
+        )
+    if not fingerprints:
+        if cache:
+            cache.save()
+        return
+
+    if settings is None:
+        with PROFILER.phase("parse"):
+            settings = Importer.parse_paths(
+                spec_file_paths,
+                workers=workers or os.cpu_count() or 1,
+                use_threads=threads,
+                cache=cache,
+                policy=merge_policy,
+                setting_filter=setting_filter
+            )
+    elif cache:
+        cache.save()
+    if cache:
+        typer.echo(f"Parse cache: {cache.stats}")
+    failed = _export(xcversion, settings, [o for o in outputs if o[1] in fingerprints], json_format, fingerprints)
+    if failed:
+        raise typer.Exit(1)
+
+def _outdated_outputs(
+    xcode: Path,
+    xcversion: str,
+    build: Optional[str],
+    spec_file_paths: List[Path],
+    digest: Callable[[Path], str],
+    outputs: List[Tuple[str, Path]],
+    json_format: JSONFormat,
+    merge_policy: MergePolicy,
+    setting_filter: Optional[SettingFilter],
+    force: bool
+) -> Dict[Path, str]:
+    """Returns the fingerprints of the outputs that have to be written, those of unchanged inputs are skipped."""
+    from .model.exporter.registry import ExporterRegistry
+    from .model.fingerprint import Fingerprint
+    spec_digests = Fingerprint.spec_digests(xcode, spec_file_paths, digest)
+    fingerprints = {}
+    for name, output in outputs:
+        options = {"format": name, "merge_policy": merge_policy.value}
+        if name == "json":
+            options["json_format"] = json_format.value
+        if setting_filter:
+            options["filter"] = setting_filter.to_dict()
+        exporter, _ = ExporterRegistry.get(name)
+        fingerprint = Fingerprint.compute(xcversion, build, spec_digests, options, exporter.generator_version)
+        stored = Fingerprint.stored(output)
+        if force:
+            typer.echo(f"Regenerating {output}: forced")
+        elif stored == fingerprint:
+            typer.echo(f"Skipping {output}: Xcode, spec files and generator are unchanged")
+            continue
+        elif stored is None:
+            typer.echo(f"Regenerating {output}: no previous fingerprint")
+        else:
+            typer.echo(f"Regenerating {output}: inputs changed")
+        fingerprints[output] = fingerprint
+    return fingerprints
+
+@app.command("extract-all")
+def extract_all(
+    xc_paths: List[str] = typer.Argument(
+        ...,
+        help="The paths to the local Xcode apps, glob patterns like '/Applications/Xcode*.app' are expanded."
+    ),
+    output_json: Optional[str] = typer.Option(
+        None,
+        "--json",
+        "-j",
+        help="The path template of the json files, e.g. '{version}.json'. {version}, {build} and {name} are replaced."),
+    json_format: JSONFormat = typer.Option(
+        JSONFormat.PRETTY,
+        "--json-format",
+        help="The layout of the json files: an indented document, a compact document or one setting per line.",
+        case_sensitive=False),
+    output_swift: Optional[str] = typer.Option(
+        None,
+        "--swift",
+        "-s",
+        help="The path template of the swift files, e.g. '{version}.swift'. {version}, {build} and {name} are replaced."),
+    outs: List[str] = typer.Option(
+        None,
+        "--out",
+        help="An additional output as FORMAT=TEMPLATE, e.g. ndjson={version}.ndjson. Can be repeated. The formats are json, ndjson, swift, swift-lean, swift-shards (a directory) and those of installed exporter plugins. Only swift-lean and swift-shards share one argument enum between settings with the same values.",
+        show_default=False),
+    jobs: Optional[int] = typer.Option(
+        None,
+        "--jobs",
+        help="The number of Xcode installations extracted concurrently. Defaults to all of them.",
+        min=1),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="The number of spec files parsed concurrently per installation. Defaults to the CPUs divided by the jobs.",
+        min=1),
+    threads: bool = typer.Option(
+        False,
+        "--threads",
+        help="Parse the spec files in a thread pool instead of a process pool."),
+    merge_policy: MergePolicy = typer.Option(
+        MergePolicy.FIRST_WINS,
+        "--merge-policy",
+        help="Decides which copy of a setting defined in several spec files is exported.",
+        case_sensitive=False),
+    cache_dir: Path = typer.Option(
+        default_cache_dir(),
+        "--cache-dir",
+        help="The directory the parsed spec files are cached in.",
+        file_okay=False,
+        dir_okay=True),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Do not read or update the cache. Identical spec files are still parsed only once."),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="Regenerate the outputs even if Xcode, the spec files and the generator did not change.")
+) -> None:
+    """Extracts the build settings from several Xcode installations at once."""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from .model.importer.importer import Importer
+    from .model.importer.parse_cache import ParseCache, SharedParseCache
+    from .model.xcode_version_extractor import XcodeVersionExtractor
+    xcodes = _expand_paths(xc_paths)
+    if not xcodes:
+        _showError("No Xcode installation found.")
+    templates = _outputs(output_json, output_swift, outs)
+    jobs = min(jobs or len(xcodes), len(xcodes))
+    workers = workers or max(1, (os.cpu_count() or 1) // jobs)
+    cache = SharedParseCache(None if no_cache else ParseCache(cache_dir))
+
+    # the outputs are known before any job runs, so installations writing the same file are refused
+    versions = {}
+    outputs = {}
+    writers = {}
+    for xcode in xcodes:
+        version_plist = xcode / "Contents/version.plist"
+        try:
+            versions[xcode] = (
+                XcodeVersionExtractor.extract_version(version_plist),
+                XcodeVersionExtractor.extract_build_version(version_plist)
+            )
+        except Exception as e:
+            # reported by the job of the installation
+            versions[xcode] = e
+            continue
+        xcversion, build = versions[xcode]
+        placeholders = {"version": xcversion, "build": build or "", "name": xcode.stem}
+        outputs[xcode] = [(name, _output_path(template, placeholders)) for name, template in templates]
+        for _, path in outputs[xcode]:
+            other = writers.setdefault(path.resolve(), xcode)
+            if other != xcode:
+                _showError(f"{other} and {xcode} would both be written to {path}, "
+                           "add {version}, {build} or {name} to the output path.")
+
+    def run(xcode: Path) -> Tuple[str, int, Optional[int], float]:
+        start = time.perf_counter()
+        if isinstance(versions[xcode], Exception):
+            raise versions[xcode]
+        xcversion, build = versions[xcode]
+        spec_file_paths = _discover(
+            xcode,
+            manifest_dir=None if no_cache else cache_dir / "manifests",
+            full_scan=False
+        )
+        fingerprints = _outdated_outputs(
+            xcode, xcversion, build, spec_file_paths, cache.digest,
+            outputs[xcode], json_format, merge_policy, None, force
         )
-        
+        if not fingerprints:
+            return xcversion, len(spec_file_paths), None, time.perf_counter() - start
+        try:
+            settings = Importer.parse_paths(
+                spec_file_paths,
+                workers=workers,
+                use_threads=threads,
+                cache=cache,
+                policy=merge_policy
+            )
+        finally:
+            # let other installations parse the files this one did not get to
+            cache.release()
+        failed = _export(xcversion, settings, [o for o in outputs[xcode] if o[1] in fingerprints], json_format, fingerprints)
+        if failed:
+            raise Exception("exporting " + ", ".join(str(o) for o in failed) + " failed")
+        return xcversion, len(spec_file_paths), len(settings), time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run, xcode) for xcode in xcodes]
+    failed = False
+    typer.echo(f"{'Xcode':<40} {'Version':<10} {'Specs':>6} {'Settings':>9} {'Time':>8}")
+    for xcode, future in zip(xcodes, futures):
+        try:
+            xcversion, specs, settings, elapsed = future.result()
+            # the settings of an installation whose outputs are unchanged are not parsed
+            settings = "-" if settings is None else settings
+            typer.echo(f"{str(xcode):<40} {xcversion:<10} {specs:>6} {settings:>9} {elapsed:>7.2f}s")
+        except Exception as e:
+            # one broken installation must not stop the others
+            failed = True
+            typer.secho(f"{str(xcode):<40} failed: {e}", fg=typer.colors.RED)
+    typer.echo(f"Shared parse results: {cache.stats}")
+    if failed:
+        raise typer.Exit(1)
+
+@app.command()
+def watch(
+    paths: List[Path] = typer.Argument(
+        ...,
+        exists=True,
+        help="The directories to watch for Xcode apps, e.g. /Applications, or Xcode apps."),
+    output_json: Optional[str] = typer.Option(
+        None,
+        "--json",
+        "-j",
+        help="The path template of the json files, e.g. '{version}.json'. {version}, {build} and {name} are replaced."),
+    json_format: JSONFormat = typer.Option(
+        JSONFormat.PRETTY,
+        "--json-format",
+        help="The layout of the json files: an indented document, a compact document or one setting per line.",
+        case_sensitive=False),
+    output_swift: Optional[str] = typer.Option(
+        None,
+        "--swift",
+        "-s",
+        help="The path template of the swift files, e.g. '{version}.swift'. {version}, {build} and {name} are replaced."),
+    outs: List[str] = typer.Option(
+        None,
+        "--out",
+        help="An additional output as FORMAT=TEMPLATE, e.g. ndjson={version}.ndjson. Can be repeated.",
+        show_default=False),
+    interval: float = typer.Option(
+        5.0,
+        "--interval",
+        help="The seconds between two looks at the Xcode apps when inotify is not available.",
+        min=0.1),
+    debounce: float = typer.Option(
+        10.0,
+        "--debounce",
+        help="The seconds an Xcode app has to stay unchanged before it is extracted.",
+        min=0.0),
+    poll: bool = typer.Option(
+        False,
+        "--poll",
+        help="Look at the Xcode apps every interval even if inotify is available."),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="The number of spec files parsed concurrently. Defaults to the number of CPUs, 1 parses sequentially.",
+        min=1),
+    threads: bool = typer.Option(
+        False,
+        "--threads",
+        help="Parse the spec files in a thread pool instead of a process pool."),
+    merge_policy: MergePolicy = typer.Option(
+        MergePolicy.FIRST_WINS,
+        "--merge-policy",
+        help="Decides which copy of a setting defined in several spec files is exported.",
+        case_sensitive=False),
+    cache_dir: Path = typer.Option(
+        default_cache_dir(),
+        "--cache-dir",
+        help="The directory the parsed spec files are cached in.",
+        file_okay=False,
+        dir_okay=True),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every spec file without reading or updating the cache.")
+) -> None:
+    """Extracts the build settings of Xcode installations when they appear or change, until interrupted.
+
+    The installations found at the start are extracted as well, their outputs are only rewritten if
+    they are out of date.
+    """
+    import signal
+    from .model.install_watcher import InstallWatcher
+    from .model.xcode_version_extractor import XcodeVersionExtractor
+    templates = _outputs(output_json, output_swift, outs)
+    if not templates:
+        _showError("No output given, pass --json, --swift or --out.")
+    watcher = InstallWatcher(
+        paths,
+        manifest_dir=None if no_cache else cache_dir / "manifests",
+        interval=interval,
+        debounce=debounce,
+        use_inotify=not poll
+    )
+
+    def extract_install(xcode: Path):
+        typer.echo(f"Extracting {xcode}")
+        try:
+            version_plist = xcode / "Contents/version.plist"
+            xcversion = XcodeVersionExtractor.extract_version(version_plist)
+            build = XcodeVersionExtractor.extract_build_version(version_plist)
+            placeholders = {"version": xcversion, "build": build or "", "name": xcode.stem}
+            outputs = [(name, _output_path(template, placeholders)) for name, template in templates]
+            _extract(
+                xcode, outputs, json_format, workers, threads, None if no_cache else cache_dir,
+                False, False, merge_policy, False, False
+            )
+        except typer.Exit:
+            typer.secho(f"Extracting {xcode} failed", fg=typer.colors.RED)
+        except Exception as e:
+            # a broken installation must not stop the watcher
+            typer.secho(f"Extracting {xcode} failed: {e}", fg=typer.colors.RED)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt()
+
+    signal.signal(signal.SIGTERM, stop)
+    typer.echo(f"Watching {', '.join(str(p) for p in paths)}")
+    try:
+        watcher.run(extract_install)
+    except KeyboardInterrupt:
+        pass
+
+@app.command()
+def diff(
+    old: Path = typer.Argument(
+        ...,
+        exists=True,
+        readable=True,
+        help="The older Xcode app or a json file exported from it."),
+    new: Path = typer.Argument(
+        ...,
+        exists=True,
+        readable=True,
+        help="The newer Xcode app or a json file exported from it."),
+    diff_format: DiffFormat = typer.Option(
+        DiffFormat.TEXT,
+        "--format",
+        "-f",
+        help="The format of the diff.",
+        case_sensitive=False),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="The path to the file the diff should be written to instead of printing it.",
+        file_okay=True,
+        dir_okay=False),
+    cache_dir: Path = typer.Option(
+        default_cache_dir(),
+        "--cache-dir",
+        help="The directory the parsed spec files are cached in.",
+        file_okay=False,
+        dir_okay=True),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every spec file without reading or updating the cache.")
+) -> None:
+    """Shows which build settings were added, removed or changed between two Xcode versions."""
+    from .model.settings_diff import SettingsDiff
+    old_version, _, old_settings = _load_settings(old, None if no_cache else cache_dir)
+    new_version, _, new_settings = _load_settings(new, None if no_cache else cache_dir)
+    rendered = SettingsDiff.between(old_settings, new_settings, old_version, new_version).render(diff_format)
+    if output:
+        output.write_text(rendered)
+    else:
+        typer.echo(rendered, nl=False)
+
+@app.command()
+def ingest(
+    paths: List[Path] = typer.Argument(
+        ...,
+        exists=True,
+        readable=True,
+        help="The Xcode apps or json files exported from them."),
+    db: Path = typer.Option(
+        default_cache_dir() / "history.sqlite",
+        "--db",
+        help="The path to the settings database.",
+        file_okay=True,
+        dir_okay=False),
+    cache_dir: Path = typer.Option(
+        default_cache_dir(),
+        "--cache-dir",
+        help="The directory the parsed spec files are cached in.",
+        file_okay=False,
+        dir_okay=True),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every spec file without reading or updating the cache.")
+) -> None:
+    """Stores the build settings of Xcode versions in a database for later queries."""
+    from .model.settings_history import SettingsHistory
+    with SettingsHistory(db) as history:
+        for path in paths:
+            xcversion, build, settings = _load_settings(path, None if no_cache else cache_dir)
+            if xcversion is None:
+                _showError(f"{path} does not contain an Xcode version.")
+            if history.ingest(xcversion, build, settings):
+                typer.echo(f"Ingested {len(settings)} settings of Xcode {xcversion} {build or ''}".rstrip())
+            else:
+                typer.echo(f"Xcode {xcversion} {build or ''}".rstrip() + " is already stored")
+
+@app.command()
+def query(
+    key: Optional[str] = typer.Option(None, "--key", "-k", help="The exact key of a setting."),
+    prefix: Optional[str] = typer.Option(None, "--prefix", "-p", help="The beginning of the keys, e.g. SWIFT_."),
+    category: Optional[str] = typer.Option(None, "--category", "-c", help="The category of the settings."),
+    version: Optional[str] = typer.Option(None, "--xcode-version", "-x", help="Only settings of this Xcode version."),
+    as_json: bool = typer.Option(False, "--json", help="Print the results as json."),
+    db: Path = typer.Option(
+        default_cache_dir() / "history.sqlite",
+        "--db",
+        help="The path to the settings database.",
+        exists=True,
+        file_okay=True,
+        dir_okay=False)
+) -> None:
+    """Looks up stored build settings without touching an Xcode installation."""
+    import json
+    from .model.settings_history import SettingsHistory
+    with SettingsHistory(db) as history:
+        results = history.query(key=key, prefix=prefix, category=category, version=version)
+    if as_json:
+        typer.echo(json.dumps(results, indent=4, sort_keys=True))
+        return
+    for result in results:
+        versions = result["versions"]
+        span = versions[0] if len(versions) == 1 else f"{versions[0]} … {versions[-1]} ({len(versions)} versions)"
+        typer.echo(f"{result['key']:<48} {span}")
+        typer.echo(f"    type: {result['type']}, category: {result['category']}, default: {result['default_value']}")
+        if result["enum_cases"]:
+            typer.echo(f"    cases: {', '.join(result['enum_cases'])}")
+
+@app.command()
+def serve(
+    xc_paths: List[str] = typer.Argument(
+        None,
+        help="Xcode apps loaded at start, glob patterns are expanded. Others are loaded on their first request."),
+    socket_path: Path = typer.Option(
+        default_cache_dir() / "serve.sock",
+        "--socket",
+        help="The path of the Unix domain socket the server listens on.",
+        file_okay=True,
+        dir_okay=False),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="The number of spec files parsed concurrently. Defaults to the number of CPUs, 1 parses sequentially.",
+        min=1),
+    threads: bool = typer.Option(
+        False,
+        "--threads",
+        help="Parse the spec files in a thread pool instead of a process pool."),
+    merge_policy: MergePolicy = typer.Option(
+        MergePolicy.FIRST_WINS,
+        "--merge-policy",
+        help="Decides which copy of a setting defined in several spec files is served.",
+        case_sensitive=False),
+    cache_dir: Path = typer.Option(
+        default_cache_dir(),
+        "--cache-dir",
+        help="The directory the parsed spec files are cached in.",
+        file_okay=False,
+        dir_okay=True),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every spec file without reading or updating the cache.")
+) -> None:
+    """Keeps the build settings of Xcode installations in memory and answers requests of `client`."""
+    import signal
+    from .model.settings_client import ServerError
+    from .model.settings_server import SettingsServer, SettingsStore
+    store = SettingsStore(
+        None if no_cache else cache_dir,
+        workers=workers or os.cpu_count() or 1,
+        use_threads=threads,
+        policy=merge_policy
+    )
+    for xcode in _expand_paths(xc_paths or []):
+        install = store.get(xcode)
+        typer.echo(f"Loaded {len(install.settings)} settings of Xcode {install.xcversion} from {install.xcode}")
+    try:
+        server = SettingsServer(socket_path, store)
+    except ServerError as e:
+        _showError(str(e))
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt()
+
+    signal.signal(signal.SIGTERM, stop)
+    typer.echo(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+@app.command()
+def client(
+    xcode: Optional[str] = typer.Argument(
+        None,
+        help="The path to the Xcode app, or the version or build of an Xcode app the server has loaded."),
+    key: Optional[str] = typer.Option(None, "--key", "-k", help="Look up a single setting."),
+    category: Optional[str] = typer.Option(None, "--category", "-c", help="List the settings of a category."),
+    categories: bool = typer.Option(False, "--categories", help="List the categories."),
+    installs: bool = typer.Option(False, "--installs", help="List the Xcode installations the server has loaded."),
+    swift: bool = typer.Option(False, "--swift", "-s", help="Export the settings as Swift instead of json."),
+    json_format: JSONFormat = typer.Option(
+        JSONFormat.PRETTY,
+        "--json-format",
+        help="The layout of the exported json: an indented document, a compact document or one setting per line.",
+        case_sensitive=False),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="The path to the file the answer should be written to instead of printing it.",
+        file_okay=True,
+        dir_okay=False),
+    socket_path: Path = typer.Option(
+        default_cache_dir() / "serve.sock",
+        "--socket",
+        help="The path of the Unix domain socket the server listens on.",
+        file_okay=True,
+        dir_okay=False)
+) -> None:
+    """Asks a running `serve` for build settings. Exports all settings unless another query is given."""
+    import json
+    from .model.exporter.output_file import replace_if_changed
+    from .model.settings_client import ServerError, request
+    if installs:
+        payload = {"command": "installs"}
+    elif xcode is None:
+        _showError("Missing the Xcode installation.")
+    else:
+        # the server may run in another directory
+        name = str(Path(xcode).resolve()) if Path(xcode).is_dir() else xcode
+        if key is not None:
+            payload = {"command": "lookup", "xcode": name, "key": key}
+        elif category is not None:
+            payload = {"command": "category", "xcode": name, "category": category}
+        elif categories:
+            payload = {"command": "categories", "xcode": name}
+        else:
+            payload = {
+                "command": "export",
+                "xcode": name,
+                "format": "swift" if swift else "json",
+                "json_format": json_format.value,
+            }
+    try:
+        result = request(socket_path, payload)
+    except ServerError as e:
+        _showError(str(e))
+    if payload["command"] == "export":
+        text = result
+    elif payload["command"] == "categories":
+        text = "".join(f"{c}\n" for c in result)
+    else:
+        text = json.dumps(result, indent=4, sort_keys=True) + "\n"
+    if output:
+        replace_if_changed(output, lambda temp: temp.write_text(text))
+    else:
+        typer.echo(text, nl=False)
+
+def _load_settings(path: Path, cache_dir: Optional[Path]) -> Tuple[Optional[str], Optional[str], List[Setting]]:
+    """Returns the version, the build and the settings of an Xcode app or of an exported json file.
+
+    Exported json files do not contain the build.
+    """
+    from .model.importer.importer import Importer
+    from .model.importer.json_importer import JSONImporter
+    from .model.importer.parse_cache import ParseCache
+    from .model.xcode_version_extractor import XcodeVersionExtractor
+    if path.is_file():
+        xcversion, settings = JSONImporter.load(path)
+        return xcversion, None, settings
+    version_plist = path / "Contents/version.plist"
+    spec_file_paths = _discover(
+        path,
+        manifest_dir=None if cache_dir is None else cache_dir / "manifests",
+        full_scan=False
+    )
+    settings = Importer.parse_paths(
+        spec_file_paths,
+        workers=os.cpu_count() or 1,
+        cache=None if cache_dir is None else ParseCache(cache_dir)
+    )
+    return (
+        XcodeVersionExtractor.extract_version(version_plist),
+        XcodeVersionExtractor.extract_build_version(version_plist),
+        settings
+    )
+
+def _expand_paths(patterns: List[str]) -> List[Path]:
+    """Expands glob patterns and removes duplicated paths."""
+    import glob
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            path = Path(match)
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+def _output_path(template: Optional[str], placeholders: dict) -> Optional[Path]:
+    if template is None:
+        return None
+    path = Path(template.format(**placeholders))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+def _discover(xcode: Path, manifest_dir: Optional[Path], full_scan: bool) -> List[Path]:
+    """Finds the spec files of an Xcode installation."""
+    from .model.spec_discovery import SpecDiscovery
+    from .model.xcode_version_extractor import XcodeVersionExtractor
+    if full_scan:
+        spec_file_paths = SpecDiscovery.discover(xcode, prune=False)
+        for missed in SpecDiscovery.missed_by_pruning(xcode, full_scan=spec_file_paths):
+            typer.secho(f"Missed by the fast search: {missed}", fg=typer.colors.YELLOW)
+        return spec_file_paths
+    if manifest_dir is None:
+        return SpecDiscovery.discover(xcode)
+    return SpecDiscovery.discover_with_manifest(
+        xcode,
+        build=XcodeVersionExtractor.extract_build_version(xcode / "Contents/version.plist"),
+        manifest_dir=manifest_dir
+    )
+
+def _iter_discover(xcode: Path, manifest_dir: Optional[Path]) -> Iterator[Path]:
+    """Yields the spec files of an Xcode installation as they are found."""
+    from .model.spec_discovery import SpecDiscovery
+    from .model.xcode_version_extractor import XcodeVersionExtractor
+    if manifest_dir is None:
+        return SpecDiscovery.iter_discover(xcode)
+    return SpecDiscovery.iter_discover_with_manifest(
+        xcode,
+        build=XcodeVersionExtractor.extract_build_version(xcode / "Contents/version.plist"),
+        manifest_dir=manifest_dir
+    )
+
+def _outputs(output_json, output_swift, outs: Optional[List[str]]) -> List[Tuple[str, str]]:
+    """Returns the format and the path of all requested outputs, --json and --swift first."""
+    from .model.exporter.registry import ExporterRegistry, UnknownFormatError
+    outputs = []
+    if output_json:
+        outputs.append(("json", str(output_json)))
+    if output_swift:
+        outputs.append(("swift", str(output_swift)))
+    for out in outs or []:
+        name, separator, path = out.partition("=")
+        if not separator or not name or not path:
+            _showError(f"{out} is not an output of the form FORMAT=PATH.")
+        outputs.append((name, path))
+    for name, _ in outputs:
+        try:
+            ExporterRegistry.get(name)
+        except UnknownFormatError as e:
+            _showError(str(e))
+    return outputs
+
+def _export(
+    xcversion: str,
+    settings: List[Setting],
+    outputs: List[Tuple[str, Path]],
+    json_format: JSONFormat,
+    fingerprints: Optional[Dict[Path, str]] = None
+) -> List[Path]:
+    """Exports the settings to all outputs concurrently and returns the outputs that failed.
+
+    The fingerprint of each written output is stored next to it, so the next run can skip it. An output
+    written without a fingerprint loses its old one, which no longer describes its content.
+    """
+    from .model.exporter.exporter import Exporter
+    from .model.exporter.registry import ExporterRegistry
+    from .model.fingerprint import Fingerprint
+    # outputs are written atomically and left untouched if their content did not change
+    results = Exporter.export_all(
+        xcversion,
+        settings,
+        [(name, path, {"json_format": json_format} if name == "json" else {}) for name, path in outputs]
+    )
+    failed = []
+    for output, error in results.items():
+        if error is not None:
+            typer.secho(f"Exporting {output} failed: {error}", fg=typer.colors.RED)
+            failed.append(output)
+        elif fingerprints and output in fingerprints:
+            Fingerprint.store(output, fingerprints[output])
+        else:
+            Fingerprint.remove(output)
+    shared = [
+        path for name, path in outputs if path not in failed and ExporterRegistry.get(name)[1].get("share_enums")
+    ]
+    if shared:
+        from .model.swift_generator import shared_enum_savings, shared_enums
+        enums = shared_enums(settings)
+        eliminated, lines = shared_enum_savings(settings, enums)
+        for output in shared:
+            typer.echo(f"Shared argument enums in {output}: {len(enums)} enums shared by {eliminated + len(enums)} "
+                       f"settings, {eliminated} enums and about {lines} lines eliminated")
+    return failed
+
 def _showError(txt: str):
     typer.secho(txt, fg=typer.colors.RED)
     raise typer.Exit(1)
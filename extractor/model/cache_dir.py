@@ -0,0 +1,9 @@
+"""This module provides the location of the files the extractor keeps between runs."""
+
+import os
+from pathlib import Path
+
+def default_cache_dir() -> Path:
+    """Returns the default cache directory of the extractor."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'xcode-build-settings-extractor'
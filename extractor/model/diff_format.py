@@ -0,0 +1,10 @@
+"""This module provides the formats a diff of build settings can be rendered in."""
+
+from enum import Enum
+
+class DiffFormat(str, Enum):
+    """The formats a diff can be rendered in."""
+
+    TEXT = "text"
+    JSON = "json"
+    MARKDOWN = "markdown"
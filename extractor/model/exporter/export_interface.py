@@ -8,8 +8,15 @@ from ..setting import Setting
 class ExportInterface(ABC):
     """An interface to export settings."""
 
+    # Whether the output is a directory the exporter writes several files to, instead of a single file
+    writes_directory = False
+
+    # Bump this whenever the output of the exporter changes, outputs fingerprinted with an older
+    # version are then regenerated even if Xcode and its spec files did not change
+    generator_version = 1
+
     @classmethod
     @abstractmethod
-    def export(cls, settings: List[Setting], output: Path) -> Path:
-        """Exports the settings to a file."""
+    def export(cls, xcversion: str, settings: List[Setting], output: Path) -> Path:
+        """Exports the settings of an Xcode version to a file."""
         pass
\ No newline at end of file
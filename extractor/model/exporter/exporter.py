@@ -1,21 +1,63 @@
 """This module provides an exporter."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
-from .export_interface import ExportInterface
-from .json_exporter import JSONExporter
-from .swift_exporter import SwiftExporter
+from typing import Dict, List, Optional, Tuple
+from .json_format import JSONFormat
+from .output_file import replace_if_changed
+from .registry import ExporterRegistry
+from ..profiler import PROFILER
 from ..setting import Setting
 
 class Exporter:
     """A class that provides severarl methods to export settings."""
 
     @classmethod
-    def export_as_json(cls, xcversion: str, settings: List[Setting], output: Path) -> Path:
+    def export(cls, name: str, xcversion: str, settings: List[Setting], output: Path, **options):
+        """Exports the settings to a file in a registered format."""
+        exporter, defaults = ExporterRegistry.get(name)
+        with PROFILER.phase(f"export {name}"):
+            exporter.export(xcversion=xcversion, settings=settings, output=output, **dict(defaults, **options))
+
+    @classmethod
+    def export_all(
+        cls,
+        xcversion: str,
+        settings: List[Setting],
+        outputs: List[Tuple[str, Path, dict]],
+        workers: Optional[int] = None
+    ) -> Dict[Path, Optional[Exception]]:
+        """Exports the settings to several files at once, given as format, path and options.
+
+        The exporters run concurrently on the same settings. Every file is written atomically and only
+        replaced if its content changed, exporters that write a directory do so for each of their files.
+        A failing exporter does not affect the others: the exception is returned for its output, None
+        for the outputs that were written.
+        """
+        # the settings are shared by the exporters, they only read them
+        settings = list(settings)
+
+        def run(output: Tuple[str, Path, dict]) -> Optional[Exception]:
+            name, path, options = output
+            try:
+                if ExporterRegistry.get(name)[0].writes_directory:
+                    # the exporter replaces each of its files itself
+                    cls.export(name, xcversion, settings, path, **options)
+                else:
+                    replace_if_changed(path, lambda temp: cls.export(name, xcversion, settings, temp, **options))
+            except Exception as e:
+                return e
+            return None
+
+        with ThreadPoolExecutor(max_workers=workers or max(1, len(outputs))) as executor:
+            return dict(zip((path for _, path, _ in outputs), executor.map(run, outputs)))
+
+    @classmethod
+    def export_as_json(cls, xcversion: str, settings: List[Setting], output: Path, json_format: JSONFormat = JSONFormat.PRETTY) -> Path:
         """Exports the settings to a JSON file."""
-        JSONExporter.export(settings=settings, xcversion=xcversion, output=output)
+        cls.export("json", xcversion, settings, output, json_format=json_format)
 
     @classmethod
     def export_as_swift(cls, xcversion: str, settings: List[Setting], output: Path) -> Path:
         """Exports the settings to a Swift file."""
-        SwiftExporter.export(settings=settings, xcversion=xcversion, output=output)
\ No newline at end of file
+        cls.export("swift", xcversion, settings, output)
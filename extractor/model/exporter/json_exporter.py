@@ -2,20 +2,65 @@
 
 import json
 from pathlib import Path
-from typing import List
+from typing import List, TextIO
 from .export_interface import ExportInterface
+from .json_format import JSONFormat
 from ..setting import Setting
 
 class JSONExporter(ExportInterface):
-    """An implementation of the ExportInterface to export settings to a json file."""
+    """An implementation of the ExportInterface to export settings to a json file.
+
+    The settings are written one at a time, so the whole document is never held in memory.
+    """
+
+    generator_version = 1
+
+    _pretty_encoder = json.JSONEncoder(indent=4, sort_keys=True)
+    _compact_encoder = json.JSONEncoder(separators=(',', ':'), sort_keys=True)
 
     @classmethod
-    def export(cls, xcversion: str, settings: List[Setting], output: Path) -> Path:
+    def export(cls, xcversion: str, settings: List[Setting], output: Path, json_format: JSONFormat = JSONFormat.PRETTY) -> Path:
         """Exports the settings to a JSON file."""
         with output.open('w') as out:
-            settings_dict = [s.__dict__ for s in settings]
-            dict_to_dump = {
-                "xcode_version": xcversion,
-                "settings": settings_dict
-            }
-            json.dump(dict_to_dump, out, indent=4, sort_keys=True)
\ No newline at end of file
+            cls.write(xcversion, settings, out, json_format)
+
+    @classmethod
+    def write(cls, xcversion: str, settings: List[Setting], out: TextIO, json_format: JSONFormat = JSONFormat.PRETTY):
+        """Writes the settings as JSON to a text stream."""
+        if json_format == JSONFormat.NDJSON:
+            cls._write_ndjson(xcversion, settings, out)
+        elif json_format == JSONFormat.COMPACT:
+            cls._write_compact(xcversion, settings, out)
+        else:
+            cls._write_pretty(xcversion, settings, out)
+
+    @classmethod
+    def _write_pretty(cls, xcversion: str, settings: List[Setting], out: TextIO):
+        # matches json.dump(..., indent=4, sort_keys=True) of {"settings": [...], "xcode_version": ...}
+        if not settings:
+            out.write('{\n    "settings": [],\n')
+        else:
+            out.write('{\n    "settings": [\n')
+            for i, s in enumerate(settings):
+                if i > 0:
+                    out.write(',\n')
+                setting = cls._pretty_encoder.encode(s.to_dict())
+                out.write('        ' + setting.replace('\n', '\n        '))
+            out.write('\n    ],\n')
+        out.write(f'    "xcode_version": {json.dumps(xcversion)}\n}}')
+
+    @classmethod
+    def _write_compact(cls, xcversion: str, settings: List[Setting], out: TextIO):
+        out.write('{"settings":[')
+        for i, s in enumerate(settings):
+            if i > 0:
+                out.write(',')
+            out.write(cls._compact_encoder.encode(s.to_dict()))
+        out.write(f'],"xcode_version":{json.dumps(xcversion)}}}')
+
+    @classmethod
+    def _write_ndjson(cls, xcversion: str, settings: List[Setting], out: TextIO):
+        for s in settings:
+            record = dict(s.to_dict(), xcode_version=xcversion)
+            out.write(cls._compact_encoder.encode(record))
+            out.write('\n')
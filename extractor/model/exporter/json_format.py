@@ -0,0 +1,13 @@
+"""This module provides the layouts of exported json files."""
+
+from enum import Enum
+
+class JSONFormat(str, Enum):
+    """The layouts the settings can be exported in."""
+
+    # An indented JSON document
+    PRETTY = "pretty"
+    # A JSON document without any whitespace
+    COMPACT = "compact"
+    # One JSON object per setting and line
+    NDJSON = "ndjson"
@@ -0,0 +1,30 @@
+"""This module provides atomic writing of output files."""
+
+import filecmp
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+def replace_if_changed(output: Path, write: Callable[[Path], None]) -> bool:
+    """Writes a file atomically and only replaces an existing file if the content differs.
+
+    write is called with the path of a temporary file next to the output. Returns whether the output
+    was replaced.
+    """
+    output = Path(output)
+    fd, temp = tempfile.mkstemp(dir=output.parent, prefix=f".{output.name}.", suffix=".tmp")
+    os.close(fd)
+    # mkstemp creates the file readable by the owner only, give it the mode of a newly created file
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(temp, 0o666 & ~umask)
+    try:
+        write(Path(temp))
+        if output.is_file() and filecmp.cmp(temp, output, shallow=False):
+            return False
+        os.replace(temp, output)
+        return True
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
@@ -0,0 +1,69 @@
+"""This module provides the registry of the formats settings can be exported to.
+
+Besides the built-in formats, exporters are discovered from the "extractor.exporters" entry point
+group. An entry point names the format and refers to an ExportInterface implementation, e.g. in the
+pyproject.toml of a plugin:
+
+    [project.entry-points."extractor.exporters"]
+    yaml = "my_plugin.yaml_exporter:YAMLExporter"
+
+Exporters are imported only when their format is used.
+"""
+
+import importlib
+from typing import Dict, List, Tuple, Type
+from .export_interface import ExportInterface
+
+ENTRY_POINT_GROUP = "extractor.exporters"
+
+class UnknownFormatError(Exception):
+    """Exception raised when no exporter is registered for a format"""
+
+class ExporterRegistry:
+    """Maps format names to exporters and the options they are called with."""
+
+    # format name: (module, class, options)
+    _builtin: Dict[str, Tuple[str, str, dict]] = {
+        "json": ("extractor.model.exporter.json_exporter", "JSONExporter", {}),
+        "ndjson": ("extractor.model.exporter.json_exporter", "JSONExporter", {"json_format": "ndjson"}),
+        "swift": ("extractor.model.exporter.swift_exporter", "SwiftExporter", {}),
+        "swift-lean": ("extractor.model.exporter.swift_exporter", "SwiftLeanExporter", {"lean": True, "share_enums": True}),
+        "swift-shards": ("extractor.model.exporter.swift_exporter", "SwiftShardsExporter", {"share_enums": True}),
+    }
+    _registered: Dict[str, Tuple[Type[ExportInterface], dict]] = {}
+
+    @classmethod
+    def register(cls, name: str, exporter: Type[ExportInterface], **options):
+        """Registers an exporter for a format, replacing an exporter registered for it before."""
+        cls._registered[name] = (exporter, options)
+
+    @classmethod
+    def names(cls) -> List[str]:
+        """Returns the names of all formats, including those of installed plugins."""
+        names = set(cls._builtin) | set(cls._registered)
+        names.update(entry_point.name for entry_point in cls._entry_points())
+        return sorted(names)
+
+    @classmethod
+    def get(cls, name: str) -> Tuple[Type[ExportInterface], dict]:
+        """Returns the exporter of a format and the options it is called with."""
+        if name in cls._registered:
+            return cls._registered[name]
+        if name in cls._builtin:
+            module, attribute, options = cls._builtin[name]
+            return getattr(importlib.import_module(module), attribute), dict(options)
+        for entry_point in cls._entry_points():
+            if entry_point.name == name:
+                exporter = entry_point.load()
+                cls._registered[name] = (exporter, {})
+                return exporter, {}
+        raise UnknownFormatError(f"Unknown export format {name}, known formats are {', '.join(cls.names())}.")
+
+    @classmethod
+    def _entry_points(cls) -> list:
+        from importlib.metadata import entry_points
+        found = entry_points()
+        if hasattr(found, "select"):
+            return list(found.select(group=ENTRY_POINT_GROUP))
+        # the dictionary returned before Python 3.10
+        return list(found.get(ENTRY_POINT_GROUP, []))
@@ -3,14 +3,53 @@
 from pathlib import Path
 from typing import List
 from .export_interface import ExportInterface
-from ..swift_generator import to_swift_code
+from .output_file import replace_if_changed
+from ..swift_generator import CORE_FILE_NAME, SHARD_FILE_NAME, swift_shards, write_swift_code
 from ..setting import Setting
 
 class SwiftExporter(ExportInterface):
     """An implementation of the ExportInterface to export settings to a swift file."""
 
+    generator_version = 1
+
     @classmethod
-    def export(cls, xcversion: str, settings: List[Setting], output: Path) -> Path:
-        """Exports the settings to a Swift file."""
+    def export(cls, xcversion: str, settings: List[Setting], output: Path, lean: bool = False, share_enums: bool = False) -> Path:
+        """Exports the settings to a Swift file, see write_swift_code for the options."""
         with output.open('w') as out:
-            out.write(to_swift_code(settings=settings, xcversion=xcversion))
\ No newline at end of file
+            write_swift_code(settings=settings, xcversion=xcversion, out=out, lean=lean, share_enums=share_enums)
+
+class SwiftLeanExporter(SwiftExporter):
+    """An implementation of the ExportInterface to export settings to a lean swift file.
+
+    The lean output has a generator version of its own, so a change of it does not regenerate swift files.
+    """
+
+    generator_version = 2
+
+    @classmethod
+    def export(cls, xcversion: str, settings: List[Setting], output: Path, lean: bool = True, share_enums: bool = True) -> Path:
+        """Exports the settings to a lean Swift file, see write_swift_code for the options."""
+        return super().export(xcversion, settings, output, lean=lean, share_enums=share_enums)
+
+class SwiftShardsExporter(SwiftExporter):
+    """An implementation of the ExportInterface to export settings to a directory of swift files.
+
+    The settings are split into a core file and one file per category. Files whose content did not
+    change are not rewritten, so their modification time stays the same, and the files of categories
+    that no longer exist are removed.
+    """
+
+    writes_directory = True
+    generator_version = 1
+
+    @classmethod
+    def export(cls, xcversion: str, settings: List[Setting], output: Path, share_enums: bool = False) -> Path:
+        """Exports the settings to Swift files in the output directory."""
+        output.mkdir(parents=True, exist_ok=True)
+        shards = swift_shards(settings=settings, xcversion=xcversion, share_enums=share_enums)
+        for name, code in shards.items():
+            replace_if_changed(output / name, lambda temp: temp.write_text(code))
+        for path in output.glob(SHARD_FILE_NAME.format('*')):
+            if path.name not in shards:
+                path.unlink()
+        return output / CORE_FILE_NAME
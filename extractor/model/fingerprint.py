@@ -0,0 +1,68 @@
+"""This module provides fingerprints of the inputs an output file was generated from."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable, List, Optional
+from extractor import __version__
+
+class Fingerprint:
+    """A class to fingerprint the inputs of an extraction and to store it next to its outputs.
+
+    The fingerprint covers the Xcode version and build, the paths and content hashes of all spec
+    files, the package version, the version of the exporter's output and the export options.
+    """
+
+    suffix = ".fingerprint"
+
+    @classmethod
+    def spec_digests(cls, xcode: Path, spec_paths: List[Path], digest: Callable[[Path], str]) -> List[List[str]]:
+        """Returns the sorted relative paths and content hashes of the spec files."""
+        return sorted([str(p.relative_to(xcode)), digest(p)] for p in spec_paths)
+
+    @classmethod
+    def compute(
+        cls,
+        xcversion: str,
+        build: Optional[str],
+        spec_digests: List[List[str]],
+        options: dict,
+        generator_version: int = 1
+    ) -> str:
+        """Returns the fingerprint of the inputs, generator_version is that of the exporter writing the output."""
+        inputs = {
+            "xcode_version": xcversion,
+            "build": build,
+            "generator": __version__,
+            "generator_version": generator_version,
+            "specs": spec_digests,
+            "options": options,
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+    @classmethod
+    def stored(cls, output: Path) -> Optional[str]:
+        """Returns the fingerprint stored for an output, or None if there is none or the output is missing."""
+        if not output.exists():
+            return None
+        try:
+            return cls._path(output).read_text().strip()
+        except OSError:
+            return None
+
+    @classmethod
+    def store(cls, output: Path, fingerprint: str):
+        """Stores the fingerprint of an output next to it."""
+        cls._path(output).write_text(fingerprint + "\n")
+
+    @classmethod
+    def remove(cls, output: Path):
+        """Removes the fingerprint of an output, e.g. after it was written from other inputs."""
+        try:
+            cls._path(output).unlink()
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def _path(cls, output: Path) -> Path:
+        return output.with_name(output.name + cls.suffix)
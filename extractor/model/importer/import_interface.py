@@ -2,8 +2,11 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
+from .parse_cache import ParseCache
 from ..setting import Setting
+from ..setting_filter import SettingFilter
+from ..settings_index import SettingsIndex
 
 class ImportInterface(ABC):
     """An interface to import settings."""
@@ -23,6 +26,41 @@ class ImportInterface(ABC):
 
     @classmethod
     @abstractmethod
-    def parse_paths(cls, paths: List[Path]) -> List[Setting]:
-        """Parses the contents of a list of files to a list of Settings."""
-        pass
\ No newline at end of file
+    def parse_paths(
+        cls,
+        paths: List[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        cache: Optional[ParseCache] = None,
+        setting_filter: Optional[SettingFilter] = None
+    ) -> List[Setting]:
+        """Parses the contents of a list of files to a list of Settings, or of those the filter selects."""
+        pass
+
+    @classmethod
+    def parse_paths_into(
+        cls,
+        index: SettingsIndex,
+        paths: List[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        cache: Optional[ParseCache] = None,
+        setting_filter: Optional[SettingFilter] = None
+    ) -> SettingsIndex:
+        """Parses the contents of a list of files and adds the Settings to an index."""
+        index.extend(cls.parse_paths(paths, workers=workers, use_threads=use_threads, cache=cache, setting_filter=setting_filter))
+        return index
+
+    @classmethod
+    def iter_settings(
+        cls,
+        paths: Iterable[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        cache: Optional[ParseCache] = None,
+        setting_filter: Optional[SettingFilter] = None
+    ) -> Iterator[Tuple[Path, List[Setting]]]:
+        """Parses the contents of files and yields each path with its Settings as soon as it is parsed."""
+        for path in paths:
+            settings = cls.parse(path)
+            yield path, setting_filter.apply(settings) if setting_filter else settings
@@ -1,34 +1,120 @@
 """This module provides an implementation of the ImportInterface."""
 
+import threading
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from .import_interface import ImportInterface
 from .plist_importer import PlistImporter
+from .parse_cache import ParseCache
+from ..profiler import PROFILER
 from ..setting import Setting
+from ..setting_filter import SettingFilter
+from ..settings_index import MergePolicy, SettingsIndex
 
 class Importer(ImportInterface):
     """An implementation of the ImportInterface."""
     importers = [PlistImporter]
 
     @classmethod
-    def parse(cls, path: Path) -> List[Setting]:
-        """Parses the contents of a file to a list of Settings."""
+    def parse(cls, path: Path, policy: MergePolicy = MergePolicy.FIRST_WINS) -> SettingsIndex:
+        """Parses the contents of a file to an index of Settings."""
         settings = []
         for importer in cls.importers:
             settings += importer.parse(path)
-        return cls._clean(settings)
+        return cls._clean(settings, policy=policy)
 
     @classmethod
-    def parse_paths(cls, paths: List[Path]) -> List[Setting]:
-        """Parses the contents of a list of files to a list of Settings."""
-        settings = []
+    def parse_paths(
+        cls,
+        paths: List[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        cache: Optional[ParseCache] = None,
+        policy: MergePolicy = MergePolicy.FIRST_WINS,
+        setting_filter: Optional[SettingFilter] = None
+    ) -> SettingsIndex:
+        """Parses the contents of a list of files to an index of Settings.
+
+        Settings with the same key are merged under the given policy while the files are parsed. With a
+        filter, only the settings it selects are created.
+        """
+        index = SettingsIndex(policy=policy)
+        for importer in cls.importers:
+            importer.parse_paths_into(
+                index, paths, workers=workers, use_threads=use_threads, cache=cache, setting_filter=setting_filter
+            )
+        PROFILER.count("duplicates dropped", index.duplicates)
+        return index
+
+    @classmethod
+    def iter_settings(
+        cls,
+        paths: Iterable[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        cache: Optional[ParseCache] = None,
+        setting_filter: Optional[SettingFilter] = None
+    ) -> Iterator[Tuple[Path, List[Setting]]]:
+        """Parses the contents of files and yields each path with its Settings as soon as it is parsed.
+
+        The paths may be produced lazily, they are consumed while earlier files are parsed. The files
+        are yielded in the order they finish and their settings are neither merged nor sorted.
+        """
         for importer in cls.importers:
-            settings += importer.parse_paths(paths)
-        return cls._clean(settings)
+            yield from importer.iter_settings(
+                paths, workers=workers, use_threads=use_threads, cache=cache, setting_filter=setting_filter
+            )
+
+    @classmethod
+    def parse_discovered(
+        cls,
+        paths: Iterable[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        cache: Optional[ParseCache] = None,
+        policy: MergePolicy = MergePolicy.FIRST_WINS,
+        setting_filter: Optional[SettingFilter] = None
+    ) -> Tuple[List[Path], SettingsIndex]:
+        """Parses files while their paths are still being produced and returns the sorted paths and the index.
+
+        The settings are added to the index in the order of the sorted paths, as soon as all files
+        before them are parsed, so the index is the same parse_paths returns for the sorted paths.
+        """
+        found: List[Path] = []
+        complete = threading.Event()
+
+        def recorded():
+            for path in paths:
+                found.append(path)
+                yield path
+            complete.set()
+
+        index = SettingsIndex(policy=policy)
+        parsed: Dict[Path, List[Setting]] = {}
+        ordered: Optional[List[Path]] = None
+        added = 0
+        discovered = cls.iter_settings(
+            recorded(), workers=workers, use_threads=use_threads, cache=cache, setting_filter=setting_filter
+        )
+        for path, settings in discovered:
+            parsed[path] = settings
+            if ordered is None and complete.is_set():
+                ordered = sorted(found)
+            while ordered is not None and added < len(ordered) and ordered[added] in parsed:
+                index.extend(parsed.pop(ordered[added]))
+                added += 1
+        if ordered is None:
+            ordered = sorted(found)
+        for path in ordered[added:]:
+            index.extend(parsed.pop(path))
+        PROFILER.count("duplicates dropped", index.duplicates)
+        return ordered, index
 
     @classmethod
-    def _clean(cls, settings: List[Setting]) -> List[Setting]:
+    def _clean(cls, settings: List[Setting], policy: MergePolicy = MergePolicy.FIRST_WINS) -> SettingsIndex:
         """Sorts the Settings and removes duplicates."""
-        cleaned_settings = list(set(settings))
-        cleaned_settings = sorted(cleaned_settings, key=lambda x: x.key, reverse=False)
-        return cleaned_settings
+        with PROFILER.phase("dedupe"):
+            index = SettingsIndex(policy=policy, settings=settings)
+            index.sorted()
+        PROFILER.count("duplicates dropped", index.duplicates)
+        return index
@@ -0,0 +1,74 @@
+"""This module provides the json importer."""
+
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple
+from .import_interface import ImportInterface
+from .parse_cache import ParseCache
+from ..setting import Setting
+from ..setting_filter import SettingFilter
+
+class JSONImporter(ImportInterface):
+    """An implementation of the ImportInterface to import settings exported by the JSONExporter.
+
+    Pretty, compact and NDJSON exports are all recognized.
+    """
+
+    allowed_extensions = [".json", ".ndjson"]
+
+    @classmethod
+    def parse(cls, path: Path) -> List[Setting]:
+        """Parses the file and returns all its settings."""
+        return cls.load(path)[1]
+
+    @classmethod
+    def parse_paths(
+        cls,
+        paths: List[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        cache: Optional[ParseCache] = None,
+        setting_filter: Optional[SettingFilter] = None
+    ) -> List[Setting]:
+        """Parses the given files and returns all their settings, or those the filter selects."""
+        settings = []
+        for path in paths:
+            settings += cls.parse(path)
+        return setting_filter.apply(settings) if setting_filter else settings
+
+    @classmethod
+    def load(cls, path: Path) -> Tuple[Optional[str], List[Setting]]:
+        """Returns the Xcode version and the settings of an exported file."""
+        if not cls.can_ingest(path):
+            raise Exception("cannot ingest exception")
+        with open(path) as fp:
+            first_line = fp.readline()
+            fp.seek(0)
+            if cls._is_ndjson_record(first_line):
+                records = [json.loads(line) for line in fp if line.strip()]
+                xcversion = records[0].get("xcode_version") if records else None
+            else:
+                document = json.load(fp)
+                records = document["settings"]
+                xcversion = document.get("xcode_version")
+        return xcversion, [cls._setting(r) for r in records]
+
+    @classmethod
+    def _is_ndjson_record(cls, line: str) -> bool:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return False
+        return isinstance(record, dict) and "key" in record
+
+    @classmethod
+    def _setting(cls, record: dict) -> Setting:
+        return Setting(
+            name=record.get("name"),
+            key=record.get("key"),
+            description=record.get("description"),
+            type=record.get("type"),
+            category=record.get("category"),
+            default_value=record.get("default_value"),
+            enum_cases=record.get("enum_cases") or []
+        )
@@ -0,0 +1,166 @@
+"""This module provides a parser for old-style (ASCII/OpenStep) property lists."""
+
+import plistlib
+import re
+from typing import Any
+
+# Characters that may appear in an unquoted string, as accepted by CoreFoundation.
+_UNQUOTED = re.compile(r'[A-Za-z0-9_$/:.\-]+')
+_WHITESPACE = re.compile(r'\s*')
+_QUOTED = {
+    '"': re.compile(r'"((?:[^"\\]|\\.)*)"', re.S),
+    "'": re.compile(r"'((?:[^'\\]|\\.)*)'", re.S),
+}
+_ESCAPE = re.compile(r'\\(?:([0-7]{1,3})|U([0-9a-fA-F]{1,4})|(.))', re.S)
+_ESCAPES = {
+    'a': '\a',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+    'v': '\v',
+    '\n': '\n',
+}
+_HEX_DATA = re.compile(r'<([0-9a-fA-F\s]*)>')
+
+def loads(data: bytes) -> Any:
+    """Parses the bytes of a property list and returns its root object.
+
+    Old-style plists are parsed natively, XML and binary plists are handed to plistlib.
+    """
+    if data.startswith(b'bplist') or data.lstrip().startswith(b'<?xml'):
+        return plistlib.loads(data)
+    return _Parser(_decode(data)).parse()
+
+def _decode(data: bytes) -> str:
+    if data.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return data.decode('utf-16')
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+def _unescape(match: 're.Match') -> str:
+    octal, unicode, char = match.groups()
+    if octal is not None:
+        return chr(int(octal, 8))
+    if unicode is not None:
+        return chr(int(unicode, 16))
+    return _ESCAPES.get(char, char)
+
+class _Parser:
+    """A recursive descent parser over the text of an old-style plist."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def parse(self) -> Any:
+        self._skip()
+        if self.pos == len(self.text):
+            raise OpenStepParseError("empty property list")
+        value = self._value()
+        self._skip()
+        if self.pos != len(self.text):
+            self._fail("unexpected content after the root object")
+        return value
+
+    def _fail(self, reason: str):
+        line = self.text.count('\n', 0, self.pos) + 1
+        raise OpenStepParseError(f"{reason} (line {line})")
+
+    def _skip(self):
+        """Skips whitespace and comments."""
+        text = self.text
+        while True:
+            self.pos = _WHITESPACE.match(text, self.pos).end()
+            if text.startswith('//', self.pos):
+                end = text.find('\n', self.pos)
+                self.pos = len(text) if end == -1 else end + 1
+            elif text.startswith('/*', self.pos):
+                end = text.find('*/', self.pos + 2)
+                if end == -1:
+                    self._fail("unterminated comment")
+                self.pos = end + 2
+            else:
+                return
+
+    def _expect(self, char: str):
+        self._skip()
+        if not self.text.startswith(char, self.pos):
+            self._fail(f"expected '{char}'")
+        self.pos += 1
+
+    def _value(self) -> Any:
+        if self.pos >= len(self.text):
+            self._fail("unexpected end of file")
+        char = self.text[self.pos]
+        if char == '{':
+            return self._dict()
+        if char == '(':
+            return self._array()
+        if char == '<':
+            return self._data()
+        return self._string()
+
+    def _string(self) -> str:
+        char = self.text[self.pos]
+        if char in _QUOTED:
+            match = _QUOTED[char].match(self.text, self.pos)
+            if match is None:
+                self._fail("unterminated string")
+            self.pos = match.end()
+            string = match.group(1)
+            if '\\' in string:
+                string = _ESCAPE.sub(_unescape, string)
+            return string
+        match = _UNQUOTED.match(self.text, self.pos)
+        if match is None:
+            self._fail(f"unexpected character '{char}'")
+        self.pos = match.end()
+        return match.group()
+
+    def _dict(self) -> dict:
+        self.pos += 1
+        result = {}
+        while True:
+            self._skip()
+            if self.text.startswith('}', self.pos):
+                self.pos += 1
+                return result
+            if self.pos >= len(self.text):
+                self._fail("unterminated dictionary")
+            key = self._string()
+            self._expect('=')
+            self._skip()
+            result[key] = self._value()
+            self._expect(';')
+
+    def _array(self) -> list:
+        self.pos += 1
+        result = []
+        while True:
+            self._skip()
+            if self.text.startswith(')', self.pos):
+                self.pos += 1
+                return result
+            result.append(self._value())
+            self._skip()
+            if self.text.startswith(',', self.pos):
+                self.pos += 1
+            elif not self.text.startswith(')', self.pos):
+                self._fail("expected ',' or ')'")
+
+    def _data(self) -> bytes:
+        match = _HEX_DATA.match(self.text, self.pos)
+        if match is None:
+            self._fail("malformed data")
+        digits = ''.join(match.group(1).split())
+        if len(digits) % 2:
+            self._fail("odd number of hex digits in data")
+        self.pos = match.end()
+        return bytes.fromhex(digits)
+
+class OpenStepParseError(Exception):
+    """Exception raised when an old-style property list is malformed"""
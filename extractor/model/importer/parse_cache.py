@@ -0,0 +1,257 @@
+"""This module provides a persistent cache for the settings parsed from spec files."""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from ..cache_dir import default_cache_dir
+
+# Bump this whenever the parsed representation changes, old entries are then ignored.
+_FORMAT_VERSION = 3
+_INDEX_NAME = 'index.json'
+_ENTRY_SUFFIX = '.pickle'
+
+def file_digest(path: Path) -> str:
+    """Returns the content hash of a file."""
+    with open(path, 'rb') as fp:
+        return hashlib.sha256(fp.read()).hexdigest()
+
+class CacheStats:
+    """Counters describing how the cache was used."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def __repr__(self):
+        return (f"{self.hits} hits, {self.misses} misses, "
+                f"{self.bytes_read} bytes read, {self.bytes_written} bytes written")
+
+class ParseCache:
+    """A size bounded on-disk cache of the settings parsed from each spec file.
+
+    An index maps a spec path to its size, mtime and content hash, so an unchanged file is recognized
+    with a single stat. It also records the key, category and type of the file's settings, so a filter
+    can tell that it selects none of them without loading the entry. The settings are stored as the
+    tuples of Setting.as_tuple, so a filter can select rows before any setting is created. Entries are
+    stored by content hash and are therefore shared by identical files, e.g. the same spec in two Xcode
+    installations. When the cache grows beyond max_bytes the least recently used entries are removed.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = Path(directory or default_cache_dir()) / f'v{_FORMAT_VERSION}'
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._index: Dict[str, list] = {}
+        self._index_changed = False
+        # guards the index only, files are read, hashed and written without holding it
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        try:
+            with (self.directory / _INDEX_NAME).open() as fp:
+                self._index = json.load(fp)
+        except (OSError, ValueError):
+            self._index = {}
+
+    def get(self, path: Path) -> Optional[List[tuple]]:
+        """Returns the cached rows of the settings of a spec file or None on a miss."""
+        digest = self.digest(path)
+        entry = self._entry_path(digest)
+        try:
+            data = entry.read_bytes()
+            rows = pickle.loads(data)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            self.stats.misses += 1
+            return None
+        # mark the entry as recently used
+        os.utime(entry)
+        self.stats.hits += 1
+        self.stats.bytes_read += len(data)
+        # entries stored before the index recorded facets get them now
+        self._record_facets(path, rows)
+        return rows
+
+    def put(self, path: Path, rows: List[tuple]):
+        """Stores the rows of the settings parsed from a spec file."""
+        data = pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL)
+        self._write_atomically(self._entry_path(self.digest(path)), data)
+        self.stats.bytes_written += len(data)
+        self._record_facets(path, rows)
+
+    def facets(self, path: Path) -> Optional[List[list]]:
+        """Returns the key, category and type of each setting of a spec file, or None if they are unknown."""
+        known = self._known(path)
+        return known[3] if len(known) > 3 else None
+
+    def save(self):
+        """Writes the index and evicts the least recently used entries beyond the size limit."""
+        self._evict()
+        with self._lock:
+            if not self._index_changed:
+                return
+            data = json.dumps(self._index).encode()
+            self._index_changed = False
+        self._write_atomically(self.directory / _INDEX_NAME, data)
+
+    def clear(self):
+        """Removes all cached entries."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._index = {}
+            self._index_changed = False
+
+    def size(self) -> int:
+        """Returns the size of all cached entries in bytes."""
+        return sum(p.stat().st_size for p in self.directory.glob('*' + _ENTRY_SUFFIX))
+
+    def digest(self, path: Path) -> str:
+        """Returns the content hash of a file, read from the index if the file did not change."""
+        return self._known(path)[2]
+
+    def _known(self, path: Path) -> list:
+        """Returns the up-to-date index entry of a file: its size, mtime, content hash and maybe facets."""
+        key = str(Path(path).resolve())
+        stat = os.stat(key)
+        with self._lock:
+            known = self._index.get(key)
+        if known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known
+        known = [stat.st_size, stat.st_mtime_ns, file_digest(key)]
+        with self._lock:
+            self._index[key] = known
+            self._index_changed = True
+        return known
+
+    def _record_facets(self, path: Path, rows: List[tuple]):
+        known = self._known(path)
+        # the key, category and type of each row
+        facets = [[row[2], row[4], row[3]] for row in rows]
+        with self._lock:
+            if known[3:] != [facets]:
+                known[3:] = [facets]
+                self._index_changed = True
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.directory / (digest + _ENTRY_SUFFIX)
+
+    def _write_atomically(self, path: Path, data: bytes):
+        fd, temp = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(data)
+        os.replace(temp, path)
+
+    def _evict(self):
+        entries = []
+        for entry in self.directory.glob('*' + _ENTRY_SUFFIX):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        evicted = set()
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink()
+            evicted.add(entry.name[:-len(_ENTRY_SUFFIX)])
+            total -= size
+        if evicted:
+            # forget the files whose entries are gone so the index does not grow forever either
+            with self._lock:
+                self._index = {k: v for k, v in self._index.items() if v[2] not in evicted}
+                self._index_changed = True
+
+class SharedParseCache:
+    """A thread-safe in-memory cache shared by concurrent extractions, optionally backed by a ParseCache.
+
+    The rows are kept by content hash, so byte-identical spec files of different Xcode
+    installations are parsed only once per run: the first thread missing a file claims it, other
+    threads asking for the same content wait until it was stored or the claim was released. A thread
+    that holds claims of its own does not wait, since the owner of the claim may be waiting for one of
+    them, it parses the file itself instead. The lock only guards the bookkeeping, the backing cache is
+    read and written outside of it.
+    """
+
+    def __init__(self, backing: Optional[ParseCache] = None):
+        self.backing = backing
+        self.stats = CacheStats()
+        self._entries: Dict[str, List[tuple]] = {}
+        self._claims: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> Optional[List[tuple]]:
+        """Returns the rows of a spec file parsed before or None if the caller has to parse it."""
+        digest = self.digest(path)
+        thread = threading.get_ident()
+        while True:
+            with self._lock:
+                rows = self._entries.get(digest)
+                if rows is not None:
+                    self.stats.hits += 1
+                    return rows
+                claim = self._claims.get(digest)
+                if claim is None:
+                    claim = (thread, threading.Event())
+                    self._claims[digest] = claim
+                    break
+                if claim[0] == thread or any(c[0] == thread for c in self._claims.values()):
+                    self.stats.misses += 1
+                    return None
+            claim[1].wait()
+        rows = self.backing.get(path) if self.backing is not None else None
+        with self._lock:
+            if rows is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self._entries[digest] = rows
+            self._claims.pop(digest, None)
+        claim[1].set()
+        return rows
+
+    def put(self, path: Path, rows: List[tuple]):
+        """Stores the rows of the settings parsed from a spec file."""
+        digest = self.digest(path)
+        with self._lock:
+            self._entries[digest] = rows
+            claim = self._claims.get(digest)
+            owned = claim is not None and claim[0] == threading.get_ident()
+            if owned:
+                del self._claims[digest]
+        if owned:
+            claim[1].set()
+        # a file parsed while another thread holds its claim is written by that thread
+        if self.backing is not None and (claim is None or owned):
+            self.backing.put(path, rows)
+
+    def release(self):
+        """Releases the files claimed by the current thread, e.g. after its extraction failed."""
+        thread = threading.get_ident()
+        with self._lock:
+            released = [d for d, claim in self._claims.items() if claim[0] == thread]
+            events = [self._claims.pop(d)[1] for d in released]
+        for event in events:
+            event.set()
+
+    def facets(self, path: Path) -> Optional[List[list]]:
+        """Returns the key, category and type of each setting of a spec file if the backing cache knows them."""
+        if self.backing is None:
+            return None
+        return self.backing.facets(path)
+
+    def save(self):
+        """Saves the backing cache."""
+        if self.backing is not None:
+            self.backing.save()
+
+    def digest(self, path: Path) -> str:
+        """Returns the content hash of a file."""
+        if self.backing is not None:
+            return self.backing.digest(path)
+        return file_digest(path)
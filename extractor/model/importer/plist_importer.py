@@ -1,13 +1,21 @@
 """This module provides the plist importer."""
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 import os
 from pathlib import Path
 import plistlib
-from typing import List
-from .xcspec_converter import convert
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+from . import openstep_parser, plist_stream
+from .parse_cache import ParseCache
 from .import_interface import ImportInterface
+from ..profiler import PROFILER
 from ..setting import Setting
-import typer
+from ..setting_filter import SettingFilter
+from ..settings_index import SettingsIndex
 
 class PlistImporter(ImportInterface):
     """An implementation of the ImportInterface to import settings from plist files."""
@@ -15,48 +23,341 @@ class PlistImporter(ImportInterface):
     allowed_extensions = [".plist",".xcspec"]
 
     @classmethod
-    def parse(cls, path: Path) -> List[Setting]:
-        """Parses the file and returns all its settings."""
-        settings = []
+    def parse(cls, path: Path, setting_filter: Optional[SettingFilter] = None) -> List[Setting]:
+        """Parses the file and returns all its settings, or those the filter selects."""
+        return cls._parse_counting_private(path, setting_filter)[0]
+
+    @classmethod
+    def _parse_counting_private(cls, path: Path, setting_filter: Optional[SettingFilter] = None) -> Tuple[List[Setting], int, int]:
+        """Parses the file and returns its settings and the numbers of omitted private and filtered out settings."""
+        options, private = cls._public_options(path)
+        return cls._selected_settings(options, private, setting_filter)
+
+    @classmethod
+    def _parse_rows(cls, path: Path) -> Tuple[List[tuple], int]:
+        """Parses the file and returns the attributes of all its settings as tuples and the number of omitted
+        private settings.
+
+        The tuples are what the parse cache stores, settings are created from them only for the options a
+        filter selects, see _materialized.
+        """
+        options, private = cls._public_options(path)
+        return [cls._row(option) for option in options], private
+
+    @classmethod
+    def _public_options(cls, path: Path) -> Tuple[List[dict], int]:
+        """Returns the public options of the file and the number of omitted private options."""
         if not cls.can_ingest(path):
             raise Exception("cannot ingest exception")
         with open(path, 'rb') as fp:
-            pl = plistlib.load(fp)
-            for d in pl:
-                if not "Options" in d:
+            if cls._is_xml(fp.read(64)):
+                fp.seek(0)
+                try:
+                    return plist_stream.parse_options(fp)
+                except plist_stream.NotAnArrayOfSpecs:
+                    pass
+            fp.seek(0)
+            pl = cls._loads(path, fp.read())
+
+        options = []
+        private = 0
+        for d in pl:
+            if not "Options" in d:
+                continue
+            for option in d["Options"]:
+                if str(option.get("Name")).startswith('__'):
+                    # omit private settings
+                    private += 1
                     continue
-                for option in d["Options"]:
-                    if str(option.get("Name")).startswith('__'):
-                        # omit private settings
-                        continue
+                options.append(option)
+        return options, private
 
-                    setting = Setting(
-                        name=option.get("Name"),
-                        key=option.get("Name"),
-                        description=option.get("Description"),
-                        type=option.get("Type"),
-                        category=option.get("Category"),
-                        default_value=option.get("DefaultValue"),
-                        enum_cases=cls._extract_enum_cases(option.get("Values", []))
-                    )
-                    settings.append(setting)
+    @classmethod
+    def _selected_settings(
+        cls,
+        options: List[dict],
+        private: int,
+        setting_filter: Optional[SettingFilter]
+    ) -> Tuple[List[Setting], int, int]:
+        """Creates settings only for the options the filter selects."""
+        if not setting_filter:
+            return [cls._setting(option) for option in options], private, 0
+        settings = [cls._setting(option) for option in options if setting_filter.accepts_option(option)]
+        return settings, private, len(options) - len(settings)
+
+    @classmethod
+    def _setting(cls, option: dict) -> Setting:
+        """Creates a setting from an option of a spec."""
+        return Setting(
+            name=option.get("Name"),
+            key=option.get("Name"),
+            description=option.get("Description"),
+            type=option.get("Type"),
+            category=option.get("Category"),
+            default_value=option.get("DefaultValue"),
+            enum_cases=cls._extract_enum_cases(option.get("Values", []))
+        )
 
+    @classmethod
+    def _row(cls, option: dict) -> tuple:
+        """Returns the attributes of the setting an option of a spec becomes, without creating it."""
+        return Setting.normalized(
+            name=option.get("Name"),
+            key=option.get("Name"),
+            description=option.get("Description"),
+            type=option.get("Type"),
+            category=option.get("Category"),
+            default_value=option.get("DefaultValue"),
+            enum_cases=cls._extract_enum_cases(option.get("Values", []))
+        )
+
+    @classmethod
+    def _materialized(cls, rows: List[tuple], setting_filter: Optional[SettingFilter]) -> List[Setting]:
+        """Creates the settings of the rows the filter selects."""
+        if not setting_filter:
+            return [Setting.from_tuple(row) for row in rows]
+        # a row holds the name, description, key, type and category in this order
+        settings = [Setting.from_tuple(row) for row in rows if setting_filter.accepts(row[2], row[4], row[3])]
+        PROFILER.count("options filtered out", len(rows) - len(settings))
         return settings
 
     @classmethod
-    def parse_paths(cls, paths: List[Path]) -> List[Setting]:
-        """Parses the given files and returns all their settings."""
-        settings = []
+    def _parse_profiled(
+        cls,
+        path: Path,
+        setting_filter: Optional[SettingFilter] = None,
+        rows: bool = False
+    ) -> Tuple[list, int, int, float, float, int]:
+        """Parses the file and returns its settings (or rows), the omitted private and filtered out settings and
+        timing information.
+
+        Runs in the worker processes, so the results are recorded by the caller.
+        """
+        start = time.time()
+        wall = time.perf_counter()
+        if rows:
+            settings, private = cls._parse_rows(path)
+            rejected = 0
+        else:
+            settings, private, rejected = cls._parse_counting_private(path, setting_filter)
+        return settings, private, rejected, start, time.perf_counter() - wall, os.getpid()
+
+    @classmethod
+    def parse_paths(
+        cls,
+        paths: List[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        cache: Optional[ParseCache] = None,
+        setting_filter: Optional[SettingFilter] = None
+    ) -> List[Setting]:
+        """Parses the given files and returns all their settings, or those the filter selects.
+
+        With more than one worker the files are parsed concurrently in a process pool (or a thread pool
+        if use_threads is set). The settings are always returned in the order of the given paths.
+        Files found in the cache are not parsed at all.
+        """
+        files = cls._parse_files(paths, workers, use_threads, cache, setting_filter)
+        return [s for file_settings in files for s in file_settings]
+
+    @classmethod
+    def parse_paths_into(
+        cls,
+        index: SettingsIndex,
+        paths: List[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        cache: Optional[ParseCache] = None,
+        setting_filter: Optional[SettingFilter] = None
+    ) -> SettingsIndex:
+        """Parses the given files and adds their settings to the index file by file."""
+        for file_settings in cls._parse_files(paths, workers, use_threads, cache, setting_filter):
+            index.extend(file_settings)
+        return index
+
+    @classmethod
+    def iter_settings(
+        cls,
+        paths: Iterable[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        cache: Optional[ParseCache] = None,
+        max_pending: Optional[int] = None,
+        setting_filter: Optional[SettingFilter] = None
+    ) -> Iterator[Tuple[Path, List[Setting]]]:
+        """Parses the given files and yields each path with its settings as soon as the file is parsed.
+
+        The paths are consumed on a separate thread while earlier files are parsed, so they can be
+        produced lazily, e.g. by a directory walk. The files are yielded in the order they finish. At most
+        max_pending files (four per worker by default) are parsed or waiting to be yielded at a time.
+        """
+        max_pending = max_pending or workers * 4
+        if workers > 1 and not use_threads:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            # a single worker still parses on its own thread, concurrently with the producer of the paths
+            executor = ThreadPoolExecutor(max_workers=workers)
+        results = queue.Queue()
+        slots = threading.Semaphore(max_pending)
+        stopped = threading.Event()
+        cache_lock = threading.Lock()
+
+        def feed():
+            fed = 0
+            try:
+                for path in paths:
+                    if not cls.can_ingest(path):
+                        raise Exception("cannot ingest exception")
+                    slots.acquire()
+                    if stopped.is_set():
+                        break
+                    fed += 1
+                    settings = None
+                    if cache is not None:
+                        with cache_lock:
+                            settings = cls._cached(cache, path, setting_filter)
+                    if settings is not None:
+                        PROFILER.count("cache hits")
+                        results.put((path, settings, None))
+                        continue
+                    # with a cache all rows of the file are kept, so its entry serves any filter
+                    future = executor.submit(cls._parse_profiled, path, setting_filter, cache is not None)
+                    future.add_done_callback(lambda f, path=path: results.put((path, None, f)))
+            except BaseException as e:
+                results.put((None, None, e))
+            finally:
+                results.put((None, fed, None))
+
+        feeder = threading.Thread(target=feed, name="spec feeder", daemon=True)
+        feeder.start()
+        received = 0
+        expected = None
+        try:
+            while expected is None or received < expected:
+                path, settings, outcome = results.get()
+                if path is None:
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+                    expected = settings
+                    continue
+                received += 1
+                slots.release()
+                if outcome is not None:
+                    settings, private, rejected, start, seconds, worker = outcome.result()
+                    PROFILER.file_parsed(path, start, seconds, worker)
+                    PROFILER.count("files parsed")
+                    PROFILER.count("options", len(settings) + private + rejected)
+                    PROFILER.count("private options skipped", private)
+                    PROFILER.count("options filtered out", rejected)
+                    if cache is not None:
+                        with cache_lock:
+                            cache.put(path, settings)
+                        settings = cls._materialized(settings, setting_filter)
+                yield path, settings
+        finally:
+            stopped.set()
+            # wake the feeder if it waits for a slot, it then sees that the consumer is gone
+            slots.release()
+            executor.shutdown(wait=True)
+
+    @classmethod
+    def _parse_files(
+        cls,
+        paths: List[Path],
+        workers: int,
+        use_threads: bool,
+        cache: Optional[ParseCache],
+        setting_filter: Optional[SettingFilter] = None
+    ) -> List[List[Setting]]:
+        """Returns the settings of the given files per file, in the order of the paths."""
         for path in paths:
             if not cls.can_ingest(path):
                 raise Exception("cannot ingest exception")
-            if path.suffix == ".plist":
-                settings += cls.parse(path)
-            else:
-                temp = convert(path)
-                settings += cls.parse(Path(temp))
-                os.remove(temp)
-        return settings
+        if cache is None:
+            return cls._parse_each(paths, workers=workers, use_threads=use_threads, setting_filter=setting_filter)
+
+        per_file = [cls._cached(cache, path, setting_filter) for path in paths]
+        missing = [i for i, file_settings in enumerate(per_file) if file_settings is None]
+        PROFILER.count("cache hits", len(paths) - len(missing))
+        # all rows of the files are kept, so their entries serve any filter
+        parsed = cls._parse_each([paths[i] for i in missing], workers=workers, use_threads=use_threads, rows=True)
+        for i, rows in zip(missing, parsed):
+            cache.put(paths[i], rows)
+            per_file[i] = cls._materialized(rows, setting_filter)
+        cache.save()
+        return per_file
+
+    @classmethod
+    def _cached(cls, cache: ParseCache, path: Path, setting_filter: Optional[SettingFilter]) -> Optional[List[Setting]]:
+        """Returns the cached settings of a file the filter selects, or None on a miss.
+
+        A file none of whose settings are selected is not loaded from the cache at all, and settings are
+        only created for the selected rows of the others.
+        """
+        if setting_filter:
+            facets = cache.facets(path)
+            if facets is not None and not any(setting_filter.accepts(*facet) for facet in facets):
+                PROFILER.count("files skipped by filter")
+                return []
+        rows = cache.get(path)
+        return None if rows is None else cls._materialized(rows, setting_filter)
+
+    @classmethod
+    def _parse_each(
+        cls,
+        paths: List[Path],
+        workers: int,
+        use_threads: bool,
+        setting_filter: Optional[SettingFilter] = None,
+        rows: bool = False
+    ) -> List[list]:
+        """Parses the given files and returns their settings (or rows) per file, in the order of the paths."""
+        if not PROFILER.enabled:
+            if rows:
+                return [result[0] for result in cls._map(cls._parse_rows, paths, workers=workers, use_threads=use_threads)]
+            return cls._map(partial(cls.parse, setting_filter=setting_filter), paths, workers=workers, use_threads=use_threads)
+        results = cls._map(
+            partial(cls._parse_profiled, setting_filter=setting_filter, rows=rows), paths, workers=workers, use_threads=use_threads
+        )
+        PROFILER.count("files parsed", len(paths))
+        for path, (settings, private, rejected, start, seconds, worker) in zip(paths, results):
+            PROFILER.file_parsed(path, start, seconds, worker)
+            PROFILER.count("options", len(settings) + private + rejected)
+            PROFILER.count("private options skipped", private)
+            PROFILER.count("options filtered out", rejected)
+        return [result[0] for result in results]
+
+    @classmethod
+    def _map(cls, func: Callable[[Path], Any], paths: List[Path], workers: int, use_threads: bool) -> list:
+        """Applies func to all paths, concurrently if there is more than one worker."""
+        if workers <= 1 or len(paths) <= 1:
+            return [func(path) for path in paths]
+
+        if use_threads:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            chunksize = 1
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            # hand out several files per task to keep the pickling overhead low
+            chunksize = max(1, len(paths) // (workers * 4))
+        with executor:
+            # map returns the results in the order of the input, not in the order of completion
+            return list(executor.map(func, paths, chunksize=chunksize))
+
+    @classmethod
+    def _is_xml(cls, header: bytes) -> bool:
+        """Tells if a file starting with header is an XML plist, those are parsed selectively."""
+        return header.lstrip(b"\xef\xbb\xbf \t\r\n")[:5] in (b"<?xml", b"<plis", b"<!DOC")
+
+    @classmethod
+    def _loads(cls, path: Path, data: bytes):
+        """Loads the root object of a plist file.
+
+        .xcspec files are old-style plists and are parsed in-process without converting them first.
+        """
+        if path.suffix == ".xcspec":
+            return openstep_parser.loads(data)
+        return plistlib.loads(data)
 
     @classmethod
     def _extract_enum_cases(cls, values: list) -> list:
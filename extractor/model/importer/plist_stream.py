@@ -0,0 +1,188 @@
+"""This module provides a selective, event-driven parser for the options of XML plist spec files.
+
+Instead of building the object graph of the whole spec like plistlib, the document is walked with
+expat events. Only the fields of an option a Setting is made of are materialized, everything else,
+including private options, is skipped as it streams by.
+"""
+
+import base64
+import plistlib
+from datetime import datetime
+from typing import BinaryIO, List, Tuple
+from xml.parsers.expat import ParserCreate
+
+# The fields of an option that are materialized
+OPTION_FIELDS = frozenset(["Name", "Description", "Type", "Category", "DefaultValue", "Values"])
+
+class NotAnArrayOfSpecs(Exception):
+    """Exception raised when the root object of the plist is not an array"""
+
+def parse_options(fp: BinaryIO) -> Tuple[List[dict], int]:
+    """Returns the public options of an XML plist spec and the number of private options skipped.
+
+    The file is read in chunks, so it is never held in memory as a whole. The options contain only the
+    OPTION_FIELDS. Raises NotAnArrayOfSpecs if the root of the plist is not an array, those files have
+    to be loaded completely.
+    """
+    collector = _OptionsCollector()
+    parser = ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = collector.start
+    parser.EndElementHandler = collector.end
+    parser.CharacterDataHandler = collector.data
+    parser.EntityDeclHandler = _reject_entities
+    parser.ParseFile(fp)
+    return collector.options, collector.private
+
+def _reject_entities(*args):
+    # like plistlib, refuse entity declarations
+    raise plistlib.InvalidFileException("XML entity declarations are not supported in plist files")
+
+def _date(text: str) -> datetime:
+    # the ISO 8601 format plistlib writes, read like plistlib as a naive datetime in UTC
+    return datetime.strptime(text.strip(), "%Y-%m-%dT%H:%M:%SZ")
+
+class _OptionsCollector:
+    """Receives the expat events and keeps track of where in the spec they occur."""
+
+    def __init__(self):
+        self.options: List[dict] = []
+        self.private = 0
+        # 'plist', 'specs' (root array), 'spec' (a spec dict), 'option list' and 'option'
+        self._contexts: List[str] = []
+        self._key = None
+        self._reading_key = False
+        self._text: List[str] = []
+        self._skip_depth = 0
+        self._builder = None
+        self._option = None
+        self._option_is_private = False
+
+    def start(self, tag: str, attributes: dict):
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        if self._builder is not None:
+            self._builder.start(tag)
+            return
+        context = self._contexts[-1] if self._contexts else None
+        if tag == "key" and context in ("spec", "option"):
+            self._reading_key = True
+            self._text = []
+        elif context is None and tag == "plist":
+            self._contexts.append("plist")
+        elif context == "plist":
+            if tag != "array":
+                raise NotAnArrayOfSpecs()
+            self._contexts.append("specs")
+        elif context == "specs" and tag == "dict":
+            self._contexts.append("spec")
+            self._key = None
+        elif context == "spec" and self._key == "Options" and tag == "array":
+            self._contexts.append("option list")
+        elif context == "option list" and tag == "dict":
+            self._contexts.append("option")
+            self._key = None
+            self._option = {}
+            self._option_is_private = False
+        elif context == "option" and not self._option_is_private and self._key in OPTION_FIELDS:
+            self._builder = _ValueBuilder()
+            self._builder.start(tag)
+        else:
+            # a value nobody is interested in, skip it with all its children
+            self._skip_depth = 1
+
+    def end(self, tag: str):
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        if self._builder is not None:
+            self._builder.end(tag)
+            if self._builder.done:
+                value = self._builder.value
+                self._builder = None
+                self._option[self._key] = value
+                if self._key == "Name" and str(value).startswith('__'):
+                    # omit private settings, the rest of the option is skipped
+                    self._option_is_private = True
+            return
+        if self._reading_key:
+            self._reading_key = False
+            self._key = "".join(self._text)
+            return
+        context = self._contexts.pop()
+        if context == "option":
+            if self._option_is_private:
+                self.private += 1
+            else:
+                self.options.append(self._option)
+            self._option = None
+        if self._contexts:
+            # the keys of the enclosing dictionary were read before, the next value gets a new key
+            self._key = None
+
+    def data(self, text: str):
+        if self._skip_depth:
+            return
+        if self._builder is not None:
+            self._builder.data(text)
+        elif self._reading_key:
+            self._text.append(text)
+
+class _ValueBuilder:
+    """Builds a single plist value from expat events, with the same types plistlib returns."""
+
+    def __init__(self):
+        self.value = None
+        self.done = False
+        self._stack = []
+        self._keys = []
+        self._text: List[str] = []
+
+    def start(self, tag: str):
+        if tag == "dict":
+            self._stack.append({})
+            self._keys.append(None)
+        elif tag == "array":
+            self._stack.append([])
+            self._keys.append(None)
+        self._text = []
+
+    def data(self, text: str):
+        self._text.append(text)
+
+    def end(self, tag: str):
+        text = "".join(self._text)
+        self._text = []
+        if tag == "key":
+            self._keys[-1] = text
+            return
+        if tag in ("dict", "array"):
+            self._keys.pop()
+            value = self._stack.pop()
+        elif tag == "string":
+            value = text
+        elif tag == "integer":
+            value = int(text, 16) if text.startswith(("0x", "0X")) else int(text)
+        elif tag == "real":
+            value = float(text)
+        elif tag == "true":
+            value = True
+        elif tag == "false":
+            value = False
+        elif tag == "date":
+            value = _date(text)
+        elif tag == "data":
+            value = base64.b64decode(text.encode("ascii"))
+        else:
+            raise ValueError(f"unknown plist element {tag}")
+        self._add(value)
+
+    def _add(self, value):
+        if not self._stack:
+            self.value = value
+            self.done = True
+        elif isinstance(self._stack[-1], dict):
+            self._stack[-1][self._keys[-1]] = value
+        else:
+            self._stack[-1].append(value)
@@ -9,25 +9,35 @@ def convert(path: Path) -> str:
     if not path.suffix == ".xcspec":
         raise InvalidFileType
     
-    temp_dir = tempfile.gettempdir()
     name = path.stem.replace(" ", "").lower()
-    temp_xcspec = _create_temporary_copy(
-        source=path,
-        temp_dir=temp_dir,
-        name=name + ".xcspec"
-    )
-    temp_plist = os.path.join(temp_dir, name + ".plist")
-
-    subprocess.check_output(f"plutil -convert xml1 -o {temp_plist} {temp_xcspec}", shell=True)
-    os.remove(temp_xcspec)
+    temp_xcspec = _create_temporary_copy(source=path, name=name)
+    temp_plist = _create_temporary_file(name=name, suffix=".plist")
+
+    try:
+        subprocess.check_output(["plutil", "-convert", "xml1", "-o", temp_plist, temp_xcspec])
+    except BaseException:
+        # the caller only removes the plist it gets back
+        os.remove(temp_plist)
+        raise
+    finally:
+        os.remove(temp_xcspec)
     return temp_plist
 
 
-def _create_temporary_copy(source: Path, temp_dir, name: str) -> str:
+def _create_temporary_copy(source: Path, name: str) -> str:
     """Copies a file to a temp folder."""
-    output = os.path.join(temp_dir, name)
+    output = _create_temporary_file(name=name, suffix=".xcspec")
     shutil.copy2(source, output)
     return output
 
+def _create_temporary_file(name: str, suffix: str) -> str:
+    """Creates an empty file with a unique name in the temp folder.
+
+    Specs with the same name from different bundles must not share a temp path when converted concurrently.
+    """
+    fd, output = tempfile.mkstemp(prefix=name + "-", suffix=suffix)
+    os.close(fd)
+    return output
+
 class InvalidFileType(Exception):
     """Exception raised when the file type can not be handled"""
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""This module provides a watcher for Xcode installations that appear or change."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from .xcode_version_extractor import XcodeVersionExtractor
+
+class InstallWatcher:
+    """Watches directories for Xcode installations that are added or updated.
+
+    An installation is a watched path or a child of one with a Contents/version.plist. Its state is the
+    size and mtime of the version.plist and of the spec manifest of its build, so checking it costs a few
+    stat calls. A new or changed installation is reported once its state did not change for the debounce
+    time, e.g. after an update finished copying, and only that installation is reported.
+
+    Where inotify is available (Linux), the watcher sleeps until a watched directory changes and looks
+    at the installations only then and every rescan seconds. Elsewhere it looks every interval seconds.
+    """
+
+    def __init__(
+        self,
+        paths: List[Path],
+        manifest_dir: Optional[Path] = None,
+        interval: float = 5.0,
+        debounce: float = 10.0,
+        rescan: float = 300.0,
+        use_inotify: bool = True
+    ):
+        self.paths = [Path(p) for p in paths]
+        self.manifest_dir = manifest_dir
+        self.interval = interval
+        self.debounce = debounce
+        self.rescan = rescan
+        self.use_inotify = use_inotify
+        # the build read from a version.plist by its stat, so unchanged files are not parsed again
+        self._builds: Dict[Path, Tuple[tuple, Optional[str]]] = {}
+
+    def installs(self) -> List[Path]:
+        """Returns the installations in the watched paths."""
+        installs = []
+        for path in self.paths:
+            if self._is_install(path):
+                installs.append(path)
+                continue
+            try:
+                children = sorted(os.scandir(path), key=lambda entry: entry.name)
+            except OSError:
+                continue
+            installs += [Path(c.path) for c in children if c.is_dir() and self._is_install(Path(c.path))]
+        return installs
+
+    def snapshot(self) -> Dict[Path, tuple]:
+        """Returns the state of each installation in the watched paths."""
+        return {install: self.state(install) for install in self.installs()}
+
+    def state(self, install: Path) -> tuple:
+        """Returns the stat of the version.plist and of the spec manifest of an installation."""
+        version_plist = install / "Contents/version.plist"
+        version = _stat(version_plist)
+        if self.manifest_dir is None:
+            return (version,)
+        known = self._builds.get(install)
+        if known is None or known[0] != version:
+            try:
+                build = XcodeVersionExtractor.extract_build_version(version_plist)
+            except Exception:
+                # still being written
+                build = None
+            known = (version, build)
+            self._builds[install] = known
+        if known[1] is None:
+            return (version, None)
+        return (version, _stat(Path(self.manifest_dir) / f"{known[1]}.json"))
+
+    def run(self, on_change: Callable[[Path], None], stop: Optional[threading.Event] = None, initial: bool = True):
+        """Calls on_change with each installation that appears or changes until stop is set.
+
+        With initial set, the installations found at the start are passed to on_change right away. The
+        state after on_change returned is taken as the new state of the installation, so the manifest it
+        may have written does not count as a change.
+        """
+        stop = stop or threading.Event()
+        known: Dict[Path, tuple] = {}
+        # the state of a changed installation and when it was first seen
+        pending: Dict[Path, Tuple[tuple, float]] = {}
+        now = time.monotonic()
+        for install, state in self.snapshot().items():
+            if initial:
+                pending[install] = (state, now - self.debounce)
+            else:
+                known[install] = state
+        inotify = _Inotify.create() if self.use_inotify else None
+        try:
+            last_scan = None
+            while not stop.is_set():
+                now = time.monotonic()
+                if last_scan is None or inotify is None or inotify.changed or pending or now - last_scan >= self.rescan:
+                    if inotify is not None:
+                        inotify.watch(self._watched_directories())
+                    self._check(known, pending, on_change, now, stop)
+                    last_scan = now
+                timeout = self.rescan if inotify is not None else self.interval
+                if pending:
+                    first = min(seen for _, seen in pending.values())
+                    timeout = max(0.0, min(timeout, first + self.debounce - time.monotonic()))
+                if inotify is None:
+                    stop.wait(timeout)
+                else:
+                    # wake up every second to see if stop was set
+                    inotify.wait(min(timeout, 1.0))
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _check(
+        self,
+        known: Dict[Path, tuple],
+        pending: Dict[Path, Tuple[tuple, float]],
+        on_change: Callable[[Path], None],
+        now: float,
+        stop: threading.Event
+    ):
+        current = self.snapshot()
+        for install in list(known):
+            if install not in current:
+                # removed, it is reported again if it comes back
+                del known[install]
+        for install in list(pending):
+            if install not in current:
+                del pending[install]
+        for install, state in current.items():
+            if stop.is_set():
+                return
+            if known.get(install) == state:
+                pending.pop(install, None)
+                continue
+            seen = pending.get(install)
+            if seen is None or seen[0] != state:
+                pending[install] = (state, now)
+            elif now - seen[1] >= self.debounce:
+                del pending[install]
+                on_change(install)
+                known[install] = self.state(install)
+
+    def _watched_directories(self) -> List[Path]:
+        # the children of a watched path and their Contents, where a version.plist may show up later
+        directories = []
+        for path in self.paths:
+            candidates = [path]
+            try:
+                candidates += [Path(c.path) for c in os.scandir(path) if c.is_dir()]
+            except OSError:
+                continue
+            for candidate in candidates:
+                directories += [candidate, candidate / "Contents"]
+        if self.manifest_dir is not None and Path(self.manifest_dir).is_dir():
+            directories.append(Path(self.manifest_dir))
+        return directories
+
+    @classmethod
+    def _is_install(cls, path: Path) -> bool:
+        return (path / "Contents/version.plist").is_file()
+
+def _stat(path: Path) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+class _Inotify:
+    """Waits for changes of directories with the inotify API of Linux, called through ctypes."""
+
+    _IN_MODIFY = 0x002
+    _IN_ATTRIB = 0x004
+    _IN_CLOSE_WRITE = 0x008
+    _IN_MOVED_FROM = 0x040
+    _IN_MOVED_TO = 0x080
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _IN_DELETE_SELF = 0x400
+    _IN_ONLYDIR = 0x01000000
+    _MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE
+             | _IN_DELETE | _IN_DELETE_SELF | _IN_ONLYDIR)
+
+    def __init__(self, libc, fd: int):
+        self._libc = libc
+        self._fd = fd
+        # set until the directories were looked at after an event
+        self.changed = False
+
+    @classmethod
+    def create(cls) -> Optional["_Inotify"]:
+        """Returns an inotify instance, or None if the platform does not support it."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        return cls(libc, fd)
+
+    def watch(self, directories: List[Path]):
+        """Watches the directories, watching one again is harmless and renews a removed watch."""
+        self.changed = False
+        for directory in directories:
+            # a directory that disappeared in the meantime is noticed by the next scan
+            self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self._MASK)
+
+    def wait(self, timeout: float):
+        """Waits until a watched directory changes or the timeout passed."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return
+        self.changed = True
+        try:
+            while os.read(self._fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self._fd)
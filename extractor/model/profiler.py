@@ -0,0 +1,113 @@
+"""This module provides phase timing and counters to profile an extraction.
+
+Profiling is disabled by default. While disabled, phase() returns a shared no-op context manager and
+the other methods return immediately, so the instrumentation costs next to nothing.
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+_DISABLED_PHASE = nullcontext()
+
+class Profiler:
+    """Records the wall and CPU time of phases, per-file parse latencies and counters."""
+
+    def __init__(self):
+        self.enabled = False
+        self._origin = 0.0
+        self._phases: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._files: List[Tuple[float, str]] = []
+        self._events: List[dict] = []
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """Starts recording."""
+        self.enabled = True
+        self._origin = time.time()
+
+    def phase(self, name: str):
+        """Returns a context manager that records the time spent in a phase."""
+        if not self.enabled:
+            return _DISABLED_PHASE
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name: str):
+        start = time.time()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            with self._lock:
+                totals = self._phases.setdefault(name, [0.0, 0.0])
+                totals[0] += wall
+                totals[1] += cpu
+            self._event(name, "phase", start, wall, threading.get_ident())
+
+    def count(self, name: str, value: int = 1):
+        """Adds a value to a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def file_parsed(self, path: Path, start: float, seconds: float, worker: int):
+        """Records the parse latency of a file, start is a time.time() timestamp."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._files.append((seconds, str(path)))
+        self._event(Path(path).name, "parse", start, seconds, worker, {"path": str(path)})
+
+    def summary(self, slowest: int = 10) -> str:
+        """Returns a human readable summary of the recorded phases, counters and slowest files."""
+        lines = [f"{'Phase':<24} {'Wall':>10} {'CPU':>10}"]
+        for name, (wall, cpu) in self._phases.items():
+            lines.append(f"{name:<24} {wall * 1000:8.1f}ms {cpu * 1000:8.1f}ms")
+        if self._counters:
+            lines.append("")
+            lines += [f"{name:<24} {value:>10}" for name, value in self._counters.items()]
+        if self._files:
+            lines.append("")
+            lines.append(f"Slowest {min(slowest, len(self._files))} of {len(self._files)} parsed files:")
+            for seconds, path in heapq.nlargest(slowest, self._files):
+                lines.append(f"{seconds * 1000:8.1f}ms {path}")
+        return "\n".join(lines)
+
+    def write_trace(self, output: Path):
+        """Writes the recorded events in the Chrome trace event format."""
+        trace = {
+            "traceEvents": self._events,
+            "displayTimeUnit": "ms",
+            "otherData": {"counters": self._counters},
+        }
+        with Path(output).open("w") as out:
+            json.dump(trace, out)
+
+    def _event(self, name: str, category: str, start: float, seconds: float, thread: int, args: dict = None):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": seconds * 1e6,
+            "pid": os.getpid(),
+            "tid": thread,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+
+# The profiler used by the extractor
+PROFILER = Profiler()
@@ -1,7 +1,16 @@
 """This module provides the settings model."""
 
+from sys import intern
+
 class Setting:
-    """A class that represents an Xcode build setting."""
+    """A class that represents an Xcode build setting.
+
+    Settings are compact: they have no instance dictionary, their strings are interned, so the same
+    key, type, category or description read from many Xcode versions is stored only once, and their
+    enum cases are kept in a tuple.
+    """
+
+    __slots__ = ('name', 'description', 'key', 'type', 'category', 'default_value', 'enum_cases')
 
     # Types a setting can have
     TYPE_STRING = 'String'
@@ -10,21 +19,58 @@ class Setting:
     TYPE_PATHLIST = 'PathList'
     TYPE_BOOLEAN = 'Boolean'
     TYPE_ENUM = 'Enumeration'
-    
+
+    # Maps the types used in spec files to the types of a setting, other types are kept as they are
+    _TYPE_MAP = {
+        'string': TYPE_STRING,
+        'stringlist': TYPE_STRINGLIST,
+        'path': TYPE_STRING,
+        'pathlist': TYPE_STRINGLIST,
+        'bool': TYPE_BOOLEAN,
+        'Bool': TYPE_BOOLEAN,
+        'enum': TYPE_ENUM,
+        'CodeSignIdentity': TYPE_STRING,
+        'OpenCLArchitectures': TYPE_STRING,
+        'CodeSignStyle': TYPE_ENUM,
+        'DevelopmentTeam': TYPE_STRING,
+        'ProvisioningProfileSpecifier': TYPE_STRING,
+        'CompilerVersion': TYPE_STRING,
+        'ProvisioningProfile': TYPE_STRING,
+    }
+
     def __init__(self, name:str, description:str, key:str, type:str, category:str, default_value, enum_cases):
-        self.name = name
-        self.description = description
-        self.key = key
-        self.type = self._mapped_type(type)
-        self.category = category
-        self.default_value = default_value
-        self.enum_cases = enum_cases
+        (self.name, self.description, self.key, self.type, self.category, self.default_value,
+         self.enum_cases) = self.normalized(name, description, key, type, category, default_value, enum_cases)
 
+    @classmethod
+    def normalized(cls, name:str, description:str, key:str, type:str, category:str, default_value, enum_cases) -> tuple:
+        """Returns the attributes of a setting created from the given values, see as_tuple."""
+        default_value = _interned(default_value)
+        cases = tuple(_interned(c) for c in enum_cases)
         # if for some reason the default value is not in the list of values, add it.
-        if self.default_value != None and self.default_value not in self.enum_cases:
+        if default_value != None and default_value not in cases:
             # do not add it if the default value is a variable
-            if not self.default_value.startswith('$('):
-                self.enum_cases.append(self.default_value)
+            if not default_value.startswith('$('):
+                cases += (default_value,)
+        return (_interned(name), _interned(description), _interned(key), _interned(cls.normalized_type(type)),
+                _interned(category), default_value, cases)
+
+    @classmethod
+    def from_tuple(cls, values: tuple) -> "Setting":
+        """Creates a setting from the attributes returned by as_tuple or normalized without normalizing them again."""
+        setting = cls.__new__(cls)
+        (setting.name, setting.description, setting.key, setting.type, setting.category, setting.default_value,
+         setting.enum_cases) = values
+        return setting
+
+    def as_tuple(self) -> tuple:
+        """Returns the attributes of the setting in the order of __slots__, e.g. to store it compactly."""
+        return (self.name, self.description, self.key, self.type, self.category, self.default_value, self.enum_cases)
+
+    @classmethod
+    def normalized_type(cls, type: str) -> str:
+        """Returns the type of a setting for a type used in spec files."""
+        return cls._TYPE_MAP.get(type, type)
 
     def __repr__(self):
         return f"<{self.name}>"
@@ -37,33 +83,17 @@ class Setting:
         # settings with the same key are considered equal
         return hash(('key', self.key))
 
-    def _mapped_type(self, type: str) -> str:
-        if type == 'string':
-            return self.TYPE_STRING
-        elif type == 'stringlist':
-            return self.TYPE_STRINGLIST
-        if type == 'path':
-            return self.TYPE_STRING
-        elif type == 'pathlist':
-            return self.TYPE_STRINGLIST
-        elif type == 'bool':
-            return self.TYPE_BOOLEAN
-        elif type == 'Bool':
-            return self.TYPE_BOOLEAN
-        elif type == 'enum':
-            return self.TYPE_ENUM
-        elif type == 'CodeSignIdentity':
-            return self.TYPE_STRING
-        elif type == 'OpenCLArchitectures':
-            return self.TYPE_STRING
-        elif type == 'CodeSignStyle':
-            return self.TYPE_ENUM
-        elif type == 'DevelopmentTeam':
-            return self.TYPE_STRING
-        elif type == 'ProvisioningProfileSpecifier':
-            return self.TYPE_STRING
-        elif type == 'CompilerVersion':
-            return self.TYPE_STRING
-        elif type == 'ProvisioningProfile':
-            return self.TYPE_STRING
-        return type
\ No newline at end of file
+    def to_dict(self) -> dict:
+        """Returns the attributes of the setting as a dictionary."""
+        return {
+            'name': self.name,
+            'description': self.description,
+            'key': self.key,
+            'type': self.type,
+            'category': self.category,
+            'default_value': self.default_value,
+            'enum_cases': self.enum_cases,
+        }
+
+def _interned(value):
+    return intern(value) if type(value) is str else value
@@ -0,0 +1,86 @@
+"""This module provides a filter selecting settings by key, category and type."""
+
+import fnmatch
+import re
+from typing import Iterable, List, Optional, Pattern
+from .setting import Setting
+
+# Patterns with this prefix are regular expressions, all others are glob patterns
+REGEX_PREFIX = "re:"
+
+class InvalidPatternError(Exception):
+    """Exception raised when a pattern of a filter is not a valid regular expression"""
+
+class SettingFilter:
+    """Selects settings by their key, category and type.
+
+    A key is selected if it matches one of the include patterns (or there are none) and none of the
+    exclude patterns. Patterns are glob patterns like "SWIFT_*" that have to match the whole key, or
+    regular expressions prefixed with "re:" that are searched in the key. Categories and types are
+    compared case-insensitively, types after mapping the type names of spec files like Setting does.
+    The patterns are compiled once, so a filter is cheap to apply to every option of a spec file.
+    """
+
+    def __init__(
+        self,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        categories: Iterable[str] = (),
+        types: Iterable[str] = ()
+    ):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.categories = list(categories)
+        self.types = list(types)
+        self._include = self._compile(self.include)
+        self._exclude = self._compile(self.exclude)
+        self._categories = {c.lower() for c in self.categories} or None
+        self._types = {Setting.normalized_type(t).lower() for t in self.types} or None
+
+    def __bool__(self) -> bool:
+        # an empty filter selects everything
+        return bool(self.include or self.exclude or self.categories or self.types)
+
+    def accepts(self, key: Optional[str], category: Optional[str], type: Optional[str]) -> bool:
+        """Tells if a setting with the given key, category and type is selected."""
+        key = key or ""
+        if self._include and not any(p.search(key) for p in self._include):
+            return False
+        if any(p.search(key) for p in self._exclude):
+            return False
+        if self._categories is not None and (category or "").lower() not in self._categories:
+            return False
+        if self._types is not None and Setting.normalized_type(type or "").lower() not in self._types:
+            return False
+        return True
+
+    def accepts_option(self, option: dict) -> bool:
+        """Tells if the setting an option of a spec file becomes is selected."""
+        return self.accepts(option.get("Name"), option.get("Category"), option.get("Type"))
+
+    def apply(self, settings: List[Setting]) -> List[Setting]:
+        """Returns the selected settings."""
+        return [s for s in settings if self.accepts(s.key, s.category, s.type)]
+
+    def to_dict(self) -> dict:
+        """Returns the patterns, categories and types of the filter, e.g. to fingerprint an output."""
+        return {
+            "include": self.include,
+            "exclude": self.exclude,
+            "categories": self.categories,
+            "types": self.types,
+        }
+
+    @classmethod
+    def _compile(cls, patterns: List[str]) -> List[Pattern]:
+        """Compiles the patterns to regular expressions that are searched in a key."""
+        compiled = []
+        for pattern in patterns:
+            if pattern.startswith(REGEX_PREFIX):
+                try:
+                    compiled.append(re.compile(pattern[len(REGEX_PREFIX):]))
+                except re.error as e:
+                    raise InvalidPatternError(f"{pattern} is not a valid regular expression: {e}")
+            else:
+                compiled.append(re.compile("^" + fnmatch.translate(pattern)))
+        return compiled
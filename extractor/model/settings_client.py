@@ -0,0 +1,32 @@
+"""This module provides the client side of the settings server protocol.
+
+A request is a JSON object on a single line sent over a Unix domain socket. The server answers each
+request with one line, {"ok": true, "result": ...} or {"ok": false, "error": "..."}. The module only
+depends on the standard library, so clients start quickly.
+"""
+
+import json
+import socket
+from pathlib import Path
+from typing import Any, Optional
+
+class ServerError(Exception):
+    """Exception raised when the settings server cannot answer a request"""
+
+def request(socket_path: Path, payload: dict, timeout: Optional[float] = None) -> Any:
+    """Sends a request to the settings server and returns the result."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        try:
+            connection.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            raise ServerError(f"No settings server is listening on {socket_path}.")
+        connection.sendall(json.dumps(payload).encode() + b"\n")
+        with connection.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ServerError("The settings server closed the connection without an answer.")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise ServerError(response.get("error", "unknown error"))
+    return response.get("result")
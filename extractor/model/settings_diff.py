@@ -0,0 +1,132 @@
+"""This module provides the comparison of the build settings of two Xcode versions."""
+
+import json
+from typing import Dict, List, Optional
+from .diff_format import DiffFormat
+from .setting import Setting
+
+class SettingChange:
+    """The differences of a setting that exists in both versions."""
+
+    def __init__(self, old: Setting, new: Setting):
+        self.key = new.key
+        self.old_type = old.type
+        self.new_type = new.type
+        self.old_default = old.default_value
+        self.new_default = new.default_value
+        new_cases = set(new.enum_cases)
+        old_cases = set(old.enum_cases)
+        self.added_cases = [c for c in new.enum_cases if c not in old_cases]
+        self.removed_cases = [c for c in old.enum_cases if c not in new_cases]
+
+    @property
+    def retyped(self) -> bool:
+        return self.old_type != self.new_type
+
+    @property
+    def redefaulted(self) -> bool:
+        return self.old_default != self.new_default
+
+    def __bool__(self) -> bool:
+        return self.retyped or self.redefaulted or bool(self.added_cases) or bool(self.removed_cases)
+
+    def to_dict(self) -> dict:
+        change = {"key": self.key}
+        if self.retyped:
+            change["type"] = {"old": self.old_type, "new": self.new_type}
+        if self.redefaulted:
+            change["default_value"] = {"old": self.old_default, "new": self.new_default}
+        if self.added_cases:
+            change["added_enum_cases"] = self.added_cases
+        if self.removed_cases:
+            change["removed_enum_cases"] = self.removed_cases
+        return change
+
+    def descriptions(self) -> List[str]:
+        """Returns one human readable line per difference."""
+        lines = []
+        if self.retyped:
+            lines.append(f"type {self.old_type} -> {self.new_type}")
+        if self.redefaulted:
+            lines.append(f"default {self.old_default!r} -> {self.new_default!r}")
+        if self.added_cases:
+            lines.append("added cases " + ", ".join(self.added_cases))
+        if self.removed_cases:
+            lines.append("removed cases " + ", ".join(self.removed_cases))
+        return lines
+
+class SettingsDiff:
+    """The differences between the settings of two Xcode versions."""
+
+    def __init__(self, old_version: Optional[str], new_version: Optional[str]):
+        self.old_version = old_version
+        self.new_version = new_version
+        self.added: List[Setting] = []
+        self.removed: List[Setting] = []
+        self.changed: List[SettingChange] = []
+
+    @classmethod
+    def between(
+        cls,
+        old_settings: List[Setting],
+        new_settings: List[Setting],
+        old_version: Optional[str] = None,
+        new_version: Optional[str] = None
+    ) -> "SettingsDiff":
+        """Compares two lists of settings by key."""
+        diff = cls(old_version, new_version)
+        old_index: Dict[str, Setting] = {s.key: s for s in old_settings}
+        new_index: Dict[str, Setting] = {s.key: s for s in new_settings}
+        for key in sorted(new_index):
+            old = old_index.get(key)
+            if old is None:
+                diff.added.append(new_index[key])
+                continue
+            change = SettingChange(old, new_index[key])
+            if change:
+                diff.changed.append(change)
+        diff.removed = [old_index[key] for key in sorted(old_index) if key not in new_index]
+        return diff
+
+    def render(self, diff_format: DiffFormat) -> str:
+        """Renders the diff in the given format."""
+        if diff_format == DiffFormat.JSON:
+            return json.dumps(self.to_dict(), indent=4, sort_keys=True) + "\n"
+        if diff_format == DiffFormat.MARKDOWN:
+            return self.to_markdown()
+        return self.to_text()
+
+    def to_dict(self) -> dict:
+        return {
+            "old_version": self.old_version,
+            "new_version": self.new_version,
+            "added": [s.key for s in self.added],
+            "removed": [s.key for s in self.removed],
+            "changed": [c.to_dict() for c in self.changed],
+        }
+
+    def to_text(self) -> str:
+        lines = [f"Build settings {self.old_version} -> {self.new_version}"]
+        lines += [f"+ {s.key}" for s in self.added]
+        lines += [f"- {s.key}" for s in self.removed]
+        for change in self.changed:
+            lines += [f"~ {change.key}: {d}" for d in change.descriptions()]
+        lines.append(f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed")
+        return "\n".join(lines) + "\n"
+
+    def to_markdown(self) -> str:
+        lines = [f"# Build settings {self.old_version} → {self.new_version}", ""]
+        sections = [
+            ("Added", [f"- `{s.key}`" for s in self.added]),
+            ("Removed", [f"- `{s.key}`" for s in self.removed]),
+            ("Changed", [
+                f"- `{c.key}`: " + "; ".join(d.replace(" -> ", " → ") for d in c.descriptions())
+                for c in self.changed
+            ]),
+        ]
+        for title, items in sections:
+            lines.append(f"## {title} ({len(items)})")
+            lines.append("")
+            lines += items or ["_None_"]
+            lines.append("")
+        return "\n".join(lines)
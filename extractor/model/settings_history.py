@@ -0,0 +1,190 @@
+"""This module provides a SQLite database of the settings of many Xcode versions."""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, Optional
+from .setting import Setting
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY,
+    xcode_version TEXT NOT NULL,
+    build TEXT NOT NULL DEFAULT '',
+    UNIQUE (xcode_version, build)
+);
+CREATE TABLE IF NOT EXISTS descriptions (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS enum_cases (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS settings (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    key TEXT NOT NULL,
+    name TEXT,
+    type TEXT,
+    category TEXT,
+    default_value TEXT,
+    description_id INTEGER REFERENCES descriptions (id)
+);
+CREATE TABLE IF NOT EXISTS setting_enum_cases (
+    setting_id INTEGER NOT NULL REFERENCES settings (id),
+    position INTEGER NOT NULL,
+    enum_case_id INTEGER NOT NULL REFERENCES enum_cases (id),
+    PRIMARY KEY (setting_id, position)
+);
+CREATE TABLE IF NOT EXISTS version_settings (
+    version_id INTEGER NOT NULL REFERENCES versions (id),
+    setting_id INTEGER NOT NULL REFERENCES settings (id),
+    PRIMARY KEY (version_id, setting_id)
+);
+CREATE INDEX IF NOT EXISTS settings_key ON settings (key);
+CREATE INDEX IF NOT EXISTS settings_category ON settings (category);
+CREATE INDEX IF NOT EXISTS version_settings_setting ON version_settings (setting_id);
+CREATE INDEX IF NOT EXISTS versions_version ON versions (xcode_version);
+"""
+
+def _version_key(version: str) -> tuple:
+    """Sorts versions like 9.4 before 14.3."""
+    return tuple(int(p) if p.isdigit() else 0 for p in version.split("."))
+
+class SettingsHistory:
+    """A database of the settings of many Xcode versions.
+
+    A setting that is identical in several versions is stored once and linked to each of them,
+    descriptions and enum cases are stored once for all settings.
+    """
+
+    def __init__(self, path: Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def contains(self, xcversion: str, build: Optional[str] = None) -> bool:
+        """Tells if the settings of an Xcode version are stored."""
+        row = self.connection.execute(
+            "SELECT 1 FROM versions WHERE xcode_version = ? AND build = ?", (xcversion, build or "")
+        ).fetchone()
+        return row is not None
+
+    def ingest(self, xcversion: str, build: Optional[str], settings: Iterable[Setting]) -> bool:
+        """Stores the settings of an Xcode version. Returns False if the version was stored before."""
+        if self.contains(xcversion, build):
+            return False
+        with self.connection:
+            version_id = self.connection.execute(
+                "INSERT INTO versions (xcode_version, build) VALUES (?, ?)", (xcversion, build or "")
+            ).lastrowid
+            links = [(version_id, self._setting_id(s)) for s in settings]
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO version_settings (version_id, setting_id) VALUES (?, ?)", links
+            )
+        return True
+
+    def versions(self) -> List[str]:
+        """Returns all stored Xcode versions, oldest first."""
+        rows = self.connection.execute("SELECT DISTINCT xcode_version FROM versions").fetchall()
+        return sorted((r[0] for r in rows), key=_version_key)
+
+    def query(
+        self,
+        key: Optional[str] = None,
+        prefix: Optional[str] = None,
+        category: Optional[str] = None,
+        version: Optional[str] = None
+    ) -> List[dict]:
+        """Returns the stored settings matching all given filters with the versions they appear in."""
+        conditions = []
+        parameters = []
+        if key is not None:
+            conditions.append("s.key = ?")
+            parameters.append(key)
+        if prefix is not None:
+            # a range instead of LIKE, so the index on key is used
+            conditions.append("s.key >= ? AND s.key < ?")
+            parameters += [prefix, prefix + "\U0010ffff"]
+        if category is not None:
+            conditions.append("s.category = ?")
+            parameters.append(category)
+        if version is not None:
+            conditions.append("v.xcode_version = ?")
+            parameters.append(version)
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        rows = self.connection.execute(f"""
+            SELECT s.id, s.key, s.name, s.type, s.category, s.default_value, d.text, v.xcode_version
+            FROM settings s
+            JOIN version_settings vs ON vs.setting_id = s.id
+            JOIN versions v ON v.id = vs.version_id
+            LEFT JOIN descriptions d ON d.id = s.description_id
+            {where}
+        """, parameters).fetchall()
+
+        results = {}
+        for setting_id, key, name, type, category, default_value, description, xcversion in rows:
+            result = results.setdefault(setting_id, {
+                "key": key,
+                "name": name,
+                "type": type,
+                "category": category,
+                "default_value": default_value,
+                "description": description,
+                "enum_cases": self._enum_cases(setting_id),
+                "versions": [],
+            })
+            if xcversion not in result["versions"]:
+                result["versions"].append(xcversion)
+        for result in results.values():
+            result["versions"].sort(key=_version_key)
+        return sorted(results.values(), key=lambda r: (r["key"], _version_key(r["versions"][0])))
+
+    def _setting_id(self, setting: Setting) -> int:
+        digest = hashlib.sha256(json.dumps(setting.to_dict(), sort_keys=True).encode()).hexdigest()
+        row = self.connection.execute("SELECT id FROM settings WHERE digest = ?", (digest,)).fetchone()
+        if row is not None:
+            return row[0]
+        setting_id = self.connection.execute(
+            """INSERT INTO settings (digest, key, name, type, category, default_value, description_id)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (
+                digest,
+                setting.key,
+                setting.name,
+                setting.type,
+                setting.category,
+                setting.default_value,
+                self._value_id("descriptions", "text", setting.description),
+            )
+        ).lastrowid
+        self.connection.executemany(
+            "INSERT INTO setting_enum_cases (setting_id, position, enum_case_id) VALUES (?, ?, ?)",
+            [(setting_id, i, self._value_id("enum_cases", "value", c)) for i, c in enumerate(setting.enum_cases)]
+        )
+        return setting_id
+
+    def _value_id(self, table: str, column: str, value: Optional[str]) -> Optional[int]:
+        if value is None:
+            return None
+        self.connection.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+        return self.connection.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()[0]
+
+    def _enum_cases(self, setting_id: int) -> List[str]:
+        rows = self.connection.execute("""
+            SELECT e.value FROM setting_enum_cases se
+            JOIN enum_cases e ON e.id = se.enum_case_id
+            WHERE se.setting_id = ? ORDER BY se.position
+        """, (setting_id,)).fetchall()
+        return [r[0] for r in rows]
@@ -0,0 +1,118 @@
+"""This module provides a key-indexed store of settings."""
+
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional
+from .setting import Setting
+
+class MergePolicy(str, Enum):
+    """Decides which setting survives when the same key is added more than once."""
+
+    # Keep the setting that was added first
+    FIRST_WINS = "first-wins"
+    # Keep the setting with the longest description
+    RICHEST_DESCRIPTION = "richest-description"
+    # Keep the first setting, extended by the enum cases of all others
+    UNION_ENUM_CASES = "union-enum-cases"
+
+class SettingsIndex:
+    """A store of settings with unique keys.
+
+    Settings are merged under a MergePolicy as they are added. Lookups by key take constant time, the
+    settings are iterated sorted by key and can be listed by category or type. The sorted order and the
+    secondary indexes are built once after the last change.
+    """
+
+    def __init__(self, policy: MergePolicy = MergePolicy.FIRST_WINS, settings: Iterable[Setting] = ()):
+        self.policy = policy
+        self.duplicates = 0
+        self._settings: Dict[str, Setting] = {}
+        self._sorted: Optional[List[Setting]] = None
+        self._by_category: Optional[Dict[Optional[str], List[Setting]]] = None
+        self._by_type: Optional[Dict[Optional[str], List[Setting]]] = None
+        self.extend(settings)
+
+    def add(self, setting: Setting):
+        """Adds a setting, merging it with a setting of the same key."""
+        existing = self._settings.get(setting.key)
+        if existing is None:
+            self._settings[setting.key] = setting
+        else:
+            self.duplicates += 1
+            merged = self._merged(existing, setting)
+            if merged is existing:
+                return
+            self._settings[setting.key] = merged
+        self._sorted = None
+        self._by_category = None
+        self._by_type = None
+
+    def extend(self, settings: Iterable[Setting]):
+        """Adds several settings."""
+        for setting in settings:
+            self.add(setting)
+
+    def get(self, key: str) -> Optional[Setting]:
+        """Returns the setting with the given key or None."""
+        return self._settings.get(key)
+
+    def by_category(self, category: Optional[str]) -> List[Setting]:
+        """Returns the settings of a category, sorted by key."""
+        if self._by_category is None:
+            self._by_category = self._group(lambda s: s.category)
+        return self._by_category.get(category, [])
+
+    def by_type(self, type: Optional[str]) -> List[Setting]:
+        """Returns the settings of a type, sorted by key."""
+        if self._by_type is None:
+            self._by_type = self._group(lambda s: s.type)
+        return self._by_type.get(type, [])
+
+    def categories(self) -> List[Optional[str]]:
+        """Returns the categories of all settings."""
+        self.by_category(None)
+        return list(self._by_category)
+
+    def sorted(self) -> List[Setting]:
+        """Returns all settings sorted by key."""
+        if self._sorted is None:
+            self._sorted = sorted(self._settings.values(), key=lambda x: x.key)
+        return self._sorted
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._settings
+
+    def __len__(self) -> int:
+        return len(self._settings)
+
+    def __iter__(self) -> Iterator[Setting]:
+        return iter(self.sorted())
+
+    def __getitem__(self, i):
+        return self.sorted()[i]
+
+    def _group(self, attribute) -> Dict[Optional[str], List[Setting]]:
+        groups: Dict[Optional[str], List[Setting]] = {}
+        for setting in self.sorted():
+            groups.setdefault(attribute(setting), []).append(setting)
+        return groups
+
+    def _merged(self, existing: Setting, new: Setting) -> Setting:
+        if self.policy == MergePolicy.RICHEST_DESCRIPTION:
+            if len(new.description or '') > len(existing.description or ''):
+                return new
+            return existing
+        if self.policy == MergePolicy.UNION_ENUM_CASES:
+            known = set(existing.enum_cases)
+            added = [c for c in new.enum_cases if c not in known]
+            if not added:
+                return existing
+            return Setting(
+                name=existing.name,
+                description=existing.description,
+                key=existing.key,
+                type=existing.type,
+                category=existing.category,
+                default_value=existing.default_value,
+                enum_cases=existing.enum_cases + tuple(added)
+            )
+        return existing
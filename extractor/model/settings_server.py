@@ -0,0 +1,209 @@
+"""This module provides a server that keeps the settings of Xcode installations in memory.
+
+The server speaks the line based JSON protocol of settings_client over a Unix domain socket and
+handles every connection on its own thread.
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from .exporter.json_exporter import JSONExporter, JSONFormat
+from .importer.importer import Importer
+from .importer.parse_cache import ParseCache
+from .settings_client import ServerError
+from .settings_index import MergePolicy, SettingsIndex
+from .spec_discovery import SpecDiscovery
+from .swift_generator import write_swift_code
+from .xcode_version_extractor import XcodeVersionExtractor
+
+class LoadedInstall:
+    """The settings of an Xcode installation together with the state of the files they were loaded from."""
+
+    def __init__(self, xcode: Path, xcversion: str, build: Optional[str], settings: SettingsIndex, stamp: tuple):
+        self.xcode = xcode
+        self.xcversion = xcversion
+        self.build = build
+        self.settings = settings
+        self.stamp = stamp
+        self._rendered: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def render(self, export_format: str, json_format: JSONFormat = JSONFormat.PRETTY) -> str:
+        """Returns the settings exported as JSON or Swift. Each document is generated only once."""
+        key = (export_format, json_format.value)
+        with self._lock:
+            rendered = self._rendered.get(key)
+            if rendered is None:
+                out = io.StringIO()
+                if export_format == "swift":
+                    write_swift_code(settings=self.settings, xcversion=self.xcversion, out=out)
+                elif export_format == "json":
+                    JSONExporter.write(self.xcversion, self.settings, out, json_format)
+                else:
+                    raise ServerError(f"Unknown export format {export_format}.")
+                rendered = out.getvalue()
+                self._rendered[key] = rendered
+        return rendered
+
+    def describe(self) -> dict:
+        return {
+            "path": str(self.xcode),
+            "xcode_version": self.xcversion,
+            "build": self.build,
+            "settings": len(self.settings),
+        }
+
+class SettingsStore:
+    """Loads Xcode installations on first use and reloads them when version.plist or the manifest changes.
+
+    Checking an installation takes two stat calls, so every request sees current settings without
+    walking the installation again.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path],
+        workers: int = 1,
+        use_threads: bool = False,
+        policy: MergePolicy = MergePolicy.FIRST_WINS
+    ):
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.use_threads = use_threads
+        self.policy = policy
+        self._installs: Dict[Path, LoadedInstall] = {}
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, xcode: Path) -> LoadedInstall:
+        """Returns the settings of an Xcode installation, loading them if needed."""
+        xcode = Path(xcode).resolve()
+        with self._lock:
+            lock = self._locks.setdefault(xcode, threading.Lock())
+        # concurrent requests for the same installation wait for a single load
+        with lock:
+            install = self._installs.get(xcode)
+            if install is None or install.stamp != self._stamp(xcode, install.build):
+                install = self._load(xcode)
+                with self._lock:
+                    self._installs[xcode] = install
+        return install
+
+    def find(self, name: str) -> LoadedInstall:
+        """Returns an installation by its path or by the version of a loaded installation."""
+        if Path(name).is_dir():
+            return self.get(Path(name))
+        with self._lock:
+            matches = [i for i in self._installs.values() if name in (i.xcversion, i.build)]
+        if not matches:
+            raise ServerError(f"{name} is neither an Xcode installation nor the version of a loaded one.")
+        return self.get(matches[-1].xcode)
+
+    def installs(self) -> list:
+        """Returns the loaded installations."""
+        with self._lock:
+            return [i.describe() for i in self._installs.values()]
+
+    def answer(self, request: dict) -> Any:
+        """Answers a request of the settings protocol."""
+        command = request.get("command")
+        if command == "installs":
+            return self.installs()
+        if "xcode" not in request:
+            raise ServerError("The request does not name an Xcode installation.")
+        install = self.find(request["xcode"])
+        if command == "export":
+            return install.render(request.get("format", "json"), JSONFormat(request.get("json_format", "pretty")))
+        if command == "lookup":
+            setting = install.settings.get(request.get("key"))
+            if setting is None:
+                raise ServerError(f"Xcode {install.xcversion} has no setting {request.get('key')}.")
+            return setting.to_dict()
+        if command == "categories":
+            return install.settings.categories()
+        if command == "category":
+            return [s.to_dict() for s in install.settings.by_category(request.get("category"))]
+        raise ServerError(f"Unknown command {command}.")
+
+    def _load(self, xcode: Path) -> LoadedInstall:
+        version_plist = xcode / "Contents/version.plist"
+        xcversion = XcodeVersionExtractor.extract_version(version_plist)
+        build = XcodeVersionExtractor.extract_build_version(version_plist)
+        if xcversion is None:
+            raise ServerError(f"{xcode} is not an Xcode installation.")
+        if self.cache_dir is None:
+            spec_file_paths = SpecDiscovery.discover(xcode)
+        else:
+            spec_file_paths = SpecDiscovery.discover_with_manifest(xcode, build, self.cache_dir / "manifests")
+        settings = Importer.parse_paths(
+            spec_file_paths,
+            workers=self.workers,
+            use_threads=self.use_threads,
+            cache=None if self.cache_dir is None else ParseCache(self.cache_dir),
+            policy=self.policy
+        )
+        settings.sorted()
+        # taken after the load, which may have written the manifest
+        return LoadedInstall(xcode, xcversion, build, settings, self._stamp(xcode, build))
+
+    def _stamp(self, xcode: Path, build: Optional[str]) -> tuple:
+        paths = [xcode / "Contents/version.plist"]
+        if self.cache_dir is not None and build is not None:
+            paths.append(self.cache_dir / "manifests" / f"{build}.json")
+        stamp = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                stamp.append((stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = {"ok": True, "result": self.server.store.answer(json.loads(line))}
+            except Exception as e:
+                response = {"ok": False, "error": str(e) or type(e).__name__}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+class SettingsServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A Unix domain socket server answering settings requests, one thread per connection."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, store: SettingsStore):
+        self.store = store
+        self.socket_path = Path(socket_path)
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_socket()
+        super().__init__(str(self.socket_path), _RequestHandler)
+        os.chmod(self.socket_path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _remove_stale_socket(self):
+        if not self.socket_path.exists():
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(self.socket_path))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # left behind by a server that did not shut down cleanly
+                self.socket_path.unlink()
+                return
+        raise ServerError(f"Another settings server is listening on {self.socket_path}.")
@@ -0,0 +1,133 @@
+"""This module provides the discovery of spec files inside an Xcode installation."""
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+class SpecDiscovery:
+    """A class to find the .xcspec files of an Xcode installation.
+
+    The tree is walked with os.scandir, reading several directories in parallel, and subtrees that
+    never contain build setting specs (SDKs, simulator runtimes, headers, documentation, ...) are
+    pruned. The found paths can be stored in a manifest per Xcode build, so later runs only check that
+    the listed files still exist.
+    """
+
+    spec_extension = ".xcspec"
+
+    # Directory names that are never entered by the pruned walk.
+    pruned_names = {
+        "SDKs",
+        "Toolchains",
+        "Runtimes",
+        "DeviceSupport",
+        "Headers",
+        "PrivateHeaders",
+        "Modules",
+        "Documentation",
+        "_CodeSignature",
+        "include",
+        "man",
+    }
+
+    # Directory extensions that are never entered by the pruned walk.
+    pruned_extensions = {
+        ".lproj",
+        ".simruntime",
+        ".docset",
+        ".dSYM",
+        ".swiftmodule",
+        ".nib",
+    }
+
+    @classmethod
+    def discover(cls, xcode: Path, prune: bool = True, workers: int = 8) -> List[Path]:
+        """Returns the sorted paths of all spec files inside the Xcode installation."""
+        return sorted(cls.iter_discover(xcode, prune=prune, workers=workers))
+
+    @classmethod
+    def iter_discover(cls, xcode: Path, prune: bool = True, workers: int = 8) -> Iterator[Path]:
+        """Yields the paths of all spec files inside the Xcode installation as they are found, unordered.
+
+        A directory is scanned as soon as its parent was read, so the slow branches of the tree do not
+        hold back the others.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(cls._scan, str(xcode), prune)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directories, files = future.result()
+                    pending.update(executor.submit(cls._scan, d, prune) for d in directories)
+                    for file in files:
+                        yield Path(file)
+
+    @classmethod
+    def discover_with_manifest(cls, xcode: Path, build: Optional[str], manifest_dir: Path) -> List[Path]:
+        """Returns the spec files listed in the manifest of the Xcode build, walking the tree if needed.
+
+        The manifest is only trusted if all of its entries still exist, otherwise it is rebuilt.
+        """
+        return sorted(cls.iter_discover_with_manifest(xcode, build, manifest_dir))
+
+    @classmethod
+    def iter_discover_with_manifest(cls, xcode: Path, build: Optional[str], manifest_dir: Path) -> Iterator[Path]:
+        """Yields the spec files listed in the manifest of the Xcode build or found by walking the tree.
+
+        The manifest is written once the walk is complete.
+        """
+        if build is None:
+            yield from cls.iter_discover(xcode)
+            return
+        manifest = Path(manifest_dir) / f"{build}.json"
+        try:
+            with manifest.open() as fp:
+                relative_paths = json.load(fp)["specs"]
+            specs = [Path(xcode) / p for p in relative_paths]
+            if all(p.is_file() for p in specs):
+                yield from specs
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+
+        specs = []
+        for path in cls.iter_discover(xcode):
+            specs.append(path)
+            yield path
+        specs.sort()
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        temp = manifest.with_suffix(f".{os.getpid()}.tmp")
+        with temp.open("w") as fp:
+            json.dump({"build": build, "specs": [str(p.relative_to(xcode)) for p in specs]}, fp, indent=1)
+        os.replace(temp, manifest)
+
+    @classmethod
+    def missed_by_pruning(cls, xcode: Path, full_scan: Optional[List[Path]] = None) -> List[Path]:
+        """Returns the spec files found by a full walk but skipped by the pruned one."""
+        if full_scan is None:
+            full_scan = cls.discover(xcode, prune=False)
+        pruned = set(cls.discover(xcode, prune=True))
+        return [p for p in full_scan if p not in pruned]
+
+    @classmethod
+    def _scan(cls, directory: str, prune: bool) -> Tuple[List[str], List[str]]:
+        """Returns the subdirectories to descend into and the spec files of a directory."""
+        directories = []
+        files = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not prune or not cls._is_pruned(entry.name):
+                            directories.append(entry.path)
+                    elif entry.name.endswith(cls.spec_extension):
+                        files.append(entry.path)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            pass
+        return directories, files
+
+    @classmethod
+    def _is_pruned(cls, name: str) -> bool:
+        return name in cls.pruned_names or os.path.splitext(name)[1] in cls.pruned_extensions
@@ -1,93 +1,333 @@
 """This module provides methods to generate Swift code from settings."""
-from re import sub
-from typing import Optional, List
+import re
+from io import StringIO
+from typing import Dict, Optional, List, TextIO, Tuple
 from .setting import Setting
-from .swift_acronyms import ACRONYMS
-from .swift_key_replacements import KEY_REPLACEMENTS
-from .setting_blacklist import SETTING_BLACKLIST
+from .swift_naming import argument_enum_case_name, argument_enum_name, enum_case_for_key, is_blacklisted
 
 _TAB = '    '
 _EMPTY_LINE = '\n'
-_INFOPLIST_KEY = 'INFOPLIST_KEY'
 
-def to_swift_code(settings: List[Setting], xcversion: str) -> str:
+# The file of a sharded output that holds the XcodeBuildSetting cases and the initialiser extension
+CORE_FILE_NAME = 'XcodeBuildSettings.swift'
+# The name of the file of a category in a sharded output
+SHARD_FILE_NAME = 'XcodeBuildSettings+{}.swift'
+
+_NON_IDENTIFIER = re.compile(r'[^0-9A-Za-z]+')
+# Shared argument enums with more cases are named after a setting instead of their cases
+_MAX_NAMED_CASES = 4
+
+def to_swift_code(settings: List[Setting], xcversion: str, lean: bool = False, share_enums: bool = False) -> str:
     """Generates swift code from a list of settings."""
-    string = ''
+    out = StringIO()
+    write_swift_code(settings=settings, xcversion=xcversion, out=out, lean=lean, share_enums=share_enums)
+    return out.getvalue()
 
-    string += _fileheader()
+def write_swift_code(settings: List[Setting], xcversion: str, out: TextIO, lean: bool = False, share_enums: bool = False):
+    """Generates swift code from a list of settings and writes it to a file-like object.
 
-    string += _EMPTY_LINE
-    
-    string += _newline(f'// Generated for Xcode version {xcversion}')
-    string += _newline('public extension SettingsDictionary {')
-    string += _EMPTY_LINE
-    string += _build_settings_enum(settings, 1)
-    string += _EMPTY_LINE
-    string += _newline('}')
-
-    string += _EMPTY_LINE
-
-    string += _newline('public extension SettingsDictionary {')
-    string += _EMPTY_LINE
-    string += _argument_enums(settings, 1)
-    string += _EMPTY_LINE
-    string += _newline('}')
-
-    string += _EMPTY_LINE
-    
-    string += _add_initialiser_extension()
+    With lean set, the keys are returned by a switch that does not bind the payloads and the values are
+    computed by a switch with one arm per value type instead of one arm per setting, and the
+    initialiser extension evaluates each setting once. The declarations are the same, so the code is
+    source-compatible.
+
+    With share_enums set, settings with the same values share one argument enum, see shared_enums.
+    """
+    writer = _SwiftWriter(out)
+    shared = shared_enums(settings) if share_enums else {}
+
+    _fileheader(writer)
+
+    writer.empty_line()
 
-    return string
+    writer.line(f'// Generated for Xcode version {xcversion}')
+    writer.line('public extension SettingsDictionary {')
+    writer.empty_line()
+    _build_settings_enum(writer, settings, 1, lean)
+    writer.empty_line()
+    writer.line('}')
+
+    writer.empty_line()
+
+    writer.line('public extension SettingsDictionary {')
+    writer.empty_line()
+    if shared:
+        _shared_argument_enums(writer, shared, 1)
+        writer.empty_line()
+    _argument_enums(writer, settings, 1, shared)
+    writer.empty_line()
+    writer.line('}')
+
+    writer.empty_line()
+
+    if lean:
+        _add_lean_initialiser_extension(writer)
+    else:
+        _add_initialiser_extension(writer)
+    writer.flush()
+
+def swift_shards(settings: List[Setting], xcversion: str, share_enums: bool = False) -> Dict[str, str]:
+    """Generates swift code split into a core file and one file per setting category.
+
+    The core file declares the XcodeBuildSetting cases and the initialiser extension. The file of a
+    category holds the part of the info switch and the argument enums of its settings, so Swift can
+    type-check the categories separately and a changed setting only changes the core file and the file
+    of its category. Shared argument enums are declared in the core file. Returns the contents by file
+    name.
+    """
+    shared = shared_enums(settings) if share_enums else {}
+    categories: Dict[str, List[Setting]] = {}
+    for s in settings:
+        categories.setdefault(_shard_name(s.category), []).append(s)
+
+    shards = {}
+    with_info = []
+    for name in sorted(categories):
+        out = StringIO()
+        if _write_shard(_SwiftWriter(out), name, categories[name], shared):
+            with_info.append(name)
+        shards[SHARD_FILE_NAME.format(name)] = out.getvalue()
+
+    out = StringIO()
+    writer = _SwiftWriter(out)
+    _fileheader(writer)
+    writer.empty_line()
+    writer.line(f'// Generated for Xcode version {xcversion}')
+    writer.line('public extension SettingsDictionary {')
+    writer.empty_line()
+    writer.line('enum XcodeBuildSetting {', 1)
+    _setting_cases(writer, settings, 2)
+    writer.empty_line()
+    _sharded_settings_var(writer, with_info, 2)
+    writer.line('}', 1)
+    if shared:
+        writer.empty_line()
+        _shared_argument_enums(writer, shared, 1)
+    writer.empty_line()
+    writer.line('}')
+    writer.empty_line()
+    _add_initialiser_extension(writer)
+    writer.flush()
+    shards[CORE_FILE_NAME] = out.getvalue()
+    return shards
+
+def shared_enums(settings: List[Setting]) -> Dict[Tuple[str, ...], str]:
+    """Returns the names of the argument enums shared by several settings by their values.
+
+    A set of values used by two or more settings gets one enum named after its cases, or after the
+    first setting using it if it has more than a few cases. The enums of the settings become type
+    aliases of the shared enum, so their names keep working.
+    """
+    users: Dict[Tuple[str, ...], int] = {}
+    taken = set()
+    for s in settings:
+        if s.type == Setting.TYPE_ENUM and s.enum_cases is not None:
+            values = tuple(s.enum_cases)
+            users[values] = users.get(values, 0) + 1
+            taken.add(argument_enum_name(s.key))
+    shared = {}
+    for s in settings:
+        if s.type != Setting.TYPE_ENUM or s.enum_cases is None:
+            continue
+        values = tuple(s.enum_cases)
+        if users[values] < 2 or values in shared:
+            continue
+        if len(values) <= _MAX_NAMED_CASES:
+            base = ''.join(_capitalized(argument_enum_case_name(v)) for v in values) or 'Empty'
+            name = f'Shared{base}Value'
+        else:
+            name = 'Shared' + argument_enum_name(s.key)
+        unique, n = name, 2
+        while unique in taken:
+            unique, n = f'{name}{n}', n + 1
+        taken.add(unique)
+        shared[values] = unique
+    return shared
+
+def shared_enum_savings(settings: List[Setting], shared: Dict[Tuple[str, ...], str]) -> Tuple[int, int]:
+    """Returns the number of argument enums and of lines of code the shared enums eliminate."""
+    aliased = [s for s in settings
+               if s.type == Setting.TYPE_ENUM and s.enum_cases is not None and tuple(s.enum_cases) in shared]
+    # an enum takes a line per case, its declaration, its closing brace and the empty line before it
+    separate = sum(len(s.enum_cases) + 3 for s in aliased)
+    deduplicated = sum(len(values) + 3 for values in shared) + len(aliased) + (1 if shared else 0)
+    return len(aliased) - len(shared), separate - deduplicated
+
+class _SwiftWriter:
+    """Writes lines of code to a file-like object in buffered chunks."""
+
+    _CHUNK_SIZE = 1024
+
+    def __init__(self, out: TextIO):
+        self._out = out
+        self._buffer = []
+
+    def line(self, text: str, indent: int = 0):
+        self.write(_TAB * indent + text + '\n')
+
+    def empty_line(self):
+        self.write(_EMPTY_LINE)
+
+    def write(self, text: str):
+        self._buffer.append(text)
+        if len(self._buffer) >= self._CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        self._out.write(''.join(self._buffer))
+        self._buffer = []
 
 def _documentation(text: str) -> str:
     return '/// ' + text
 
-def _fileheader() -> str:
-    string = ''
-    string += _newline('import ProjectDescription')
-    string += _EMPTY_LINE
-    string += _newline('public typealias Path = String')
-    return string
+def _fileheader(writer: _SwiftWriter):
+    writer.line('import ProjectDescription')
+    writer.empty_line()
+    writer.line('public typealias Path = String')
+
+def _build_settings_enum(writer: _SwiftWriter, settings: List[Setting], indent: int = 0, lean: bool = False):
+    writer.line('enum XcodeBuildSetting {', indent)
+    _setting_cases(writer, settings, indent + 1)
+    writer.empty_line()
+    if lean:
+        _lean_settings_vars(writer, settings, indent + 1)
+    else:
+        _settings_var(writer, settings, indent + 1)
+    writer.line('}', indent)
 
-def _build_settings_enum(settings: List[Setting], indent: int = 0) -> str:
-    string = ''
-    string += _newline('enum XcodeBuildSetting {', indent)
+def _setting_cases(writer: _SwiftWriter, settings: List[Setting], indent: int = 0):
     for s in settings:
-        if s.key in SETTING_BLACKLIST:
+        if is_blacklisted(s.key):
             continue
         if s.description != None:
             for line in s.description.split('\n'):
-                string += _newline(_documentation(line), indent + 1)
+                writer.line(_documentation(line), indent)
         
-        string += _newline(_setting_enum_name(s), indent + 1)
-    
-    string += _EMPTY_LINE
-    string += _settings_var(settings, indent + 1)
-    string += _newline('}', indent)
-    return string
-
-def _settings_var(settings: List[Setting], indent: int = 0) -> str:
-    string = ''
-    string += _newline('var info: (key: String, value: SettingValue) {', indent)
-    string += _newline('switch self {', indent + 1)
+        writer.line(_setting_enum_name(s), indent)
+
+def _settings_var(writer: _SwiftWriter, settings: List[Setting], indent: int = 0):
+    writer.line('var info: (key: String, value: SettingValue) {', indent)
+    writer.line('switch self {', indent + 1)
     for s in settings:
-        if s.key in SETTING_BLACKLIST:
+        if is_blacklisted(s.key):
             continue
-        string += _newline(f'case .{_enum_case_for_key(s.key)}(let value):', indent + 2)
-        string += _newline(f'return (\"{s.key}\", {_save_value_statement(s=s, valueID="value")})', indent + 3)
-    string += _newline('default:', indent + 2)
-    string += _newline('fatalError("Not a valid build setting")', indent + 3)
-
-    string += _newline('}', indent + 1)
-    string += _newline('}', indent)
-    return string
-
-def _argument_enums(settings: List[Setting], indent: int = 0) -> str:
-    enums = [_argument_enum(s, indent) for s in settings if s.type == Setting.TYPE_ENUM]
-    return _EMPTY_LINE.join(enums)
-
-def _add_initialiser_extension(indent: int = 0) -> str:
-    return '''
+        writer.line(f'case .{enum_case_for_key(s.key)}(let value):', indent + 2)
+        writer.line(f'return (\"{s.key}\", {_save_value_statement(s=s, valueID="value")})', indent + 3)
+    writer.line('default:', indent + 2)
+    writer.line('fatalError("Not a valid build setting")', indent + 3)
+
+    writer.line('}', indent + 1)
+    writer.line('}', indent)
+
+def _lean_settings_vars(writer: _SwiftWriter, settings: List[Setting], indent: int = 0):
+    exported = [s for s in settings if not is_blacklisted(s.key)]
+    # the payloads are not bound, so each arm only compares the case
+    writer.line('var key: String {', indent)
+    writer.line('switch self {', indent + 1)
+    for s in exported:
+        writer.line(f'case .{enum_case_for_key(s.key)}: return "{s.key}"', indent + 2)
+    writer.line('default:', indent + 2)
+    writer.line('fatalError("Not a valid build setting")', indent + 3)
+    writer.line('}', indent + 1)
+    writer.line('}', indent)
+    writer.empty_line()
+    # settings whose payloads have the same type share an arm, those of argument enums differ in type
+    arms: Dict[str, List[Setting]] = {}
+    for s in exported:
+        statement = _save_value_statement(s=s, valueID='value')
+        if s.type == Setting.TYPE_ENUM:
+            statement = f'{argument_enum_name(s.key)}:{statement}'
+        arms.setdefault(statement, []).append(s)
+    writer.line('var value: SettingValue {', indent)
+    writer.line('switch self {', indent + 1)
+    for arm in arms.values():
+        patterns = [f'.{enum_case_for_key(s.key)}(let value)' for s in arm]
+        writer.line(f'case {patterns[0]}' + (',' if len(patterns) > 1 else ':'), indent + 2)
+        for i, pattern in enumerate(patterns[1:], 2):
+            writer.line(f'     {pattern}' + (',' if i < len(patterns) else ':'), indent + 2)
+        writer.line(f'return {_save_value_statement(s=arm[0], valueID="value")}', indent + 3)
+    writer.line('default:', indent + 2)
+    writer.line('fatalError("Not a valid build setting")', indent + 3)
+    writer.line('}', indent + 1)
+    writer.line('}', indent)
+    writer.empty_line()
+    writer.line('var info: (key: String, value: SettingValue) {', indent)
+    writer.line('(key, value)', indent + 1)
+    writer.line('}', indent)
+
+def _sharded_settings_var(writer: _SwiftWriter, shard_names: List[str], indent: int = 0):
+    writer.line('var info: (key: String, value: SettingValue) {', indent)
+    for name in shard_names:
+        writer.line(f'if let info = infoFor{name} {{ return info }}', indent + 1)
+    writer.line('fatalError("Not a valid build setting")', indent + 1)
+    writer.line('}', indent)
+
+def _shard_name(category: Optional[str]) -> str:
+    name = ''.join(part[:1].upper() + part[1:] for part in _NON_IDENTIFIER.split(category or ''))
+    if not name:
+        return 'Uncategorized'
+    return f'_{name}' if name[0].isdigit() else name
+
+def _write_shard(writer: _SwiftWriter, name: str, settings: List[Setting], shared: Dict[Tuple[str, ...], str]) -> bool:
+    """Writes the file of a category and tells if it has an info property."""
+    writer.line('import ProjectDescription')
+    writer.empty_line()
+    writer.line(f'// The build settings of the category {name}')
+    exported = [s for s in settings if not is_blacklisted(s.key)]
+    if exported:
+        writer.empty_line()
+        writer.line('extension SettingsDictionary.XcodeBuildSetting {')
+        writer.empty_line()
+        writer.line(f'var infoFor{name}: (key: String, value: SettingValue)? {{', 1)
+        writer.line('switch self {', 2)
+        for s in exported:
+            writer.line(f'case .{enum_case_for_key(s.key)}(let value):', 3)
+            writer.line(f'return (\"{s.key}\", {_save_value_statement(s=s, valueID="value")})', 4)
+        writer.line('default:', 3)
+        writer.line('return nil', 4)
+        writer.line('}', 2)
+        writer.line('}', 1)
+        writer.empty_line()
+        writer.line('}')
+    if any(s.type == Setting.TYPE_ENUM for s in settings):
+        writer.empty_line()
+        writer.line('public extension SettingsDictionary {')
+        writer.empty_line()
+        _argument_enums(writer, settings, 1, shared)
+        writer.empty_line()
+        writer.line('}')
+    writer.flush()
+    return bool(exported)
+
+def _argument_enums(writer: _SwiftWriter, settings: List[Setting], indent: int = 0, shared: Optional[Dict[Tuple[str, ...], str]] = None):
+    enum_settings = [s for s in settings if s.type == Setting.TYPE_ENUM]
+    aliases = []
+    if shared:
+        aliases = [s for s in enum_settings if s.enum_cases is not None and tuple(s.enum_cases) in shared]
+        enum_settings = [s for s in enum_settings if s.enum_cases is None or tuple(s.enum_cases) not in shared]
+    for i, s in enumerate(enum_settings):
+        if i > 0:
+            writer.empty_line()
+        _argument_enum(writer, s, indent)
+    if aliases and enum_settings:
+        writer.empty_line()
+    for s in aliases:
+        writer.line(f'typealias {argument_enum_name(s.key)} = {shared[tuple(s.enum_cases)]}', indent)
+
+def _shared_argument_enums(writer: _SwiftWriter, shared: Dict[Tuple[str, ...], str], indent: int = 0):
+    for i, (values, name) in enumerate(shared.items()):
+        if i > 0:
+            writer.empty_line()
+        writer.line(f'enum {name}: String' + ' {', indent)
+        for v in values:
+            writer.line(f'case {argument_enum_case_name(v)} = \"{v}\"', indent + 1)
+        writer.line('}', indent)
+
+def _capitalized(name: str) -> str:
+    return name[:1].upper() + name[1:]
+
+def _add_initialiser_extension(writer: _SwiftWriter, indent: int = 0):
+    writer.write('''
 extension SettingsDictionary: ExpressibleByArrayLiteral {
 
     public init(buildSettings: [XcodeBuildSetting]) {
@@ -111,13 +351,37 @@ extension SettingsDictionary: ExpressibleByArrayLiteral {
     }
 
 }
-    '''
+    ''')
 
-def _newline(text: str, indent: int = 0) -> str:
-    return _TAB * indent + text + '\n'
+def _add_lean_initialiser_extension(writer: _SwiftWriter, indent: int = 0):
+    writer.write('''
+extension SettingsDictionary: ExpressibleByArrayLiteral {
+
+    public init(buildSettings: [XcodeBuildSetting]) {
+        self.init()
+        buildSettings.forEach { let info = $0.info; self[info.key] = info.value }
+    }
+
+    public init(arrayLiteral elements: XcodeBuildSetting...) {
+        self.init()
+        elements.forEach { let info = $0.info; self[info.key] = info.value }
+    }
+
+    public func extend(with buildSettings: [XcodeBuildSetting]) -> ProjectDescription.SettingsDictionary {
+        var newDict = self
+        buildSettings.forEach { let info = $0.info; newDict[info.key] = info.value }
+        return newDict
+    }
+
+    mutating public func extending(with buildSettings: [XcodeBuildSetting]) {
+        buildSettings.forEach { let info = $0.info; self[info.key] = info.value }
+    }
+
+}
+    ''')
 
 def _setting_enum_name(s: Setting):
-    name = 'case ' + _enum_case_for_key(s.key)
+    name = 'case ' + enum_case_for_key(s.key)
     name += '('
     s_type = s.type.lower()
     if s_type == Setting.TYPE_STRING.lower():
@@ -131,7 +395,7 @@ def _setting_enum_name(s: Setting):
     elif s_type == Setting.TYPE_BOOLEAN.lower():
         name += '_ bool: Bool'
     elif s_type == Setting.TYPE_ENUM.lower():
-        name += f'_ value: {_argument_enum_name(s.key)}'
+        name += f'_ value: {argument_enum_name(s.key)}'
 
     default = _default_value(s)
     if default != None:
@@ -140,61 +404,15 @@ def _setting_enum_name(s: Setting):
     name += ')'
     return name
 
-def _argument_enum(s: Setting, indent: int = 0) -> str:
+def _argument_enum(writer: _SwiftWriter, s: Setting, indent: int = 0):
     if s.enum_cases == None:
-        return ''
-    string = ''
-    string += _newline(f'enum {_argument_enum_name(s.key)}: String' + ' {', indent)
+        return
+    writer.line(f'enum {argument_enum_name(s.key)}: String' + ' {', indent)
 
     for v in s.enum_cases:
-        string += _newline(f'case {_argument_enum_case_name(v)} = \"{v}\"', indent + 1)
-
-    string += _newline('}', indent)
-    return string
-
-def _argument_enum_name(name: str) -> str:
-    string = _camel_case(name, start_lower=False)
-    return string + 'Value'
-
-def _argument_enum_case_name(name: str) -> str:
-    if len(name) == 0:
-        return 'empty'
-    elif name.lower() == 'default':
-        return 'Default'
-    elif name == 'extension':
-        return 'Extension'
-    elif name == 'XML':
-        return 'XML'
-    elif name == 'Binary':
-        return 'Binary'
-    elif name == 'UIStatusBarStyleDefault':
-        return 'Default'
-    elif name.startswith("UIStatusBarStyle"):
-        s = name[len("UIStatusBarStyle"):]
-        return ''.join([s[0].lower(), s[1:]])
-    elif name[0].isdigit():
-        return f'_{name}'
-    elif 'c++' in name:
-        n = sub(r"c\+\+", "c_Plus_Plus", name)
-        return _camel_case(n)
-    elif 'gnu++' in name:
-        n = sub(r"gnu\+\+", "gnu_Plus_Plus", name)
-        return _camel_case(n)
-    return _camel_case(name)
-
-def _camel_case(text: str, start_lower: bool = True) -> str:
-    # replace special characters with whitespace, uppercase the first letter of every word, remove whitespace
-    s = sub(r"(_|-|\.|\+)+", " ", text).title().replace(" ", "")
-    if start_lower:
-        if len(s) == 1:
-            return s[0].lower()
-        else:
-            return ''.join([s[0].lower(), s[1:]])
-    else:
-        if len(s) == 1:
-            return s[0].upper()
-        else:
-            return ''.join([s[0].upper(), s[1:]])
+        writer.line(f'case {argument_enum_case_name(v)} = \"{v}\"', indent + 1)
+
+    writer.line('}', indent)
 
 def _default_value(s: Setting) -> Optional[str]:
 
@@ -219,7 +437,7 @@ def _default_value(s: Setting) -> Optional[str]:
     elif s.type == 'Enumeration':
         if default_value.startswith('$('):
             return None
-        return  f'.{_argument_enum_case_name(default_value)}'
+        return  f'.{argument_enum_case_name(default_value)}'
 
 def _masked(text: str) -> str:
     return text.replace('"','\\"')
@@ -238,25 +456,3 @@ def _save_value_statement(s: Setting, valueID: str) -> str:
         return f'.init(booleanLiteral: {valueID})'
     elif s_type == Setting.TYPE_ENUM.lower():
         return f'.string({valueID}.rawValue)'
-
-def _enum_case_for_key(key: str) -> str:
-    comps = list(sub(r"(_|-|\.|\+)+", " ", key).split(" "))
-    if key.startswith(_INFOPLIST_KEY):
-        nameComps = ['infoPlistKey'] + comps[2:]
-        name = ''.join(nameComps)
-        return name
-
-    corrected_comps = []
-    for c in comps:
-        if ACRONYMS.get(c) is not None:
-            corrected_comps += ACRONYMS.get(c)
-        elif c in KEY_REPLACEMENTS:
-            return _decapitalize(c)
-        else:
-            corrected_comps.append(c.title())
-    corrected_comps[0] = str(corrected_comps[0]).lower()
-    name = ''.join(corrected_comps)
-    return name
-
-def _decapitalize(s):
-    return ''.join([s[:1].lower(), s[1:]]) 
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""This module provides the naming of Swift identifiers for build settings.
+
+The functions are memoized, so a key that is converted several times per run (enum case, switch case,
+argument enum) is only converted once.
+"""
+
+import re
+from functools import lru_cache
+from .swift_acronyms import ACRONYMS
+from .swift_key_replacements import KEY_REPLACEMENTS
+from .setting_blacklist import SETTING_BLACKLIST
+
+_CACHE_SIZE = 65536
+_INFOPLIST_KEY = 'INFOPLIST_KEY'
+_STATUS_BAR_STYLE = 'UIStatusBarStyle'
+
+_SEPARATORS = re.compile(r"(_|-|\.|\+)+")
+_CPLUSPLUS = re.compile(r"c\+\+")
+_GNUPLUSPLUS = re.compile(r"gnu\+\+")
+
+_ACRONYMS = {acronym: tuple(comps) for acronym, comps in ACRONYMS.items()}
+_KEY_REPLACEMENTS = frozenset(KEY_REPLACEMENTS)
+_SETTING_BLACKLIST = frozenset(SETTING_BLACKLIST)
+
+# Enum values with a fixed case name.
+_CASE_NAMES = {
+    '': 'empty',
+    'extension': 'Extension',
+    'XML': 'XML',
+    'Binary': 'Binary',
+    'UIStatusBarStyleDefault': 'Default',
+}
+
+def _decapitalize(s: str) -> str:
+    return s[:1].lower() + s[1:]
+
+# Rules for all other enum values, the first matching rule names the case.
+_CASE_NAME_RULES = (
+    (lambda name: name.lower() == 'default', lambda name: 'Default'),
+    (lambda name: name.startswith(_STATUS_BAR_STYLE), lambda name: _decapitalize(name[len(_STATUS_BAR_STYLE):])),
+    (lambda name: name[0].isdigit(), lambda name: f'_{name}'),
+    (lambda name: 'c++' in name, lambda name: camel_case(_CPLUSPLUS.sub("c_Plus_Plus", name))),
+    (lambda name: 'gnu++' in name, lambda name: camel_case(_GNUPLUSPLUS.sub("gnu_Plus_Plus", name))),
+)
+
+def is_blacklisted(key: str) -> bool:
+    """Tells if a setting must not be exported."""
+    return key in _SETTING_BLACKLIST
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def camel_case(text: str, start_lower: bool = True) -> str:
+    """Converts a text with _ - . + separators to camel case."""
+    # replace special characters with whitespace, uppercase the first letter of every word, remove whitespace
+    s = _SEPARATORS.sub(" ", text).title().replace(" ", "")
+    first = s[:1].lower() if start_lower else s[:1].upper()
+    return first + s[1:]
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def enum_case_for_key(key: str) -> str:
+    """Returns the name of the XcodeBuildSetting case of a setting key."""
+    comps = _SEPARATORS.sub(" ", key).split(" ")
+    if key.startswith(_INFOPLIST_KEY):
+        return ''.join(['infoPlistKey'] + comps[2:])
+
+    corrected_comps = []
+    for c in comps:
+        acronym = _ACRONYMS.get(c)
+        if acronym is not None:
+            corrected_comps += acronym
+        elif c in _KEY_REPLACEMENTS:
+            return _decapitalize(c)
+        else:
+            corrected_comps.append(c.title())
+    corrected_comps[0] = str(corrected_comps[0]).lower()
+    return ''.join(corrected_comps)
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def argument_enum_name(key: str) -> str:
+    """Returns the name of the enum holding the values of a setting key."""
+    return camel_case(key, start_lower=False) + 'Value'
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def argument_enum_case_name(value: str) -> str:
+    """Returns the name of the enum case of a setting value."""
+    name = _CASE_NAMES.get(value)
+    if name is not None:
+        return name
+    for matches, to_name in _CASE_NAME_RULES:
+        if matches(value):
+            return to_name(value)
+    return camel_case(value)
+
+def cache_clear():
+    """Empties the memo caches of all naming functions."""
+    for func in (camel_case, enum_case_for_key, argument_enum_name, argument_enum_case_name):
+        func.cache_clear()
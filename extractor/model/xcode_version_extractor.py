@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 import plistlib
+from typing import Optional
 
 class XcodeVersionExtractor:
     """A class to extract the xcode version from the version.plist file"""
@@ -21,4 +22,13 @@ class XcodeVersionExtractor:
             pl = plistlib.load(fp)
             if not "CFBundleShortVersionString" in pl:
                 raise Exception("cannot finf version string")
-            return pl["CFBundleShortVersionString"]
\ No newline at end of file
+            return pl["CFBundleShortVersionString"]
+
+    @classmethod
+    def extract_build_version(cls, path: Path) -> Optional[str]:
+        """Returns the build version (e.g. 14E222b) or None if the file does not contain one."""
+        if not cls.can_ingest(path):
+            raise Exception("cannot ingest exception")
+        with open(path, 'rb') as fp:
+            pl = plistlib.load(fp)
+            return pl.get("ProductBuildVersion")
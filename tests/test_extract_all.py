@@ -0,0 +1,46 @@
+from typer.testing import CliRunner
+from extractor.cli import app
+from .xcode_app import option, write_xcode_app
+
+SPECS = {"Tool": [option("TOOL_SETTING", "Building")]}
+
+def test_installations_writing_the_same_output_are_refused(tmp_path):
+    first = write_xcode_app(tmp_path / "Xcode-15.0.app", SPECS, build="15A240d")
+    second = write_xcode_app(tmp_path / "Xcode-15.0-rc.app", SPECS, build="15A240c")
+    template = str(tmp_path / "out" / "{version}.json")
+    result = CliRunner().invoke(app, ["extract-all", str(first), str(second), "--no-cache", "-j", template])
+    assert result.exit_code == 1
+    assert f"{first} and {second} would both be written to {tmp_path / 'out' / '15.0.json'}" in result.output
+    assert not (tmp_path / "out" / "15.0.json").exists()
+
+def test_installations_with_distinct_outputs_are_extracted(tmp_path):
+    first = write_xcode_app(tmp_path / "Xcode-15.0.app", SPECS, build="15A240d")
+    second = write_xcode_app(tmp_path / "Xcode-15.0-rc.app", SPECS, build="15A240c")
+    template = str(tmp_path / "out" / "{build}.json")
+    result = CliRunner().invoke(app, ["extract-all", str(first), str(second), "--no-cache", "-j", template])
+    assert result.exit_code == 0, result.output
+    assert sorted(p.name for p in (tmp_path / "out").glob("*.json")) == ["15A240c.json", "15A240d.json"]
+
+def test_unchanged_installations_are_skipped(tmp_path):
+    xcode = write_xcode_app(tmp_path / "Xcode.app", SPECS)
+    args = ["extract-all", str(xcode), "--no-cache", "-j", str(tmp_path / "{version}.json")]
+    assert CliRunner().invoke(app, args).exit_code == 0
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert f"Skipping {tmp_path / '15.0.json'}" in result.output
+    assert "Regenerating" in CliRunner().invoke(app, args + ["--force"]).output
+
+def test_extract_all_replaces_the_fingerprint_of_extract(tmp_path):
+    xcode = write_xcode_app(tmp_path / "Xcode.app", SPECS)
+    output = tmp_path / "15.0.json"
+    extract = ["extract", str(xcode), "--no-cache", "-j", str(output)]
+    assert CliRunner().invoke(app, extract).exit_code == 0
+    pretty = output.read_text()
+    extract_all = ["extract-all", str(xcode), "--no-cache", "-j", str(tmp_path / "{version}.json")]
+    result = CliRunner().invoke(app, extract_all + ["--json-format", "compact"])
+    assert result.exit_code == 0, result.output
+    assert output.read_text() != pretty
+    result = CliRunner().invoke(app, extract)
+    assert result.exit_code == 0, result.output
+    assert f"Regenerating {output}: inputs changed" in result.output
+    assert output.read_text() == pretty
@@ -0,0 +1,30 @@
+from extractor.model.exporter.registry import ExporterRegistry
+from extractor.model.fingerprint import Fingerprint
+
+SPECS = [["Contents/Developer/Tool.xcspec", "0" * 64]]
+
+def test_fingerprint_changes_with_the_generator_version():
+    options = {"format": "swift"}
+    first = Fingerprint.compute("15.0", "15A240d", SPECS, options, 1)
+    assert Fingerprint.compute("15.0", "15A240d", SPECS, options, 1) == first
+    assert Fingerprint.compute("15.0", "15A240d", SPECS, options, 2) != first
+
+def test_every_builtin_format_has_a_generator_version():
+    for name in ("json", "ndjson", "swift", "swift-lean", "swift-shards"):
+        exporter, _ = ExporterRegistry.get(name)
+        assert isinstance(exporter.generator_version, int)
+
+def test_stored_fingerprint_requires_the_output(tmp_path):
+    output = tmp_path / "settings.swift"
+    output.write_text("")
+    Fingerprint.store(output, "abc")
+    assert Fingerprint.stored(output) == "abc"
+    output.unlink()
+    assert Fingerprint.stored(output) is None
+
+def test_lean_swift_has_a_generator_version_of_its_own():
+    swift, _ = ExporterRegistry.get("swift")
+    lean, _ = ExporterRegistry.get("swift-lean")
+    assert lean is not swift
+    assert swift.generator_version == 1
+    assert lean.generator_version == 2
@@ -0,0 +1,74 @@
+import threading
+import time
+import pytest
+from extractor.model.install_watcher import InstallWatcher
+from .xcode_app import option, write_version, write_xcode_app
+
+DEBOUNCE = 0.2
+
+class Recorder:
+    """Collects the names of the installations a watcher reports."""
+
+    def __init__(self):
+        self.reported = []
+        self._condition = threading.Condition()
+
+    def __call__(self, install):
+        with self._condition:
+            self.reported.append(install.name)
+            self._condition.notify_all()
+
+    def take(self, count: int) -> list:
+        """Waits for count reports and a while longer for wrong extra ones, then returns and clears them."""
+        with self._condition:
+            self._condition.wait_for(lambda: len(self.reported) >= count, DEBOUNCE + 5)
+        time.sleep(DEBOUNCE * 2)
+        with self._condition:
+            reported, self.reported = self.reported, []
+        return sorted(reported)
+
+@pytest.mark.parametrize("use_inotify", [False, True], ids=["polling", "inotify"])
+def test_each_new_or_changed_installation_is_reported_once(tmp_path, use_inotify):
+    # without inotify, e.g. on macOS, the watcher polls in both cases
+    specs = {"Tool": [option("TOOL_SETTING", "Building")]}
+    write_xcode_app(tmp_path / "Xcode-14.3.app", specs, version="14.3", build="14E222b")
+    watcher = InstallWatcher([tmp_path], interval=0.05, debounce=DEBOUNCE, use_inotify=use_inotify)
+    recorder = Recorder()
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.run, args=(recorder, stop), daemon=True)
+    thread.start()
+    try:
+        assert recorder.take(1) == ["Xcode-14.3.app"]
+
+        write_xcode_app(tmp_path / "Xcode-15.0.app", specs)
+        (tmp_path / "Xcode-beta.app/Contents").mkdir(parents=True)
+        (tmp_path / "notes").mkdir()
+        assert recorder.take(1) == ["Xcode-15.0.app"]
+
+        # an update rewrites the version several times within the debounce time
+        for build in ("15A240a", "15A240b", "15A240c"):
+            write_version(tmp_path / "Xcode-15.0.app", build=build)
+            time.sleep(DEBOUNCE / 4)
+        assert recorder.take(1) == ["Xcode-15.0.app"]
+
+        write_version(tmp_path / "Xcode-beta.app", "15.1", "15C5028h")
+        assert recorder.take(1) == ["Xcode-beta.app"]
+    finally:
+        stop.set()
+        thread.join(5)
+    assert not thread.is_alive()
+
+def test_installations_present_at_the_start_can_be_skipped(tmp_path):
+    write_version(tmp_path / "Xcode.app")
+    recorder = Recorder()
+    stop = threading.Event()
+    watcher = InstallWatcher([tmp_path], interval=0.05, debounce=DEBOUNCE, use_inotify=False)
+    thread = threading.Thread(target=watcher.run, args=(recorder, stop), kwargs={"initial": False}, daemon=True)
+    thread.start()
+    try:
+        assert recorder.take(0) == []
+        write_version(tmp_path / "Xcode.app", build="15A240e")
+        assert recorder.take(1) == ["Xcode.app"]
+    finally:
+        stop.set()
+        thread.join(5)
@@ -0,0 +1,69 @@
+import plistlib
+import threading
+from pathlib import Path
+from extractor.model.importer.parse_cache import ParseCache, SharedParseCache
+from extractor.model.importer.plist_importer import PlistImporter
+from extractor.model.setting import Setting
+from extractor.model.setting_filter import SettingFilter
+
+def write_specs(directory: Path, count: int) -> list:
+    directory.mkdir(parents=True)
+    paths = []
+    for i in range(count):
+        path = directory / f"Tool{i}.xcspec"
+        options = [{"Name": f"TOOL{i}_SETTING_{j}", "Type": "Boolean", "DefaultValue": "NO"} for j in range(20)]
+        with path.open("wb") as fp:
+            plistlib.dump([{"Identifier": f"tool{i}", "Type": "Compiler", "Options": options}], fp)
+        paths.append(path)
+    return paths
+
+def test_identical_specs_in_opposite_order_do_not_deadlock(tmp_path):
+    first = write_specs(tmp_path / "Xcode-14.3.app", 4)
+    second = list(reversed(write_specs(tmp_path / "Xcode-15.0.app", 4)))
+    for backing in (None, ParseCache(tmp_path / "cache")):
+        cache = SharedParseCache(backing)
+        claimed = threading.Event()
+        results = {}
+
+        def extract(name, paths, started=None):
+            try:
+                if started is not None:
+                    # claim the first file before the other extraction claims the rest
+                    assert cache.get(paths[0]) is None
+                    started.set()
+                results[name] = PlistImporter.parse_paths(paths, cache=cache)
+            finally:
+                cache.release()
+
+        threads = [threading.Thread(target=extract, args=("second", second, claimed), daemon=True),
+                   threading.Thread(target=extract, args=("first", first), daemon=True)]
+        threads[0].start()
+        assert claimed.wait(10)
+        threads[1].start()
+        for thread in threads:
+            thread.join(10)
+        assert not any(thread.is_alive() for thread in threads), "the extractions wait for each other"
+        assert len(results["first"]) == len(results["second"]) == 80
+        assert sorted(s.key for s in results["first"]) == sorted(s.key for s in results["second"])
+
+def test_identical_specs_are_parsed_once(tmp_path):
+    first = write_specs(tmp_path / "Xcode-14.3.app", 3)
+    second = write_specs(tmp_path / "Xcode-15.0.app", 3)
+    cache = SharedParseCache()
+    assert len(PlistImporter.parse_paths(first, cache=cache)) == 60
+    assert len(PlistImporter.parse_paths(second, cache=cache)) == 60
+    assert (cache.stats.hits, cache.stats.misses) == (3, 3)
+
+def test_filtered_cache_hits_create_only_selected_settings(tmp_path, monkeypatch):
+    paths = write_specs(tmp_path / "Xcode.app", 2)
+    setting_filter = SettingFilter(include=["TOOL0_SETTING_1*"])
+    expected = sorted(s.key for s in PlistImporter.parse_paths(paths, setting_filter=setting_filter))
+    created = []
+    from_tuple = Setting.from_tuple.__func__
+    monkeypatch.setattr(Setting, "from_tuple", classmethod(lambda cls, row: created.append(row[2]) or from_tuple(cls, row)))
+    for _ in range(2):
+        created.clear()
+        cache = ParseCache(tmp_path / "cache")
+        settings = PlistImporter.parse_paths(paths, cache=cache, setting_filter=setting_filter)
+        assert sorted(s.key for s in settings) == sorted(created) == expected
+    assert (cache.stats.hits, cache.stats.misses) == (1, 0)
@@ -0,0 +1,19 @@
+import io
+import plistlib
+from datetime import datetime
+from extractor.model.importer.plist_stream import parse_options
+
+def test_options_match_plistlib():
+    options = [
+        {"Name": "RELEASE_DATE", "Type": "string", "DefaultValue": datetime(2023, 9, 18, 17, 30, 5)},
+        {"Name": "LEVEL", "Type": "enum", "Values": ["0", "1", "s"], "DefaultValue": "s", "Category": "CodeGeneration"},
+        {"Name": "SIZE", "Type": "int", "DefaultValue": 42, "Description": "A <size> & more"},
+        {"Name": "ENABLED", "Type": "bool", "DefaultValue": True, "Condition": "ignored"},
+        {"Name": "__PRIVATE", "Type": "string"},
+    ]
+    data = plistlib.dumps([{"Identifier": "tool", "Options": options}])
+    parsed, private = parse_options(io.BytesIO(data))
+    assert private == 1
+    expected = [{k: v for k, v in o.items() if k != "Condition"} for o in plistlib.loads(data)[0]["Options"][:4]]
+    assert parsed == expected
+    assert parsed[0]["DefaultValue"] == datetime(2023, 9, 18, 17, 30, 5)
@@ -0,0 +1,53 @@
+from typer.testing import CliRunner
+from extractor.cli import app
+from extractor.model.fingerprint import Fingerprint
+from extractor.model.setting_filter import SettingFilter
+from .xcode_app import option, write_xcode_app
+
+def test_glob_patterns_match_the_whole_key():
+    setting_filter = SettingFilter(include=["SWIFT_*"])
+    assert setting_filter.accepts("SWIFT_VERSION", "Language", "String")
+    assert not setting_filter.accepts("XSWIFT_A", "Language", "String")
+
+def test_regular_expressions_are_searched_in_the_key():
+    setting_filter = SettingFilter(include=["re:WARN_.*CONVERSION"])
+    assert setting_filter.accepts("CLANG_WARN_BOOL_CONVERSION", "Warnings", "Boolean")
+    assert not setting_filter.accepts("CLANG_WARN_EMPTY_BODY", "Warnings", "Boolean")
+
+def test_exclude_takes_precedence_over_include():
+    setting_filter = SettingFilter(include=["CLANG_*"], exclude=["re:_WARN_"])
+    assert setting_filter.accepts("CLANG_ENABLE_MODULES", "Language", "Boolean")
+    assert not setting_filter.accepts("CLANG_WARN_EMPTY_BODY", "Warnings", "Boolean")
+
+def test_categories_and_types_match_case_insensitively():
+    setting_filter = SettingFilter(categories=["warnings"], types=["boolean"])
+    assert setting_filter.accepts("CLANG_WARN_EMPTY_BODY", "Warnings", "Boolean")
+    assert setting_filter.accepts("CLANG_WARN_EMPTY_BODY", "WARNINGS", "Boolean")
+    assert not setting_filter.accepts("CLANG_WARN_EMPTY_BODY", "Language", "Boolean")
+    assert not setting_filter.accepts("CLANG_WARN_EMPTY_BODY", "Warnings", "String")
+
+def test_types_are_compared_after_normalization():
+    assert SettingFilter(types=["Boolean"]).accepts_option({"Name": "A", "Category": "Building", "Type": "bool"})
+    assert SettingFilter(types=["bool"]).accepts("A", "Building", "Boolean")
+
+def test_an_invalid_regular_expression_is_reported(tmp_path):
+    xcode = write_xcode_app(tmp_path / "Xcode.app", {"Tool": [option("TOOL_SETTING", "Building")]})
+    output = tmp_path / "Settings.json"
+    result = CliRunner().invoke(app, ["extract", str(xcode), "--no-cache", "-j", str(output), "--include", "re:("])
+    assert result.exit_code == 1
+    assert "re:( is not a valid regular expression" in result.output
+    assert not output.exists()
+
+def test_a_filtered_output_has_another_fingerprint(tmp_path):
+    xcode = write_xcode_app(tmp_path / "Xcode.app", {"Swift": [
+        option("SWIFT_VERSION", "Language", "String"),
+        option("SWIFT_ENABLE_TESTABILITY", "Building"),
+    ]})
+    complete, filtered = tmp_path / "Complete.json", tmp_path / "Filtered.json"
+    extract = ["extract", str(xcode), "--no-cache"]
+    assert CliRunner().invoke(app, extract + ["-j", str(complete)]).exit_code == 0
+    assert CliRunner().invoke(app, extract + ["-j", str(filtered), "--type", "String"]).exit_code == 0
+    assert Fingerprint.stored(filtered) != Fingerprint.stored(complete)
+    assert "SWIFT_ENABLE_TESTABILITY" not in filtered.read_text()
+    result = CliRunner().invoke(app, extract + ["-j", str(complete), "--type", "String"])
+    assert f"Regenerating {complete}: inputs changed" in result.output
@@ -0,0 +1,25 @@
+import json
+import pytest
+from extractor.model.diff_format import DiffFormat
+from extractor.model.setting import Setting
+from extractor.model.settings_diff import SettingsDiff
+
+def setting(key: str, default_value: str) -> Setting:
+    return Setting(key, None, key, "String", "Building", default_value, [])
+
+DIFF = SettingsDiff.between(
+    [setting("KEPT", "a"), setting("CHANGED", "a"), setting("REMOVED", "a")],
+    [setting("KEPT", "a"), setting("CHANGED", "b"), setting("ADDED", "a")],
+    "14.3",
+    "15.0"
+)
+
+@pytest.mark.parametrize("diff_format", list(DiffFormat))
+def test_every_format_ends_with_one_newline(diff_format):
+    rendered = DIFF.render(diff_format)
+    assert rendered.endswith("\n") and not rendered.endswith("\n\n")
+
+def test_json_lists_the_changes():
+    rendered = json.loads(DIFF.render(DiffFormat.JSON))
+    assert (rendered["added"], rendered["removed"]) == (["ADDED"], ["REMOVED"])
+    assert [c["key"] for c in rendered["changed"]] == ["CHANGED"]
@@ -0,0 +1,43 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Modules only the commands that use them may import
+LAZY_MODULES = [
+    "json",
+    "plistlib",
+    "sqlite3",
+    "concurrent.futures",
+    "extractor.model.swift_generator",
+    "extractor.model.importer.importer",
+    "extractor.model.importer.plist_importer",
+    "extractor.model.exporter.exporter",
+    "extractor.model.exporter.json_exporter",
+]
+
+_IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+\d+ \|\s*(\S+)")
+
+def imported_modules(*args: str) -> set:
+    """Runs the CLI with -X importtime and returns the modules it imported.
+
+    The import times themselves depend on the machine, benchmarks/bench_startup.py measures them.
+    """
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parents[1]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "extractor", *args],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env, check=True
+    )
+    return {match.group(1) for match in map(_IMPORT_LINE.match, result.stderr.splitlines()) if match}
+
+def test_version_does_not_load_the_cli():
+    modules = imported_modules("--version")
+    assert "extractor" in modules
+    assert "typer" not in modules and "extractor.cli" not in modules
+
+def test_commands_load_only_what_they_use():
+    for args in (["--help"], ["extract", "--help"], ["diff", "--help"]):
+        modules = imported_modules(*args)
+        assert "extractor.cli" in modules
+        assert [m for m in LAZY_MODULES if m in modules] == []
@@ -0,0 +1,50 @@
+import re
+from typer.testing import CliRunner
+from extractor.cli import app
+from extractor.model.setting import Setting
+from extractor.model.swift_generator import CORE_FILE_NAME, shared_enums, swift_shards, to_swift_code
+from .xcode_app import option, write_xcode_app
+
+def enumeration(key: str, category: str, values: list) -> Setting:
+    return Setting(key, "A setting.", key, "Enumeration", category, values[0], values)
+
+SETTINGS = [
+    enumeration("CLANG_WARN_EMPTY_BODY", "Warnings", ["YES", "NO"]),
+    enumeration("CLANG_WARN_BOOL_CONVERSION", "Warnings", ["YES", "NO"]),
+    enumeration("GCC_WARN_SHADOW", "Warnings", ["yes", "no"]),
+    enumeration("GCC_WARN_UNUSED", "Code Generation", ["yes", "no"]),
+    enumeration("GCC_OPTIMIZATION_LEVEL", "Code Generation", ["0", "s"]),
+]
+
+def test_settings_with_the_same_values_share_one_enum():
+    code = to_swift_code(SETTINGS, "15.0", share_enums=True)
+    assert re.findall(r"enum (Shared\w*Value\d*): String", code) == ["SharedYesNoValue", "SharedYesNoValue2"]
+    for key, shared in (("ClangWarnEmptyBodyValue", "SharedYesNoValue"), ("ClangWarnBoolConversionValue", "SharedYesNoValue"),
+                        ("GccWarnShadowValue", "SharedYesNoValue2"), ("GccWarnUnusedValue", "SharedYesNoValue2")):
+        assert f"typealias {key} = {shared}" in code
+    assert "enum GccOptimizationLevelValue: String" in code
+    assert "Shared" not in to_swift_code(SETTINGS, "15.0")
+
+def test_shared_enum_names_do_not_collide():
+    settings = SETTINGS + [enumeration("SHARED_YES_NO", "Warnings", ["ON", "OFF"])]
+    assert shared_enums(settings) == {("YES", "NO"): "SharedYesNoValue2", ("yes", "no"): "SharedYesNoValue3"}
+
+def test_shards_declare_the_shared_enums_in_the_core_file():
+    shards = swift_shards(SETTINGS, "15.0", share_enums=True)
+    for name, code in shards.items():
+        declared = re.findall(r"enum (Shared\w*): String", code)
+        assert declared == (["SharedYesNoValue", "SharedYesNoValue2"] if name == CORE_FILE_NAME else [])
+    assert "typealias GccWarnUnusedValue = SharedYesNoValue2" in shards["XcodeBuildSettings+CodeGeneration.swift"]
+
+def test_extract_reports_the_shared_enums(tmp_path):
+    values = {"Type": "Enumeration", "Values": ["YES", "NO", "YES_ERROR"], "DefaultValue": "NO"}
+    xcode = write_xcode_app(tmp_path / "Xcode.app", {"Clang": [
+        option("CLANG_WARN_EMPTY_BODY", "Warnings", **values),
+        option("CLANG_WARN_BOOL_CONVERSION", "Warnings", **values),
+        option("CLANG_WARN_ENUM_CONVERSION", "Warnings", **values),
+    ]})
+    lean, default = tmp_path / "Lean.swift", tmp_path / "Default.swift"
+    result = CliRunner().invoke(app, ["extract", str(xcode), "--no-cache", "-s", str(default), "--out", f"swift-lean={lean}"])
+    assert result.exit_code == 0, result.output
+    assert f"Shared argument enums in {lean}: 1 enums shared by 3 settings, 2 enums and about 8 lines eliminated" in result.output
+    assert f"Shared argument enums in {default}" not in result.output
@@ -0,0 +1,22 @@
+from extractor.model.setting import Setting
+from extractor.model.swift_generator import to_swift_code
+
+SETTINGS = [
+    Setting("SWIFT_VERSION", "The Swift version.", "SWIFT_VERSION", "String", "Language", None, []),
+    Setting("GCC_OPTIMIZATION_LEVEL", "The level.", "GCC_OPTIMIZATION_LEVEL", "Enumeration", "Code Generation", "s", ["0", "s"]),
+    Setting("ENABLE_BITCODE", "Bitcode.", "ENABLE_BITCODE", "Boolean", "Code Generation", "NO", []),
+]
+
+def declarations(code: str) -> list:
+    return [line.strip() for line in code.splitlines() if line.strip().startswith(("case ", "enum ", "typealias "))
+            and "return" not in line and "(let value)" not in line]
+
+def test_keys_are_returned_by_a_switch_without_reflection():
+    code = to_swift_code(SETTINGS, "15.0", lean=True)
+    assert "Mirror" not in code
+    for case, key in (("swiftVersion", "SWIFT_VERSION"), ("gccOptimizationLevel", "GCC_OPTIMIZATION_LEVEL"),
+                      ("enableBitcode", "ENABLE_BITCODE")):
+        assert f'case .{case}: return "{key}"' in code
+
+def test_lean_code_declares_the_same_cases():
+    assert declarations(to_swift_code(SETTINGS, "15.0", lean=True)) == declarations(to_swift_code(SETTINGS, "15.0"))
@@ -0,0 +1,62 @@
+import os
+from typer.testing import CliRunner
+from extractor.cli import app
+from extractor.model.exporter.swift_exporter import SwiftShardsExporter
+from extractor.model.setting import Setting
+from extractor.model.swift_generator import CORE_FILE_NAME, SHARD_FILE_NAME
+from .xcode_app import option, write_spec, write_xcode_app
+
+def setting(key: str, category: str) -> Setting:
+    return Setting(key, f"The {key} setting.", key, "Boolean", category, "NO", [])
+
+SETTINGS = [
+    setting("LD_RUNPATH_SEARCH_PATHS", "Linking"),
+    setting("SWIFT_OPTIMIZATION_LEVEL", "Code Generation"),
+    setting("SWIFT_STRICT_CONCURRENCY", "Code Generation"),
+    setting("ENABLE_TESTABILITY", "Testing"),
+]
+
+def test_one_file_per_category(tmp_path):
+    SwiftShardsExporter.export("15.0", SETTINGS, tmp_path)
+    names = sorted(p.name for p in tmp_path.iterdir())
+    shards = [SHARD_FILE_NAME.format(c) for c in ("CodeGeneration", "Linking", "Testing")]
+    assert names == sorted([CORE_FILE_NAME] + shards)
+    linking = (tmp_path / SHARD_FILE_NAME.format("Linking")).read_text()
+    assert "LD_RUNPATH_SEARCH_PATHS" in linking and "SWIFT_OPTIMIZATION_LEVEL" not in linking
+
+def test_files_of_removed_categories_are_deleted(tmp_path):
+    SwiftShardsExporter.export("15.0", SETTINGS, tmp_path)
+    SwiftShardsExporter.export("15.0", SETTINGS[:1], tmp_path)
+    assert {p.name for p in tmp_path.iterdir()} == {CORE_FILE_NAME, SHARD_FILE_NAME.format("Linking")}
+
+def test_unchanged_files_are_not_rewritten(tmp_path):
+    SwiftShardsExporter.export("15.0", SETTINGS, tmp_path)
+    for path in tmp_path.iterdir():
+        os.utime(path, ns=(0, 0))
+    changed = SETTINGS[:3] + [setting("ENABLE_TESTING_SEARCH_PATHS", "Testing")]
+    SwiftShardsExporter.export("15.0", changed, tmp_path)
+    rewritten = {p.name for p in tmp_path.iterdir() if p.stat().st_mtime_ns != 0}
+    assert rewritten == {CORE_FILE_NAME, SHARD_FILE_NAME.format("Testing")}
+
+def test_unchanged_outputs_are_skipped(tmp_path):
+    xcode = write_xcode_app(tmp_path / "Xcode.app", {
+        "Linker": [option("LD_RUNPATH_SEARCH_PATHS", "Linking")],
+        "Swift": [option("SWIFT_STRICT_CONCURRENCY", "Code Generation")],
+    })
+    shards = tmp_path / "Settings"
+    args = ["extract", str(xcode), "--out", f"swift-shards={shards}", "--cache-dir", str(tmp_path / "cache")]
+    runner = CliRunner()
+
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert f"Regenerating {shards}: no previous fingerprint" in result.output
+    assert (shards / SHARD_FILE_NAME.format("Linking")).is_file()
+
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert f"Skipping {shards}" in result.output
+
+    write_spec(xcode, "Swift", [option("SWIFT_STRICT_CONCURRENCY", "Code Generation"), option("SWIFT_VERSION", "Language")])
+    result = runner.invoke(app, args)
+    assert f"Regenerating {shards}: inputs changed" in result.output
+    assert (shards / SHARD_FILE_NAME.format("Language")).is_file()
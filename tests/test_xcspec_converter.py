@@ -0,0 +1,19 @@
+import subprocess
+import tempfile
+import pytest
+from extractor.model.importer import xcspec_converter
+
+def test_failed_conversion_leaves_no_temporary_files(tmp_path, monkeypatch):
+    spec = tmp_path / "Swift Compiler.xcspec"
+    spec.write_text("(")
+    temp = tmp_path / "temp"
+    temp.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(temp))
+
+    def fail(args, **kwargs):
+        raise subprocess.CalledProcessError(1, args)
+
+    monkeypatch.setattr(subprocess, "check_output", fail)
+    with pytest.raises(subprocess.CalledProcessError):
+        xcspec_converter.convert(spec)
+    assert list(temp.iterdir()) == []
@@ -0,0 +1,30 @@
+"""Helpers writing small Xcode installations for the tests."""
+
+import plistlib
+from pathlib import Path
+from typing import Dict, List
+
+def write_version(xcode: Path, version: str = "15.0", build: str = "15A240d"):
+    """Writes the version.plist of an installation."""
+    (xcode / "Contents").mkdir(parents=True, exist_ok=True)
+    with (xcode / "Contents/version.plist").open("wb") as fp:
+        plistlib.dump({"CFBundleShortVersionString": version, "ProductBuildVersion": build}, fp)
+
+def write_spec(xcode: Path, name: str, options: List[dict]) -> Path:
+    """Writes a spec file with the given options to an installation."""
+    path = xcode / "Contents/Developer/Library/Xcode/Specifications" / f"{name}.xcspec"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as fp:
+        plistlib.dump([{"Identifier": name, "Type": "Compiler", "Options": options}], fp)
+    return path
+
+def write_xcode_app(xcode: Path, specs: Dict[str, List[dict]], version: str = "15.0", build: str = "15A240d") -> Path:
+    """Writes an installation with a spec file per name in specs."""
+    write_version(xcode, version, build)
+    for name, options in specs.items():
+        write_spec(xcode, name, options)
+    return xcode
+
+def option(name: str, category: str, type: str = "Boolean", **fields) -> dict:
+    """Returns an option of a spec file."""
+    return dict({"Name": name, "Type": type, "Category": category, "DefaultValue": "NO"}, **fields)